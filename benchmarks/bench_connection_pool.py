@@ -0,0 +1,76 @@
+"""Per-call latency of repository reads: connect-per-call vs pooled connections.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [--calls 2000] [--products 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from ism.repositories.sqlite_repo import SqliteRepository
+
+
+class ConnectPerCallRepository(SqliteRepository):
+    """Baseline behaviour before pooling: open and close a connection on every call."""
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA foreign_keys = ON;")
+        return conn
+
+
+def _seed(repo: SqliteRepository, products: int) -> None:
+    conn = repo._conn()
+    conn.executemany(
+        "INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock) VALUES (?, ?, 1.0, 2.0, 10, 1)",
+        ((f"SKU-{i:06d}", f"Product {i}") for i in range(products)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _measure(repo: SqliteRepository, calls: int, products: int) -> list[float]:
+    samples: list[float] = []
+    for i in range(calls):
+        pid = (i % products) + 1
+        t0 = time.perf_counter()
+        repo.get_product_by_id(pid)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<18} mean={statistics.fmean(samples):8.1f}us  p50={statistics.median(samples):8.1f}us  p95={p95:8.1f}us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        pooled = SqliteRepository(db)
+        pooled.init_db()
+        _seed(pooled, args.products)
+
+        baseline = ConnectPerCallRepository(db)
+        _report("connect-per-call", _measure(baseline, args.calls, args.products))
+        _report("pooled", _measure(pooled, args.calls, args.products))
+        pooled.close()
+
+
+if __name__ == "__main__":
+    main()
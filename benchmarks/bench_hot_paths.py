@@ -0,0 +1,233 @@
+"""Checkout, restock, reporting and refresh latency on generated databases, with baseline comparison.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--sizes tiny,small] [--repeat 20] [--output results.json]
+    python benchmarks/bench_hot_paths.py --sizes medium --cache-dir .bench-dbs --compare baseline.json
+
+Every size is generated once with ``ism.devtools.dataset`` (reused from
+``--cache-dir`` when given) and each run works on a throwaway copy. With
+``--compare`` the script exits with status 1 when any case's median is more than
+``--threshold`` slower than the baseline file, which is a previous ``--output``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from openpyxl import Workbook
+
+from ism.devtools.dataset import SIZES, DatasetSpec, generate_dataset
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.excel_service import ExcelService
+from ism.services.inventory_service import InventoryService
+from ism.services.purchase_service import PurchaseService
+from ism.services.reporting_service import ReportingService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self) -> float:
+        return 1000.0
+
+
+def _dataset(size: str, seed: int, cache_dir: Path) -> tuple[Path, DatasetSpec]:
+    spec = replace(SIZES[size], seed=seed)
+    db = cache_dir / f"{size}-seed{seed}.db"
+    if not db.exists():
+        print(f"  generating {size} dataset ...", flush=True)
+        generate_dataset(db, spec)
+    return db, spec
+
+
+def _time(fn: Callable[[int], object], repeat: int) -> list[float]:
+    fn(-1)  # warm the pools, the page cache and any lazy imports
+    samples = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _restock_sheet(path: Path, skus: list[str]) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["sku", "name", "cost_usd", "price_usd", "stock", "min_stock"])
+    for sku in skus:
+        ws.append([sku, f"Restocked {sku}", 2.0, 4.0, 1, 1])
+    wb.save(path)
+
+
+def _cases(repo: SqliteRepository, spec: DatasetSpec, tmp: Path) -> dict[str, Callable[[int], object]]:
+    inventory = InventoryService(repo)
+    sales = SalesService(repo, FixedFxService())
+    purchases = PurchaseService(repo)
+    reporting = ReportingService(repo)
+    excel = ExcelService(repo, purchases, inventory)
+
+    # Top every product up so that repeated checkouts never run out of stock.
+    conn = repo._conn()
+    conn.execute("UPDATE products SET stock = stock + 1000000")
+    conn.commit()
+    conn.close()
+
+    products = inventory.list_products()
+    ids = [p.id for p in products]
+
+    def sale(lines: int) -> Callable[[int], object]:
+        def run(i: int) -> int:
+            start = (i * lines) % len(ids)
+            picked = [ids[(start + k) % len(ids)] for k in range(min(lines, len(ids)))]
+            return sales.create_sale(None, [{"product_id": pid, "qty": 1, "unit_price_usd": 9.99} for pid in picked])
+
+        return run
+
+    def purchase(i: int) -> int:
+        picked = [ids[(i * 5 + k) % len(ids)] for k in range(min(5, len(ids)))]
+        return purchases.create_purchase("Bench", None, [{"product_id": pid, "qty": 3, "unit_cost_usd": 2.5} for pid in picked])
+
+    def list_products_cold(_i: int) -> int:
+        inventory.reload_catalog()
+        return len(inventory.list_products())
+
+    end = datetime.combine(spec.end_date, datetime.max.time()).replace(microsecond=0)
+
+    def summary(days: int) -> Callable[[int], object]:
+        start_iso = (end - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        end_iso = end.strftime("%Y-%m-%d %H:%M:%S")
+        return lambda _i: sales.sales_summary_between(start_iso, end_iso)
+
+    def export(_i: int) -> None:
+        reporting.export_sales_report_excel(
+            str(tmp / "report.xlsx"),
+            (end - timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S"),
+            end.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+    sheet = tmp / "restock.xlsx"
+    _restock_sheet(sheet, [p.sku for p in products[:200]])
+
+    return {
+        "sales.create_sale[1 line]": sale(1),
+        "sales.create_sale[10 lines]": sale(10),
+        "sales.create_sale[50 lines]": sale(50),
+        "purchases.create_purchase[5 lines]": purchase,
+        "inventory.list_products[cold]": list_products_cold,
+        "inventory.list_products[cached]": lambda _i: len(inventory.list_products()),
+        "sales.sales_summary_between[7d]": summary(7),
+        "sales.sales_summary_between[30d]": summary(30),
+        "sales.sales_summary_between[365d]": summary(365),
+        "reporting.cumulative_profit_series": lambda _i: reporting.cumulative_profit_series(),
+        "reporting.export_sales_report_excel[30d]": export,
+        "excel.import_restock_excel[200 rows]": lambda _i: excel.import_restock_excel(str(sheet)),
+    }
+
+
+def run(sizes: list[str], repeat: int, seed: int, cache_dir: Path, only: str | None) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        for size in sizes:
+            source, spec = _dataset(size, seed, cache_dir)
+            work = tmp / f"{size}.db"
+            shutil.copy2(source, work)
+            repo = SqliteRepository(work)
+            try:
+                for case, fn in _cases(repo, spec, tmp).items():
+                    if only and only not in case:
+                        continue
+                    samples = sorted(_time(fn, repeat))
+                    result = {
+                        "size": size,
+                        "case": case,
+                        "repeat": repeat,
+                        "min_ms": round(samples[0] * 1000.0, 3),
+                        "median_ms": round(statistics.median(samples) * 1000.0, 3),
+                        "p95_ms": round(samples[min(len(samples) - 1, round(0.95 * len(samples)) - 1)] * 1000.0, 3),
+                        "max_ms": round(samples[-1] * 1000.0, 3),
+                    }
+                    results.append(result)
+                    print(f"  {size:<7} {case:<44} median {result['median_ms']:10.3f} ms  p95 {result['p95_ms']:10.3f} ms")
+            finally:
+                repo.close()
+    return {
+        "meta": {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, floor_ms: float) -> list[str]:
+    """Cases whose median grew by more than ``threshold`` (and at least ``floor_ms``) over the baseline."""
+    previous = {(r["size"], r["case"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in current["results"]:
+        base = previous.get((r["size"], r["case"]))
+        if base is None:
+            continue
+        before, after = float(base["median_ms"]), float(r["median_ms"])
+        if after > before * (1.0 + threshold) and after - before >= floor_ms:
+            regressions.append(f"{r['size']} {r['case']}: {before:.3f} ms -> {after:.3f} ms ({after / before - 1.0:+.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="small", help=f"comma-separated, from {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", type=Path, help="keep generated databases here between runs")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline JSON from a previous --output")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed median slowdown (0.20 = 20%%)")
+    parser.add_argument("--floor-ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        cache_dir = args.cache_dir or Path(scratch)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        current = run(sizes, args.repeat, args.seed, cache_dir, args.only)
+
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.threshold, args.floor_ms)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Time and memory of ``list_products`` on a large catalog: coerced dataclasses vs slotted row builders.
+
+Usage:
+    python benchmarks/bench_list_products.py [--products 100000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from ism.repositories.sqlite_repo import SqliteRepository
+
+
+@dataclass(frozen=True)
+class LegacyProduct:
+    """The model as it was before ``slots=True``."""
+
+    id: int
+    sku: str
+    name: str
+    cost_usd: float
+    price_usd: float
+    stock: int
+    min_stock: int
+    active: int = 1
+
+
+class LegacyRepository(SqliteRepository):
+    """Baseline: ``fetchall`` plus a per-field ``int()``/``float()``/``str()`` comprehension."""
+
+    def list_products(self) -> list[LegacyProduct]:  # type: ignore[override]
+        conn = self._conn()
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active
+            FROM products
+            WHERE active = 1
+            ORDER BY name
+            """
+        )
+        rows = cur.fetchall()
+        conn.close()
+        return [
+            LegacyProduct(
+                id=int(r[0]),
+                sku=str(r[1]),
+                name=str(r[2]),
+                cost_usd=float(r[3]),
+                price_usd=float(r[4]),
+                stock=int(r[5]),
+                min_stock=int(r[6]),
+                active=int(r[7]),
+            )
+            for r in rows
+        ]
+
+
+def _seed(repo: SqliteRepository, products: int) -> None:
+    conn = repo._conn()
+    conn.executemany(
+        "INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock) VALUES (?, ?, 1.25, 2.5, 10, 1)",
+        ((f"SKU-{i:06d}", f"Product {i:06d}") for i in range(products)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _time(fn: Callable[[], list], repeat: int) -> float:
+    fn()  # warm the pool and the page cache
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _memory(fn: Callable[[], list]) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        seed = SqliteRepository(db)
+        seed.init_db()
+        _seed(seed, args.products)
+        seed.close()
+
+        mib = 1024 * 1024
+        print(f"list_products over {args.products} products (best of {args.repeat})")
+        for label, repo in (("legacy", LegacyRepository(db)), ("slotted", SqliteRepository(db))):
+            elapsed = _time(repo.list_products, args.repeat)
+            retained, peak = _memory(repo.list_products)
+            print(f"  {label:<8} {elapsed * 1000:8.1f} ms  retained {retained / mib:6.1f} MiB  peak {peak / mib:6.1f} MiB")
+            repo.close()
+
+
+if __name__ == "__main__":
+    main()
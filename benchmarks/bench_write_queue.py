@@ -0,0 +1,98 @@
+"""Sustained sales/second with N producer threads in one process: direct transactions vs the write queue.
+
+The queue only serializes writers inside its own process; terminals in other
+processes still meet at SQLite's write lock, so this does not model them.
+
+Usage:
+    python benchmarks/bench_write_queue.py [--producers 8] [--sales 200] [--profile balanced]
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from ism.domain.errors import DatabaseBusyError
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.repositories.write_queue import QueuedUnitOfWork, WriteQueue
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self) -> float:
+        return 1000.0
+
+
+def _seed(repo: SqliteRepository, products: int) -> None:
+    conn = repo._conn()
+    conn.executemany(
+        "INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock) VALUES (?, ?, 1.0, 2.0, 1000000, 1)",
+        ((f"SKU-{i:05d}", f"Product {i}") for i in range(products)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _run(sales: SalesService, producers: int, per_producer: int, products: int) -> tuple[float, int]:
+    errors = 0
+    lock = threading.Lock()
+
+    def producer(seed: int) -> None:
+        nonlocal errors
+        for i in range(per_producer):
+            pid = ((seed * per_producer + i) % products) + 1
+            try:
+                sales.create_sale(None, [{"product_id": pid, "qty": 1, "unit_price_usd": 2.0}])
+            except (sqlite3.OperationalError, DatabaseBusyError):
+                # "database is locked", retries exhausted or a queued result that timed out:
+                # what the terminals see as failed checkouts.
+                with lock:
+                    errors += 1
+
+    threads = [threading.Thread(target=producer, args=(n,)) for n in range(producers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--producers", type=int, default=8)
+    parser.add_argument("--sales", type=int, default=200, help="sales per producer")
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--profile", default="balanced")
+    args = parser.parse_args()
+    total = args.producers * args.sales
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ("direct", "write-queue"):
+            repo = SqliteRepository(Path(tmp) / f"{label}.db", profile=args.profile)
+            repo.init_db()
+            _seed(repo, args.products)
+
+            writer = WriteQueue(repo).start() if label == "write-queue" else None
+            uow_factory = functools.partial(QueuedUnitOfWork, repo, writer) if writer else None
+            sales = SalesService(repo, FixedFxService(), uow_factory=uow_factory)
+
+            elapsed, errors = _run(sales, args.producers, args.sales, args.products)
+            extra = ""
+            if writer is not None:
+                writer.close()
+                extra = f"  batches={writer.batches_committed} avg_batch={writer.commands_committed / max(1, writer.batches_committed):.1f}"
+            repo.close()
+            print(f"{label:<12} {total / elapsed:8.0f} sales/s  lock_errors={errors}{extra}")
+
+
+if __name__ == "__main__":
+    main()
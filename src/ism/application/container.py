@@ -1,39 +1,81 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from importlib.metadata import PackageNotFoundError, version
+from functools import cached_property
 import os
 from pathlib import Path
 import sys
+import time
+from typing import TYPE_CHECKING
 
+from ism.repositories.instrumentation import QueryStats
 from ism.repositories.sqlite_repo import SqliteRepository
+from ism.repositories.write_queue import QueuedUnitOfWork, WriteQueue
 from ism.services.auth_service import AuthService
 from ism.services.backup_service import BackupService
+from ism.services.change_monitor import ChangeMonitor
 from ism.services.operations_service import OperationsService
-from ism.services.update_service import UpdateService
-from ism.services.excel_service import ExcelService
 from ism.services.fx_service import FxService
 from ism.services.inventory_service import InventoryService
 from ism.services.purchase_service import PurchaseService
-from ism.services.reporting_service import ReportingService
 from ism.services.sales_service import SalesService
+from ism.services.workload_recorder import RECORDED_OPERATIONS, WorkloadRecorder
+from ism.startup import StartupTimer
+
+if TYPE_CHECKING:
+    from ism.services.excel_service import ExcelService
+    from ism.services.reporting_service import ReportingService
+    from ism.services.update_service import UpdateService
 
 
 @dataclass(frozen=True)
 class AppContainer:
+    """Services shared by the UI. ``excel``, ``reporting`` and ``updates`` are built on first access."""
+
     repo: SqliteRepository
     fx: FxService
     inventory: InventoryService
     purchases: PurchaseService
     sales: SalesService
-    excel: ExcelService
-    reporting: ReportingService
     auth: AuthService
     backup: BackupService
     operations: OperationsService
-    updates: UpdateService
+    writer: WriteQueue | None = None
+    changes: ChangeMonitor | None = None
+    recorder: WorkloadRecorder | None = None
+
+    @cached_property
+    def excel(self) -> ExcelService:
+        from ism.services.excel_service import ExcelService
+
+        excel = ExcelService(self.repo, self.purchases, self.inventory)
+        if self.recorder is not None:
+            self.recorder.attach(excel, "excel", RECORDED_OPERATIONS["excel"])
+        return excel
+
+    @cached_property
+    def reporting(self) -> ReportingService:
+        from ism.services.reporting_service import ReportingService
+
+        return ReportingService(self.repo)
+
+    @cached_property
+    def updates(self) -> UpdateService:
+        from ism.services.update_service import UpdateService
+
+        return UpdateService(current_version=_get_current_version(), source=_resolve_update_source())
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.repo.close()
+
 
 def _get_current_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
     try:
         return version("inventory-sales-manager")
     except PackageNotFoundError:
@@ -62,22 +104,61 @@ def _resolve_update_source() -> str | Path | None:
     return None
 
 
-def build_container(db_path: Path | str) -> AppContainer:
-    repo = SqliteRepository(db_path)
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _query_stats_from_env() -> QueryStats | None:
+    if not _env_flag("ISM_SQL_STATS"):
+        return None
+    try:
+        slow_ms = float(os.environ.get("ISM_SLOW_QUERY_MS", "") or 100.0)
+    except ValueError:
+        slow_ms = 100.0
+    return QueryStats(slow_ms=slow_ms)
+
+
+def _workload_recorder_from_env() -> WorkloadRecorder | None:
+    journal = os.environ.get("ISM_WORKLOAD_JOURNAL", "").strip()
+    if not journal:
+        return None
+    return WorkloadRecorder(journal, strip_notes=_env_flag("ISM_WORKLOAD_STRIP_NOTES"))
+
+
+def build_container(
+    db_path: Path | str,
+    sqlite_profile: str | None = None,
+    serialize_writes: bool | None = None,
+    query_stats: QueryStats | None = None,
+    recorder: WorkloadRecorder | None = None,
+    startup: StartupTimer | None = None,
+) -> AppContainer:
+    repo = SqliteRepository(db_path, profile=sqlite_profile, query_stats=query_stats or _query_stats_from_env())
+    started = time.perf_counter()
     repo.init_db()
+    if startup is not None:
+        startup.record("migrations", time.perf_counter() - started)
+
+    if serialize_writes is None:
+        serialize_writes = _env_flag("ISM_SERIALIZE_WRITES")
+    writer = WriteQueue(repo).start() if serialize_writes else None
+    uow_factory = (lambda: QueuedUnitOfWork(repo, writer)) if writer else None
 
     fx = FxService(repo)
-    inventory = InventoryService(repo)
-    purchases = PurchaseService(repo)
-    sales = SalesService(repo, fx)
-    excel = ExcelService(repo, purchases, inventory)
-    reporting = ReportingService(repo)
+    inventory = InventoryService(repo, write_queue=writer)
+    purchases = PurchaseService(repo, uow_factory=uow_factory)
+    sales = SalesService(repo, fx, uow_factory=uow_factory)
     auth = AuthService(repo)
     backup_dir = Path(db_path).parent / "backups"
     backup = BackupService(db_path, backup_dir)
     operations = OperationsService(repo, db_path=db_path, logs_dir=Path(db_path).parent / "logs", backup_dir=backup_dir)
-    update_source = _resolve_update_source()
-    updates = UpdateService(current_version=_get_current_version(), source=update_source)
+    changes = ChangeMonitor(repo)
+
+    recorder = recorder or _workload_recorder_from_env()
+    if recorder is not None:
+        # ExcelService is attached when AppContainer.excel first builds it.
+        for name, service in (("sales", sales), ("purchases", purchases), ("inventory", inventory)):
+            recorder.attach(service, name, RECORDED_OPERATIONS[name])
 
     return AppContainer(
         repo=repo,
@@ -85,10 +166,10 @@ def build_container(db_path: Path | str) -> AppContainer:
         inventory=inventory,
         purchases=purchases,
         sales=sales,
-        excel=excel,
-        reporting=reporting,
         auth=auth,
         backup=backup,
         operations=operations,
-        updates=updates,
+        writer=writer,
+        changes=changes,
+        recorder=recorder,
     )
@@ -36,3 +36,63 @@ def get_app_paths(app_name: str = "InventorySalesManager") -> AppPaths:
     logs.mkdir(parents=True, exist_ok=True)
 
     return AppPaths(base_dir=base, db_path=db, logs_dir=logs)
+
+
+@dataclass(frozen=True)
+class SqliteProfile:
+    """PRAGMA set applied to every SQLite connection opened by the repository."""
+
+    name: str
+    journal_mode: str
+    synchronous: str
+    cache_size_kib: int
+    mmap_size_bytes: int
+    temp_store: str
+    busy_timeout_ms: int
+
+
+SQLITE_PROFILES: dict[str, SqliteProfile] = {
+    # Every commit is fsynced; safest choice for machines with unreliable power.
+    "durable": SqliteProfile(
+        name="durable",
+        journal_mode="WAL",
+        synchronous="FULL",
+        cache_size_kib=16_384,
+        mmap_size_bytes=0,
+        temp_store="DEFAULT",
+        busy_timeout_ms=5_000,
+    ),
+    # WAL + NORMAL: commits never corrupt the file; a power cut may drop the last few.
+    "balanced": SqliteProfile(
+        name="balanced",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size_kib=65_536,
+        mmap_size_bytes=268_435_456,
+        temp_store="MEMORY",
+        busy_timeout_ms=5_000,
+    ),
+    # Imports and fixture generation only: no fsync at all.
+    "bulk-load": SqliteProfile(
+        name="bulk-load",
+        journal_mode="WAL",
+        synchronous="OFF",
+        cache_size_kib=262_144,
+        mmap_size_bytes=1_073_741_824,
+        temp_store="MEMORY",
+        busy_timeout_ms=30_000,
+    ),
+}
+
+DEFAULT_SQLITE_PROFILE = "balanced"
+
+
+def get_sqlite_profile(name: str | None = None) -> SqliteProfile:
+    """Resolve a profile by name, falling back to ``ISM_SQLITE_PROFILE`` and then the default."""
+    key = (name or os.environ.get("ISM_SQLITE_PROFILE", "") or DEFAULT_SQLITE_PROFILE).strip().lower()
+    try:
+        return SQLITE_PROFILES[key]
+    except KeyError:
+        raise ValueError(
+            f"Unknown SQLite profile '{key}'. Expected one of: {', '.join(sorted(SQLITE_PROFILES))}."
+        ) from None
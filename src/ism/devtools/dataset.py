@@ -0,0 +1,339 @@
+"""Deterministic synthetic databases for load tests and benchmarks.
+
+Usage:
+    python -m ism.devtools.dataset OUT.db [--size small|medium|large] [--seed 0] [--overwrite]
+    python -m ism.devtools.dataset OUT.db --products 100000 --sales 5000000 --days 1095
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+from ism.repositories.sqlite_repo import SqliteRepository
+
+_BULK_TABLES = ("products", "sales", "sale_items", "purchases", "purchase_items", "stock_ledger", "fx_rates")
+
+_ADJECTIVES = (
+    "Basic", "Classic", "Compact", "Deluxe", "Eco", "Essential", "Flex", "Grand", "Lite", "Max",
+    "Mini", "Nova", "Prime", "Pro", "Pure", "Smart", "Solid", "Ultra", "Urban", "Vivid",
+)
+_NOUNS = (
+    "Adapter", "Bag", "Battery", "Bottle", "Cable", "Charger", "Cup", "Filter", "Glove", "Lamp",
+    "Marker", "Mouse", "Notebook", "Pen", "Plate", "Sensor", "Speaker", "Strap", "Towel", "Watch",
+)
+_VENDORS = ("Acme Supply", "Delta Wholesale", "Norte Distribuciones", "Pampa Import", "Sur Logistics")
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSpec:
+    """Shape of a generated database. Counts are targets; restocks add a few purchases."""
+
+    products: int = 1_000
+    sales: int = 10_000
+    lines_per_sale: float = 3.0
+    purchases: int = 500
+    lines_per_purchase: float = 8.0
+    days: int = 365
+    end_date: date = date(2025, 12, 31)
+    seed: int = 0
+    batch_size: int = 50_000
+
+
+SIZES: dict[str, DatasetSpec] = {
+    "tiny": DatasetSpec(products=50, sales=300, purchases=30, days=30),
+    "small": DatasetSpec(),
+    "medium": DatasetSpec(products=20_000, sales=500_000, purchases=20_000, days=730),
+    "large": DatasetSpec(products=100_000, sales=5_000_000, purchases=150_000, days=1_095),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSummary:
+    path: Path
+    products: int
+    sales: int
+    sale_items: int
+    purchases: int
+    purchase_items: int
+    ledger_rows: int
+    fx_rates: int
+    seconds: float
+
+
+def _spread(total: int, days: int, day: int) -> int:
+    """Share of ``total`` falling on ``day`` so that the ``days`` shares add up exactly."""
+    return total * (day + 1) // days - total * day // days
+
+
+def _line_count(rng: random.Random, average: float) -> int:
+    return rng.randint(1, max(1, round(2 * average - 1)))
+
+
+class _Generator:
+    def __init__(self, conn: sqlite3.Connection, spec: DatasetSpec):
+        self.conn = conn
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.stock: list[int] = []
+        self.cost: list[float] = []
+        self.price: list[float] = []
+        # Popularity follows a Zipf-like curve, shuffled so it is unrelated to id or name order.
+        ranks = list(range(1, spec.products + 1))
+        self.rng.shuffle(ranks)
+        self.cum_weights = list(accumulate(1.0 / r for r in ranks))
+        self.sale_id = 0
+        self.purchase_id = 0
+        self.sales: list[tuple] = []
+        self.sale_items: list[tuple] = []
+        self.purchases: list[tuple] = []
+        self.purchase_items: list[tuple] = []
+        self.ledger: list[tuple] = []
+        self.counts = dict.fromkeys(("sale_items", "purchase_items", "ledger_rows"), 0)
+
+    def pick_products(self, k: int) -> list[int]:
+        """``k`` distinct product indexes drawn by popularity."""
+        cum, rnd, top = self.cum_weights, self.rng.random, self.cum_weights[-1]
+        picked: list[int] = []
+        for _ in range(k * 3):
+            idx = bisect_left(cum, rnd() * top)
+            if idx not in picked:
+                picked.append(idx)
+                if len(picked) == k:
+                    break
+        return picked
+
+    def products(self) -> None:
+        rng = self.rng
+        rows = []
+        for i in range(self.spec.products):
+            cost = round(rng.uniform(0.5, 150.0), 2)
+            price = round(cost * rng.uniform(1.2, 2.5), 2)
+            self.cost.append(cost)
+            self.price.append(price)
+            self.stock.append(0)
+            name = f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)} {i:06d}"
+            rows.append((i + 1, f"SKU-{i:07d}", name, cost, price, rng.randint(0, 10)))
+        self.conn.executemany(
+            "INSERT INTO products (id, sku, name, cost_usd, price_usd, stock, min_stock, active) "
+            "VALUES (?, ?, ?, ?, ?, 0, ?, 1)",
+            rows,
+        )
+
+    def purchase(self, datetime_iso: str, vendor: str, lines: list[tuple[int, int]], notes: str | None) -> None:
+        self.purchase_id += 1
+        pid = self.purchase_id
+        total = 0.0
+        for idx, qty in lines:
+            unit_cost = round(self.cost[idx] * self.rng.uniform(0.9, 1.1), 2)
+            old_stock = self.stock[idx]
+            new_stock = old_stock + qty
+            # Same weighted-average costing as SqliteRepository.create_purchase_with_items.
+            self.cost[idx] = (old_stock * self.cost[idx] + qty * unit_cost) / new_stock
+            self.stock[idx] = new_stock
+            total += qty * unit_cost
+            self.purchase_items.append((pid, idx + 1, qty, unit_cost))
+            self.ledger.append((datetime_iso, idx + 1, "purchase", qty, new_stock, unit_cost, "purchase", pid, notes))
+        self.purchases.append((pid, datetime_iso, vendor, round(total, 2), notes))
+
+    def sale(self, datetime_iso: str, fx: float) -> None:
+        rng = self.rng
+        lines = []
+        for idx in self.pick_products(_line_count(rng, self.spec.lines_per_sale)):
+            qty = 1 if rng.random() < 0.7 else rng.randint(2, 5)
+            if self.stock[idx] < qty:
+                self.purchase(datetime_iso, rng.choice(_VENDORS), [(idx, qty + rng.randint(10, 40))], "Restock")
+            lines.append((idx, qty))
+
+        self.sale_id += 1
+        sid = self.sale_id
+        notes = f"Customer #{rng.randint(1000, 99999)}" if rng.random() < 0.05 else None
+        total = 0.0
+        for idx, qty in lines:
+            price = self.price[idx]
+            self.stock[idx] -= qty
+            total += qty * price
+            self.sale_items.append((sid, idx + 1, qty, price, self.cost[idx]))
+            self.ledger.append((datetime_iso, idx + 1, "sale", -qty, self.stock[idx], price, "sale", sid, notes))
+        self.sales.append((sid, datetime_iso, total, fx, total * fx, notes))
+
+    def flush(self, force: bool = False) -> None:
+        pending = len(self.sale_items) + len(self.ledger) + len(self.purchase_items)
+        if not force and pending < self.spec.batch_size:
+            return
+        conn = self.conn
+        conn.executemany(
+            "INSERT INTO purchases (id, datetime, vendor, total_usd, notes, actor_user_id) VALUES (?, ?, ?, ?, ?, 1)",
+            self.purchases,
+        )
+        conn.executemany(
+            "INSERT INTO purchase_items (purchase_id, product_id, qty, unit_cost_usd) VALUES (?, ?, ?, ?)",
+            self.purchase_items,
+        )
+        conn.executemany(
+            "INSERT INTO sales (id, datetime, total_usd, fx_usd_ars, total_ars, notes, actor_user_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, 1)",
+            self.sales,
+        )
+        conn.executemany(
+            "INSERT INTO sale_items (sale_id, product_id, qty, unit_price_usd, unit_cost_usd) VALUES (?, ?, ?, ?, ?)",
+            self.sale_items,
+        )
+        conn.executemany(
+            """
+            INSERT INTO stock_ledger (
+                datetime, product_id, movement_type, qty_delta, stock_after, unit_value_usd,
+                reference_type, reference_id, actor_user_id, notes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+            """,
+            self.ledger,
+        )
+        self.counts["sale_items"] += len(self.sale_items)
+        self.counts["purchase_items"] += len(self.purchase_items)
+        self.counts["ledger_rows"] += len(self.ledger)
+        for buf in (self.sales, self.sale_items, self.purchases, self.purchase_items, self.ledger):
+            buf.clear()
+
+    def history(self) -> int:
+        spec, rng = self.spec, self.rng
+        start = spec.end_date - timedelta(days=spec.days - 1)
+        fx = 850.0
+        fx_rows = []
+        for d in range(spec.days):
+            day = (start + timedelta(days=d)).isoformat()
+            fx = round(fx * (1 + rng.gauss(0.0008, 0.004)), 2)
+            fx_rows.append((day, fx))
+
+            for sec in sorted(rng.randrange(8 * 3600, 9 * 3600) for _ in range(_spread(spec.purchases, spec.days, d))):
+                stamp = f"{day} {sec // 3600:02d}:{sec // 60 % 60:02d}:{sec % 60:02d}"
+                lines = [(idx, rng.randint(10, 60)) for idx in self.pick_products(_line_count(rng, spec.lines_per_purchase))]
+                self.purchase(stamp, rng.choice(_VENDORS), lines, None)
+
+            for sec in sorted(rng.randrange(9 * 3600, 21 * 3600) for _ in range(_spread(spec.sales, spec.days, d))):
+                self.sale(f"{day} {sec // 3600:02d}:{sec // 60 % 60:02d}:{sec % 60:02d}", fx)
+            self.flush()
+        self.flush(force=True)
+        self.conn.executemany("INSERT OR REPLACE INTO fx_rates (date, usd_ars) VALUES (?, ?)", fx_rows)
+        self.conn.executemany(
+            "UPDATE products SET stock = ?, cost_usd = ? WHERE id = ?",
+            ((stock, round(cost, 4), i + 1) for i, (stock, cost) in enumerate(zip(self.stock, self.cost))),
+        )
+        return len(fx_rows)
+
+
+def generate_dataset(
+    db_path: Path | str, spec: DatasetSpec | None = None, *, overwrite: bool = False
+) -> DatasetSummary:
+    """Build a migrated database at ``db_path`` filled with ``spec``-sized history (``DatasetSpec()`` by default).
+
+    The same spec (including ``seed``) always produces the same rows. Stock, costs,
+    ledger and the daily rollup are mutually consistent, as if every sale and
+    purchase had gone through the repository. Loading runs in one transaction with
+    journaling off and secondary indexes and triggers dropped, then rebuilds them.
+    """
+    spec = DatasetSpec() if spec is None else spec
+    if spec.products < 1 or spec.days < 1:
+        raise ValueError("A dataset needs at least one product and one day.")
+    started = time.perf_counter()
+    path = Path(db_path)
+    if path.exists():
+        if not overwrite:
+            raise FileExistsError(f"Database already exists: '{path}'.")
+        for p in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+            p.unlink(missing_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    repo = SqliteRepository(path)
+    repo.init_db()
+    repo.close()
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-131072")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        placeholders = ", ".join("?" * len(_BULK_TABLES))
+        deferred = conn.execute(
+            f"""
+            SELECT type, name, sql FROM sqlite_master
+            WHERE type IN ('index', 'trigger') AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+            """,
+            _BULK_TABLES,
+        ).fetchall()
+
+        conn.execute("BEGIN")
+        for kind, name, _sql in deferred:
+            conn.execute(f'DROP {kind.upper()} "{name}"')
+        gen = _Generator(conn, spec)
+        gen.products()
+        fx_days = gen.history()
+        for _kind, _name, sql in sorted(deferred, key=lambda d: d[0]):  # indexes before triggers
+            conn.execute(sql)
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        conn.close()
+
+    repo = SqliteRepository(path)
+    try:
+        repo.rebuild_sales_rollup()
+    finally:
+        repo.close()
+
+    return DatasetSummary(
+        path=path,
+        products=spec.products,
+        sales=gen.sale_id,
+        sale_items=gen.counts["sale_items"],
+        purchases=gen.purchase_id,
+        purchase_items=gen.counts["purchase_items"],
+        ledger_rows=gen.counts["ledger_rows"],
+        fx_rates=fx_days,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--products", type=int)
+    parser.add_argument("--sales", type=int)
+    parser.add_argument("--purchases", type=int)
+    parser.add_argument("--days", type=int)
+    parser.add_argument("--lines-per-sale", type=float)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args(argv)
+
+    overrides = {
+        field: value
+        for field, value in (
+            ("seed", args.seed),
+            ("products", args.products),
+            ("sales", args.sales),
+            ("purchases", args.purchases),
+            ("days", args.days),
+            ("lines_per_sale", args.lines_per_sale),
+        )
+        if value is not None
+    }
+    spec = replace(SIZES[args.size], **overrides)
+    summary = generate_dataset(args.output, spec, overwrite=args.overwrite)
+    print(
+        f"{summary.path}: {summary.products} products, {summary.sales} sales / {summary.sale_items} lines, "
+        f"{summary.purchases} purchases / {summary.purchase_items} lines, {summary.ledger_rows} ledger rows, "
+        f"{summary.fx_rates} FX rates in {summary.seconds:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Replay a recorded service workload against a copy of a database.
+
+Usage:
+    python -m ism.devtools.workload JOURNAL.ndjson SOURCE.db [--speed 1|10|max] [--workers 4] [--output report.json]
+
+Record a journal by starting the app with ``ISM_WORKLOAD_JOURNAL=path`` (add
+``ISM_WORKLOAD_STRIP_NOTES=1`` to drop free-text notes). ``SOURCE.db`` is never
+written; the replay runs on a copy, kept only when ``--keep-copy`` names a path.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.excel_service import ExcelService
+from ism.services.inventory_service import InventoryService
+from ism.services.purchase_service import PurchaseService
+from ism.services.sales_service import SalesService
+from ism.services.workload_recorder import RECORDED_OPERATIONS
+
+
+class FixedFxService:
+    def __init__(self, rate: float):
+        self.rate = rate
+
+    def get_today_rate(self) -> float:
+        return self.rate
+
+
+@dataclass(frozen=True, slots=True)
+class JournalEntry:
+    t: float
+    op: str
+    args: dict
+
+
+@dataclass(slots=True)
+class _OpStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+def load_journal(path: Path | str) -> list[JournalEntry]:
+    """Journal entries in start-time order; blank and truncated lines are skipped."""
+    entries = []
+    with Path(path).open(encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries.append(JournalEntry(t=float(raw["t"]), op=str(raw["op"]), args=dict(raw.get("args") or {})))
+    entries.sort(key=lambda e: e.t)
+    return entries
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, max(0, round(pct / 100.0 * len(sorted_samples)) - 1))]
+
+
+def _copy_database(source_db: Path | str, target: Path) -> None:
+    """Consistent copy through the online backup API, including pages still in the source's WAL."""
+    src = sqlite3.connect(source_db)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def replay(
+    journal: Path | str,
+    source_db: Path | str,
+    *,
+    speed: float | None = 1.0,
+    workers: int = 1,
+    fx_rate: float = 1000.0,
+    work_db: Path | str | None = None,
+) -> dict:
+    """Run every journaled call against a copy of ``source_db`` and report per-operation latency.
+
+    ``speed`` scales the recorded gaps between calls (``2.0`` replays twice as
+    fast); ``None`` issues calls back to back. With ``workers > 1`` calls that are
+    due together run concurrently, as they would from several terminals.
+    """
+    entries = load_journal(journal)
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(work_db) if work_db else Path(tmp) / "replay.db"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _copy_database(source_db, target)
+
+        repo = SqliteRepository(target)
+        repo.init_db()
+        inventory = InventoryService(repo)
+        purchases = PurchaseService(repo)
+        services = {
+            "sales": SalesService(repo, FixedFxService(fx_rate)),
+            "purchases": purchases,
+            "inventory": inventory,
+            "excel": ExcelService(repo, purchases, inventory),
+        }
+
+        lock = threading.Lock()
+        stats: dict[str, _OpStats] = {}
+        skipped = 0
+
+        def call(entry: JournalEntry) -> None:
+            name, _, method = entry.op.partition(".")
+            t0 = time.perf_counter()
+            ok = True
+            try:
+                getattr(services[name], method)(**entry.args)
+            except Exception:  # noqa: BLE001
+                ok = False
+            elapsed = time.perf_counter() - t0
+            with lock:
+                op = stats.setdefault(entry.op, _OpStats())
+                op.latencies.append(elapsed)
+                op.errors += 0 if ok else 1
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                pending = []
+                origin = entries[0].t if entries else 0.0
+                for entry in entries:
+                    name, _, method = entry.op.partition(".")
+                    if method not in RECORDED_OPERATIONS.get(name, ()):
+                        skipped += 1
+                        continue
+                    if speed:
+                        delay = (entry.t - origin) / speed - (time.perf_counter() - started)
+                        if delay > 0:
+                            time.sleep(delay)
+                    if workers <= 1:
+                        call(entry)
+                    else:
+                        pending.append(pool.submit(call, entry))
+                for future in pending:
+                    future.result()
+            wall = time.perf_counter() - started
+        finally:
+            repo.close()
+
+    total = sum(len(s.latencies) for s in stats.values())
+    operations = {}
+    for op, s in sorted(stats.items()):
+        samples = sorted(s.latencies)
+        operations[op] = {
+            "calls": len(samples),
+            "errors": s.errors,
+            "ops_per_s": round(len(samples) / wall, 2) if wall else 0.0,
+            "mean_ms": round(statistics.fmean(samples) * 1000.0, 3),
+            "p50_ms": round(_percentile(samples, 50) * 1000.0, 3),
+            "p95_ms": round(_percentile(samples, 95) * 1000.0, 3),
+            "p99_ms": round(_percentile(samples, 99) * 1000.0, 3),
+            "max_ms": round(samples[-1] * 1000.0, 3),
+        }
+    return {
+        "calls": total,
+        "skipped": skipped,
+        "wall_s": round(wall, 3),
+        "ops_per_s": round(total / wall, 2) if wall else 0.0,
+        "speed": speed,
+        "workers": workers,
+        "operations": operations,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("journal", type=Path)
+    parser.add_argument("source_db", type=Path)
+    parser.add_argument("--speed", default="1", help="time scale for recorded gaps, or 'max' for no waiting")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--fx-rate", type=float, default=1000.0, help="USD/ARS rate used for replayed sales")
+    parser.add_argument("--keep-copy", type=Path, help="replay into this database file and keep it")
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.speed.strip().lower() in {"max", "0"}:
+        speed = None
+    else:
+        try:
+            speed = float(args.speed.rstrip("xX"))
+        except ValueError:
+            parser.error("--speed must be a number such as 1, 10 or 'max'")
+
+    report = replay(
+        args.journal,
+        args.source_db,
+        speed=speed,
+        workers=args.workers,
+        fx_rate=args.fx_rate,
+        work_db=args.keep_copy,
+    )
+    print(
+        f"{report['calls']} calls in {report['wall_s']:.2f} s ({report['ops_per_s']:.1f}/s), "
+        f"{report['skipped']} skipped, speed={'max' if speed is None else speed}, workers={args.workers}"
+    )
+    for op, r in report["operations"].items():
+        print(
+            f"  {op:<36} {r['calls']:>7} calls {r['errors']:>5} err {r['ops_per_s']:>9.1f}/s  "
+            f"p50 {r['p50_ms']:9.3f}  p95 {r['p95_ms']:9.3f}  p99 {r['p99_ms']:9.3f} ms"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,3 +20,7 @@ class FxUnavailableError(AppError):
 
 class AuthorizationError(AppError):
     pass
+
+
+class DatabaseBusyError(AppError):
+    pass
@@ -1,9 +1,13 @@
 from __future__ import annotations
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import Optional
+from functools import cache
+from typing import Optional, TypeVar
 
+T = TypeVar("T")
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Product:
     id: int
     sku: str
@@ -15,7 +19,7 @@ class Product:
     active: int = 1
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SaleHeader:
     id: int
     datetime: str
@@ -25,7 +29,7 @@ class SaleHeader:
     notes: Optional[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SaleLine:
     sku: str
     name: str
@@ -36,7 +40,7 @@ class SaleLine:
     line_margin_usd: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PurchaseHeader:
     id: int
     datetime: str
@@ -45,7 +49,7 @@ class PurchaseHeader:
     notes: Optional[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PurchaseLine:
     sku: str
     name: str
@@ -54,7 +58,7 @@ class PurchaseLine:
     line_total_usd: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class User:
     id: int
     username: str
@@ -62,7 +66,8 @@ class User:
     active: int = 1
     must_change_pin: int = 0
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class LedgerEntry:
     id: int
     datetime: str
@@ -73,5 +78,21 @@ class LedgerEntry:
     unit_value_usd: float
     reference_type: str
     reference_id: int
-    actor_user_id: Optional[int]
-    notes: Optional[str]
\ No newline at end of file
+    actor_user_id: int | None
+    notes: str | None
+
+
+@cache
+def row_builder(cls: type[T]) -> Callable[[Sequence], T]:
+    """Return ``build(row) -> cls`` that maps a row tuple onto a model positionally.
+
+    The row must hold every field in declaration order, already of the right type
+    (SQLite column affinity takes care of that for the repository queries), so no
+    per-field ``int()``/``float()``/``str()`` coercion is needed.
+    """
+
+    def build(row: Sequence) -> T:
+        return cls(*row)
+
+    build.__qualname__ = f"row_builder.<{cls.__name__}>"
+    return build
@@ -46,3 +46,7 @@ def setup_logging(logs_dir: Path, level: int = logging.INFO) -> None:
     fx_handler = _handler(logs_dir / "fx.log", logging.INFO)
     logging.getLogger("ism.fx").addHandler(fx_handler)
     logging.getLogger("ism.fx").setLevel(logging.INFO)
+
+    # Only written when SQL instrumentation is enabled (ISM_SQL_STATS=1).
+    slow_handler = _handler(logs_dir / "slow_queries.log", logging.WARNING)
+    logging.getLogger("ism.sql.slow").addHandler(slow_handler)
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import time
+
+_LAUNCHED = time.perf_counter()
+
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -11,30 +16,50 @@ if __package__ in (None, ""):
 from ism.config import get_app_paths
 from ism.logging_config import setup_logging
 from ism.application import build_container
+from ism.services.startup_prefetch import StartupPrefetch
+from ism.startup import StartupTimer
 from ism.ui.app import App
 
+_IMPORTED = time.perf_counter()
+
 
 def main() -> None:
+    echo = "--startup-report" in sys.argv[1:] or (
+        os.environ.get("ISM_STARTUP_REPORT", "").strip().lower() in {"1", "true", "yes", "on"}
+    )
+    startup = StartupTimer(origin=_LAUNCHED, echo=echo)
+    startup.record("imports", _IMPORTED - _LAUNCHED)
+
     paths = get_app_paths()
     setup_logging(paths.logs_dir, level=logging.INFO)
 
-    container = build_container(paths.db_path)
-
-    app = App(
-        fx_service=container.fx,
-        inventory_service=container.inventory,
-        sales_service=container.sales,
-        purchase_service=container.purchases,
-        excel_service=container.excel,
-        reporting_service=container.reporting,
-        auth_service=container.auth,
-        backup_service=container.backup,
-        operations_service=container.operations,
-        update_service=container.updates, 
-        db_path=str(paths.db_path),
-        logs_dir=str(paths.logs_dir),
-    )
-    app.mainloop()
+    with startup.phase("container"):
+        container = build_container(paths.db_path, startup=startup)
+    # Warm the catalog, KPIs and FX rate while the login dialog is open.
+    prefetch = StartupPrefetch(container.inventory, container.sales, container.fx).start()
+
+    try:
+        app = App(
+            fx_service=container.fx,
+            inventory_service=container.inventory,
+            sales_service=container.sales,
+            purchase_service=container.purchases,
+            # Built on first use: Excel import/export and update checks are rare.
+            excel_service=lambda: container.excel,
+            reporting_service=lambda: container.reporting,
+            auth_service=container.auth,
+            backup_service=container.backup,
+            operations_service=container.operations,
+            update_service=lambda: container.updates,
+            change_monitor=container.changes,
+            db_path=str(paths.db_path),
+            logs_dir=str(paths.logs_dir),
+            startup=startup,
+            prefetch=prefetch,
+        )
+        app.mainloop()
+    finally:
+        container.close()
 
 
 if __name__ == "__main__":
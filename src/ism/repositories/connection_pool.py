@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import weakref
+from collections.abc import Callable
+from pathlib import Path
+from queue import Empty, Full, LifoQueue
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection that goes back to its pool on ``close()``.
+
+    Repository methods take one in a ``with self._connection() as conn:`` block;
+    closing a pooled connection discards any uncommitted work (same as a real
+    close) and hands the open handle back for reuse.
+    """
+
+    _pool: SqliteConnectionPool | None = None
+
+    def close(self) -> None:
+        pool = self._pool
+        if pool is None:
+            super().close()
+            return
+        pool.release(self)
+
+    def close_physical(self) -> None:
+        self._pool = None
+        super().close()
+
+
+class SqliteConnectionPool:
+    """LIFO pool of SQLite connections for a single database file.
+
+    LIFO keeps the most recently used (warmest page cache) connection in play.
+    With ``read_only=True`` connections are opened through a ``file:...?mode=ro``
+    URI, so they can never take the write lock.
+    Connections are opened lazily and are never shared by two callers at once.
+    Only the idle set is bounded: every caller gets a connection immediately
+    (SQLite's own locking serialises writers), and idle connections beyond
+    ``max_idle`` are closed on release. If the database file is replaced
+    underneath the pool (backup restore), idle connections are dropped so
+    callers never read the old file.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_idle: int = 4,
+        on_connect: Callable[[sqlite3.Connection], None] | None = None,
+        read_only: bool = False,
+        connection_class: type[PooledConnection] = PooledConnection,
+    ):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.connection_class = connection_class
+        self.max_idle = max(1, int(max_idle))
+        self.on_connect = on_connect
+        self._idle: LifoQueue[PooledConnection] = LifoQueue(maxsize=self.max_idle)
+        self._lock = threading.Lock()
+        # Weak: a connection leaked by an exception is closed by GC instead of holding its lock.
+        self._open: weakref.WeakSet[PooledConnection] = weakref.WeakSet()
+        self._file_id: tuple[int, int] | None = None
+        self.connections_opened = 0
+
+    def _current_file_id(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _connect(self) -> PooledConnection:
+        if self.read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, factory=self.connection_class, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, factory=self.connection_class, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON;")
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        conn._pool = self
+        with self._lock:
+            self._file_id = self._current_file_id()
+            self._open.add(conn)
+            self.connections_opened += 1
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        if self._file_id is not None and self._current_file_id() != self._file_id:
+            self.close()
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            return self._connect()
+
+    def release(self, conn: PooledConnection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if conn in self._open:
+                try:
+                    self._idle.put_nowait(conn)
+                    return
+                except Full:
+                    self._open.discard(conn)
+        conn.close_physical()
+
+    def close(self) -> None:
+        """Close every idle connection and detach the ones currently checked out.
+
+        Checked-out connections are closed when their holder releases them. The
+        pool stays usable: the next ``acquire`` opens a fresh connection.
+        """
+        idle: list[PooledConnection] = []
+        with self._lock:
+            self._file_id = None
+            self._open.clear()
+            while True:
+                try:
+                    idle.append(self._idle.get_nowait())
+                except Empty:
+                    break
+        for conn in idle:
+            conn.close_physical()
+
+    @property
+    def open_count(self) -> int:
+        with self._lock:
+            return len(self._open)
+
+
+class SavepointConnection:
+    """Nested view of a connection whose transaction is owned by a unit of work.
+
+    Repository methods keep calling ``commit()``, ``rollback()`` and ``close()``;
+    here those only release or undo a savepoint, so the outer transaction decides
+    what is finally committed.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, name: str):
+        self._conn = conn
+        self._name = name
+        self._active = True
+        conn.execute(f"SAVEPOINT {name}")
+
+    def __getattr__(self, attr: str):
+        return getattr(self._conn, attr)
+
+    def cursor(self) -> sqlite3.Cursor:
+        return self._conn.cursor()
+
+    def execute(self, sql: str, parameters=()) -> sqlite3.Cursor:
+        return self._conn.execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters) -> sqlite3.Cursor:
+        return self._conn.executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:
+        if self._active:
+            self._active = False
+            self._conn.execute(f"RELEASE {self._name}")
+
+    def rollback(self) -> None:
+        if self._active:
+            self._active = False
+            self._conn.execute(f"ROLLBACK TO {self._name}")
+            self._conn.execute(f"RELEASE {self._name}")
+
+    def close(self) -> None:
+        self.rollback()
@@ -6,25 +6,33 @@ from ism.domain.models import Product, PurchaseHeader, PurchaseLine, SaleHeader,
 
 
 class ProductRepository(Protocol):
-    def list_products(self) -> list[Product]: ...
+    def list_products(self, *, after: tuple[str, int] | None = None, limit: int | None = None) -> list[Product]: ...
     def get_product_by_id(self, product_id: int) -> Optional[Product]: ...
     def get_product_by_sku(self, sku: str) -> Optional[Product]: ...
+    def get_products_by_ids(self, product_ids: Iterable[int]) -> dict[int, Product]: ...
+    def get_products_by_skus(self, skus: Iterable[str]) -> dict[str, Product]: ...
     def upsert_product(self, sku: str, name: str, cost_usd: float, price_usd: float, stock: int, min_stock: int) -> int: ...
     def deactivate_product(self, product_id: int) -> bool: ...
+    def update_product_details(self, product_id: int, name: str, cost_usd: float, price_usd: float, min_stock: int) -> bool: ...
     def update_product_pricing_and_min_stock(self, product_id: int, price_usd: float, min_stock: int) -> bool: ...
     def adjust_product_stock(self, product_id: int, qty_delta: int, actor_user_id: int | None = None, notes: str | None = None) -> bool: ...
 
 class SalesRepository(Protocol):
     def create_sale(self, datetime_iso: str, fx_usd_ars: float, notes: Optional[str], items: Iterable[dict], actor_user_id: int | None = None) -> int: ...
-    def list_sales_between(self, start_iso: str, end_iso: str) -> list[SaleHeader]: ...
+    def list_sales_between(
+        self, start_iso: str, end_iso: str, *, after: tuple[str, int] | None = None, limit: int | None = None
+    ) -> list[SaleHeader]: ...
     def get_sale_header(self, sale_id: int) -> Optional[SaleHeader]: ...
     def sale_items_for_sale(self, sale_id: int) -> list[SaleLine]: ...
+    def sales_totals_between(self, start_iso: str, end_iso: str) -> tuple[int, float, float, float]: ...
     def sales_summary_between(self, start_iso: str, end_iso: str): ...
 
 
 class PurchaseRepository(Protocol):
     def create_purchase_with_items(self, datetime_iso: str, vendor: Optional[str], total_usd: float, notes: Optional[str], items: Iterable[dict], actor_user_id: int | None = None) -> int: ...
-    def list_purchases_between(self, start_iso: str, end_iso: str) -> list[PurchaseHeader]: ...
+    def list_purchases_between(
+        self, start_iso: str, end_iso: str, *, after: tuple[str, int] | None = None, limit: int | None = None
+    ) -> list[PurchaseHeader]: ...
     def purchase_items_for_purchase(self, purchase_id: int) -> list[PurchaseLine]: ...
 
 
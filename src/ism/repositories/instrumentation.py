@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from ism.repositories.connection_pool import PooledConnection
+
+slow_log = logging.getLogger("ism.sql.slow")
+
+_WS = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def statement_template(sql: str) -> str:
+    """Normalize SQL so calls that differ only in layout or ``IN (?, ?, ...)`` width share one key."""
+    return _PLACEHOLDER_LIST.sub("?, ...", _WS.sub(" ", sql).strip())
+
+
+class _TemplateStats:
+    __slots__ = ("calls", "max_s", "rows", "samples", "total_s")
+
+    def __init__(self, sample_size: int):
+        self.calls = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.rows = 0
+        self.samples: deque[float] = deque(maxlen=sample_size)
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(pct / 100.0 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+class QueryStats:
+    """Thread-safe per-statement-template counters for instrumented connections.
+
+    A call's latency is the time spent in ``execute``/``executemany`` plus the
+    fetches that read its rows, since SQLite steps a query lazily as rows are
+    fetched. Percentiles are computed over the last ``sample_size`` calls of each
+    template. Statements slower than ``slow_ms`` are logged to ``ism.sql.slow``.
+    """
+
+    def __init__(self, slow_ms: float = 100.0, sample_size: int = 2048):
+        self.slow_ms = float(slow_ms)
+        self.sample_size = max(1, int(sample_size))
+        self._lock = threading.Lock()
+        self._templates: dict[str, _TemplateStats] = {}
+
+    def record(self, sql: str, seconds: float, rows: int = 0) -> str:
+        template = statement_template(sql)
+        with self._lock:
+            entry = self._templates.get(template)
+            if entry is None:
+                entry = self._templates[template] = _TemplateStats(self.sample_size)
+            entry.calls += 1
+            entry.total_s += seconds
+            entry.max_s = max(entry.max_s, seconds)
+            entry.rows += rows
+            entry.samples.append(seconds)
+        if seconds * 1000.0 >= self.slow_ms:
+            slow_log.warning("slow_query ms=%.1f rows=%s sql=%s", seconds * 1000.0, rows, template)
+        return template
+
+    def reset(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+    def snapshot(self) -> list[dict[str, object]]:
+        """One dict per template, slowest total time first."""
+        with self._lock:
+            items = [
+                (template, e.calls, e.total_s, e.max_s, e.rows, sorted(e.samples))
+                for template, e in self._templates.items()
+            ]
+        out = []
+        for template, calls, total_s, max_s, rows, samples in sorted(items, key=lambda it: it[2], reverse=True):
+            out.append(
+                {
+                    "sql": template,
+                    "calls": calls,
+                    "rows": rows,
+                    "total_ms": round(total_s * 1000.0, 3),
+                    "p50_ms": round(_percentile(samples, 50) * 1000.0, 3),
+                    "p95_ms": round(_percentile(samples, 95) * 1000.0, 3),
+                    "p99_ms": round(_percentile(samples, 99) * 1000.0, 3),
+                    "max_ms": round(max_s * 1000.0, 3),
+                }
+            )
+        return out
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement, including fetching its rows, and counts the rows.
+
+    A call is recorded once its result is exhausted, or when the cursor runs the
+    next statement, is closed or is garbage collected.
+    """
+
+    _stats: QueryStats
+    _sql: str | None = None
+    _elapsed = 0.0
+    _rows = 0
+
+    def execute(self, sql, parameters=()):
+        self._flush()
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._sql = sql
+            self._elapsed = time.perf_counter() - started
+
+    def executemany(self, sql, seq_of_parameters):
+        self._flush()
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._sql = sql
+            self._elapsed = time.perf_counter() - started
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - started
+        if row is None:
+            self._flush()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        if not rows:
+            self._flush()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        self._flush()
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._elapsed += time.perf_counter() - started
+            self._flush()
+            raise
+        self._elapsed += time.perf_counter() - started
+        self._rows += 1
+        return row
+
+    def close(self):
+        self._flush()
+        super().close()
+
+    def __del__(self):
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._sql is not None:
+            self._stats.record(self._sql, self._elapsed, self._rows)
+        self._sql = None
+        self._elapsed = 0.0
+        self._rows = 0
+
+
+class InstrumentedConnection(PooledConnection):
+    """Pooled connection whose statements and commits are recorded in ``query_stats``."""
+
+    query_stats: QueryStats | None = None
+
+    def cursor(self, factory=None):
+        if self.query_stats is None:
+            return super().cursor(factory or sqlite3.Cursor)
+        cur = super().cursor(factory or InstrumentedCursor)
+        if isinstance(cur, InstrumentedCursor):
+            cur._stats = self.query_stats
+        return cur
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        stats = self.query_stats
+        if stats is None or not self.in_transaction:
+            return super().commit()
+        started = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            stats.record("COMMIT", time.perf_counter() - started)
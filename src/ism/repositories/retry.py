@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import functools
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from ism.domain.errors import DatabaseBusyError
+
+T = TypeVar("T")
+
+_BUSY_CODES = {5, 6}  # SQLITE_BUSY, SQLITE_LOCKED
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 6
+    base_delay_ms: float = 25.0
+    max_delay_ms: float = 1_000.0
+    deadline_ms: float = 15_000.0
+    jitter: float = 0.5
+
+    def delay_for(self, retry_number: int, rng: Callable[[], float] = random.random) -> float:
+        """Seconds to sleep before retry ``retry_number`` (1-based): capped exponential with jitter."""
+        raw = min(self.max_delay_ms, self.base_delay_ms * (2 ** (retry_number - 1)))
+        spread = raw * self.jitter
+        return max(0.0, raw - spread + (2 * spread * rng())) / 1000.0
+
+
+class RetryStats:
+    """Thread-safe contention counters, reported by the health check."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.wait_seconds = 0.0
+
+    def record(self, retries: int, waited: float, gave_up: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            self.wait_seconds += waited
+            if gave_up:
+                self.gave_up += 1
+
+    def snapshot(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+                "wait_seconds": round(self.wait_seconds, 4),
+            }
+
+
+def is_busy_error(exc: BaseException) -> bool:
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        return (int(code) & 0xFF) in _BUSY_CODES
+    msg = str(exc).lower()
+    return "database is locked" in msg or "database is busy" in msg or "database table is locked" in msg
+
+
+def run_with_retry(
+    fn: Callable[[], T],
+    policy: RetryPolicy,
+    stats: RetryStats | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Call ``fn`` and retry it while SQLite reports the database as busy/locked.
+
+    Gives up after ``policy.max_attempts`` calls or once the next sleep would pass
+    ``policy.deadline_ms``, raising ``DatabaseBusyError`` chained to the last error.
+    """
+    started = time.monotonic()
+    deadline = started + policy.deadline_ms / 1000.0
+    retries = 0
+    waited = 0.0
+    while True:
+        try:
+            result = fn()
+        except sqlite3.OperationalError as exc:
+            if not is_busy_error(exc):
+                if stats is not None:
+                    stats.record(retries, waited, gave_up=False)
+                raise
+            delay = policy.delay_for(retries + 1)
+            if retries + 1 >= policy.max_attempts or time.monotonic() + delay > deadline:
+                if stats is not None:
+                    stats.record(retries, waited, gave_up=True)
+                raise DatabaseBusyError("Database is busy on another terminal. Please try again.") from exc
+        else:
+            if stats is not None:
+                stats.record(retries, waited, gave_up=False)
+            return result
+        sleep(delay)
+        waited += delay
+        retries += 1
+
+
+def retry_on_busy(method: Callable[..., T]) -> Callable[..., T]:
+    """Method decorator: run a repository write under ``self.retry_policy``.
+
+    Calls made inside an open ``transaction()`` are not retried on their own; the
+    transaction already holds the write lock and owns the retry of its BEGIN.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.in_transaction():
+            return method(self, *args, **kwargs)
+        return run_with_retry(lambda: method(self, *args, **kwargs), self.retry_policy, self.retry_stats)
+
+    return wrapper
@@ -3,57 +3,355 @@ from __future__ import annotations
 import sqlite3
 import hashlib
 import hmac
+import logging
 import os
 import secrets
 import shutil
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Optional, TypeVar
 
-from ism.domain.models import Product, SaleHeader, SaleLine, PurchaseHeader, PurchaseLine, User, LedgerEntry
+from ism.config import SqliteProfile, get_sqlite_profile
+from ism.domain.models import Product, SaleHeader, SaleLine, PurchaseHeader, PurchaseLine, User, LedgerEntry, row_builder
+from ism.repositories.connection_pool import PooledConnection, SavepointConnection, SqliteConnectionPool
+from ism.repositories.instrumentation import InstrumentedConnection, QueryStats
+from ism.repositories.retry import RetryPolicy, RetryStats, retry_on_busy, run_with_retry
+
+T = TypeVar("T")
+
+log = logging.getLogger(__name__)
+
+# UPDATE ... RETURNING needs SQLite 3.35+; older builds fall back to UPDATE + SELECT.
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_IN_CLAUSE_CHUNK = 900
+# Rows per fetchmany() call for the iter_* streaming reads.
+_FETCH_BATCH = 500
+# Tables whose writes bump change_counters, for cross-process change detection.
+CHANGE_TRACKED_TABLES = ("products", "sales", "purchases")
+# listener(tables, product_ids); product_ids is None when the touched products are unknown.
+ChangeListener = Callable[[frozenset[str], frozenset[int] | None], None]
+# Newest pre-migration backups kept next to the database; older ones are pruned.
+_PRE_MIGRATION_BACKUPS_KEPT = 3
+
+# Column affinity already yields int/float/str, so rows map onto the models as-is.
+_product_row = row_builder(Product)
+_sale_header_row = row_builder(SaleHeader)
+_sale_line_row = row_builder(SaleLine)
+_purchase_header_row = row_builder(PurchaseHeader)
+_purchase_line_row = row_builder(PurchaseLine)
+_ledger_row = row_builder(LedgerEntry)
+
+
+def _limit_arg(limit: int | None) -> int:
+    """``LIMIT`` parameter for optional page sizes; SQLite treats a negative limit as no limit."""
+    return -1 if limit is None else max(0, int(limit))
+
+
+def _keyset_clause(comparison: str, after: tuple | None) -> tuple[str, tuple]:
+    """``AND <row value> <op> (?, ?)`` for keyset pages, so the index seeks straight to the page."""
+    if after is None:
+        return "", ()
+    key, row_id = after
+    return f"AND {comparison} (?, ?)", (key, int(row_id))
 
 
 class SqliteRepository:
-    def __init__(self, db_path: Path | str):
+    def __init__(
+        self,
+        db_path: Path | str,
+        max_idle_connections: int = 4,
+        profile: SqliteProfile | str | None = None,
+        retry_policy: RetryPolicy | None = None,
+        query_stats: QueryStats | None = None,
+    ):
         self.db_path = str(db_path)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        # Opt-in: per-statement timing costs a Python call per execute and fetch.
+        self.query_stats = query_stats
+        self.profile = profile if isinstance(profile, SqliteProfile) else get_sqlite_profile(profile)
+        connection_class = InstrumentedConnection if query_stats is not None else PooledConnection
+        self._pool = SqliteConnectionPool(
+            self.db_path,
+            max_idle=max_idle_connections,
+            on_connect=self._apply_profile,
+            connection_class=connection_class,
+        )
+        # Reporting lane: read-only connections that never compete for the write lock.
+        self._read_pool = SqliteConnectionPool(
+            self.db_path,
+            max_idle=max_idle_connections,
+            on_connect=self._apply_read_profile,
+            read_only=True,
+            connection_class=connection_class,
+        )
+        self._tx = threading.local()
+        self._change_listeners: list[ChangeListener] = []
+        # Long-lived read connection for PRAGMA data_version, which is only meaningful per connection.
+        self._probe: sqlite3.Connection | None = None
+        self._probe_lock = threading.Lock()
+        self._generation = 0
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Call ``listener(tables, product_ids)`` after each committed write.
+
+        ``tables`` names the tables the write changed. ``product_ids`` holds the
+        ``products`` rows it touched, or is ``None`` when that is not known.
+        """
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: ChangeListener) -> None:
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _notify_changed(self, *tables: str, product_ids: Iterable[int] | None = None) -> None:
+        ids = None if product_ids is None else {int(pid) for pid in product_ids}
+        pending = getattr(self._tx, "changed", None)
+        if pending is not None:
+            # Inside transaction(): listeners run once the outer transaction ends.
+            pending.update(tables)
+            known = self._tx.changed_products
+            if "products" in tables and known is not None:
+                self._tx.changed_products = None if ids is None else known | ids
+            return
+        self._fire_changed(frozenset(tables), frozenset(ids) if ids is not None else None)
+
+    def _fire_changed(self, tables: frozenset[str], product_ids: frozenset[int] | None = None) -> None:
+        for listener in list(self._change_listeners):
+            listener(tables, product_ids)
+
+    def _apply_profile(self, conn: sqlite3.Connection) -> None:
+        self._attach_stats(conn)
+        p = self.profile
+        conn.execute(f"PRAGMA busy_timeout = {int(p.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA journal_mode = {p.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {p.synchronous}")
+        conn.execute(f"PRAGMA cache_size = -{int(p.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(p.mmap_size_bytes)}")
+        conn.execute(f"PRAGMA temp_store = {p.temp_store}")
+
+    def _attach_stats(self, conn: sqlite3.Connection) -> None:
+        if isinstance(conn, InstrumentedConnection):
+            conn.query_stats = self.query_stats
+
+    def _apply_read_profile(self, conn: sqlite3.Connection) -> None:
+        # journal_mode is a property of the file and is set by the write lane.
+        self._attach_stats(conn)
+        p = self.profile
+        conn.execute(f"PRAGMA busy_timeout = {int(p.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA cache_size = -{int(p.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(p.mmap_size_bytes)}")
+        conn.execute(f"PRAGMA temp_store = {p.temp_store}")
+        conn.execute("PRAGMA query_only = ON")
 
     def _conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA foreign_keys = ON;")
-        return conn
+        bound = getattr(self._tx, "conn", None)
+        if bound is not None:
+            # Inside transaction(): join it through a savepoint instead of a new connection.
+            self._tx.savepoints += 1
+            return SavepointConnection(bound, f"ism_sp_{self._tx.savepoints}")
+        # Pooled: conn.close() hands the connection back instead of closing the file.
+        return self._pool.acquire()
+
+    def _read_conn(self) -> sqlite3.Connection:
+        """Connection for reporting reads; joins the open transaction if there is one."""
+        if self.in_transaction():
+            return self._conn()
+        return self._read_pool.acquire()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """``_conn()`` for one ``with`` block; the connection goes back even if the block raises."""
+        conn = self._conn()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[sqlite3.Connection]:
+        """``_read_conn()`` for one ``with`` block; the connection goes back even if the block raises."""
+        conn = self._read_conn()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _stream(
+        self,
+        sql: str,
+        params: tuple,
+        build: Callable[[tuple], T],
+        batch_size: int,
+        *,
+        read_only: bool = True,
+    ) -> Iterator[T]:
+        """Yield ``build(row)`` for each result row, fetching ``batch_size`` rows at a time.
+
+        The connection is taken on the first ``next()`` and returned when the
+        generator is exhausted or closed. Inside ``transaction()`` the bound
+        connection is read directly: a savepoint held open by a half-consumed
+        generator would be rolled back out of order and undo later writes.
+        """
+        batch_size = max(1, int(batch_size))
+        bound = getattr(self._tx, "conn", None)
+        if bound is not None:
+            conn = bound
+        else:
+            conn = self._read_pool.acquire() if read_only else self._pool.acquire()
+        try:
+            cur = conn.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from map(build, rows)
+            cur.close()
+        finally:
+            if bound is None:
+                conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run this thread's repository calls on one connection and one BEGIN IMMEDIATE transaction.
+
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        if self.in_transaction():
+            raise RuntimeError("A transaction is already open on this thread.")
+        conn = self._pool.acquire()
+        changed: set[str] = set()
+        try:
+            run_with_retry(lambda: conn.execute("BEGIN IMMEDIATE"), self.retry_policy, self.retry_stats)
+            self._tx.conn = conn
+            self._tx.savepoints = 0
+            self._tx.changed = changed
+            self._tx.changed_products = set()
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            product_ids = getattr(self._tx, "changed_products", None)
+            self._tx.conn = None
+            self._tx.changed = None
+            self._tx.changed_products = None
+            conn.close()
+            # Also after a rollback: caches may have been filled from the uncommitted state.
+            if changed:
+                self._fire_changed(frozenset(changed), frozenset(product_ids) if product_ids is not None else None)
+
+    def in_transaction(self) -> bool:
+        return getattr(self._tx, "conn", None) is not None
+
+    def close(self) -> None:
+        """Close pooled connections. The repository reconnects lazily if used again."""
+        with self._probe_lock:
+            probe, self._probe = self._probe, None
+            self._generation += 1
+        if probe is not None:
+            probe.close()
+        self._pool.close()
+        self._read_pool.close()
+
+    def __enter__(self) -> SqliteRepository:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
     def init_db(self) -> None:
         self.run_migrations()
         self._ensure_bootstrap_admin()
 
+    def _migrations(self) -> list[tuple[int, Callable[[sqlite3.Cursor], None]]]:
+        return [
+            (1, self._migration_v1_base),
+            (2, self._migration_v2_constraints_and_ledger),
+            (3, self._migration_v3_auth_hardening),
+            (4, self._migration_v4_indexes),
+            (5, self._migration_v5_keyset_indexes),
+            (6, self._migration_v6_sales_daily_rollup),
+            (7, self._migration_v7_sale_item_cost_snapshot),
+            (8, self._migration_v8_summary_covering_indexes),
+            (9, self._migration_v9_change_counters),
+        ]
+
+    @staticmethod
+    def _applied_migrations(cur: sqlite3.Cursor) -> set[int]:
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='schema_migrations'")
+        if cur.fetchone() is None:
+            return set()
+        cur.execute("SELECT version FROM schema_migrations")
+        return {int(r[0]) for r in cur.fetchall()}
+
+    @staticmethod
+    def _recorded_migration_count(cur: sqlite3.Cursor) -> int:
+        try:
+            cur.execute("SELECT COUNT(*) FROM schema_migrations")
+        except sqlite3.OperationalError:
+            return 0
+        return int(cur.fetchone()[0])
+
     def run_migrations(self) -> None:
+        """Apply pending migrations; a database already at the latest version costs two cheap reads.
+
+        ``PRAGMA user_version`` mirrors the newest applied migration once every
+        migration up to it is recorded in ``schema_migrations``. The fast path
+        also checks that ``schema_migrations`` holds one row per migration, so a
+        database whose history was edited by hand or by an older tool is still
+        repaired. The file is only backed up when there is pending work on a
+        database that already has tables.
+        """
+        migrations = self._migrations()
+        latest = max(version for version, _ in migrations)
+
+        conn = self._conn()
+        try:
+            cur = conn.cursor()
+            cur.execute("PRAGMA user_version")
+            current = int(cur.fetchone()[0])
+            if current == latest and self._recorded_migration_count(cur) == len(migrations):
+                return
+            applied_versions = self._applied_migrations(cur)
+            pending = [(v, m) for v, m in migrations if v not in applied_versions]
+            if not pending:
+                if current < latest:
+                    cur.execute(f"PRAGMA user_version = {latest}")
+                elif current > latest:
+                    # Written by a newer build: its marker is not ours to lower.
+                    log.warning("schema_newer_than_build user_version=%s latest=%s", current, latest)
+                return
+            cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' LIMIT 1")
+            has_schema = cur.fetchone() is not None
+        finally:
+            conn.close()
+
+        backup_path = self._create_pre_migration_backup() if has_schema else None
         conn = self._conn()
-        backup_path = self._create_pre_migration_backup()
         try:
             cur = conn.cursor()
             cur.execute("BEGIN")
             cur.execute("CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, applied_at TEXT NOT NULL)")
-            cur.execute("SELECT version FROM schema_migrations")
-            applied_versions = {int(r[0]) for r in cur.fetchall()}
-
-            migrations = [
-                (1, self._migration_v1_base),
-                (2, self._migration_v2_constraints_and_ledger),
-                (3, self._migration_v3_auth_hardening),
-                (4, self._migration_v4_indexes),
-            ]
-
-            for version, migration in migrations:
-                if version in applied_versions:
-                    continue
+
+            for version, migration in pending:
                 migration(cur)
                 cur.execute(
                     "INSERT INTO schema_migrations (version, applied_at) VALUES (?, datetime('now'))",
                     (version,),
                 )
+            cur.execute(f"PRAGMA user_version = {max(current, latest)}")
             conn.commit()
         except Exception as exc:
             conn.rollback()
+            # Drop every handle on the file before it is overwritten by the backup.
+            self.close()
+            conn.close()
             self._restore_pre_migration_backup(backup_path)
             raise RuntimeError(
                 "Database migration failed. Original database restored from automatic backup."
@@ -63,10 +361,19 @@ class SqliteRepository:
 
     def _create_pre_migration_backup(self) -> Path | None:
         db_file = Path(self.db_path)
-        if not db_file.exists() or db_file.stat().st_size == 0:
+        if not db_file.exists():
             return None
         backup_file = db_file.with_name(f"{db_file.stem}.pre_migration_{datetime.now().strftime('%Y%m%d%H%M%S')}.bak")
-        shutil.copy2(db_file, backup_file)
+        # The online backup API copies a consistent snapshot, including pages still in the WAL.
+        src = self._conn()
+        dst = sqlite3.connect(backup_file)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        for old in sorted(db_file.parent.glob(f"{db_file.stem}.pre_migration_*.bak"))[:-_PRE_MIGRATION_BACKUPS_KEPT]:
+            old.unlink(missing_ok=True)
         return backup_file
 
     def _restore_pre_migration_backup(self, backup_path: Path | None) -> None:
@@ -216,39 +523,129 @@ class SqliteRepository:
         cur.execute("CREATE INDEX IF NOT EXISTS idx_purchase_items_product_id ON purchase_items(product_id)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_stock_ledger_product_datetime ON stock_ledger(product_id, datetime DESC)")
 
+    def _migration_v5_keyset_indexes(self, cur: sqlite3.Cursor) -> None:
+        # recent_ledger pages over (datetime, id) across all products.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_stock_ledger_datetime ON stock_ledger(datetime)")
+
+    def _migration_v6_sales_daily_rollup(self, cur: sqlite3.Cursor) -> None:
+        # One row per sale day, kept current by create_sale; the monthly and profit charts read it.
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sales_daily_rollup (
+                day TEXT PRIMARY KEY,
+                sales_count INTEGER NOT NULL DEFAULT 0,
+                revenue_usd REAL NOT NULL DEFAULT 0,
+                revenue_ars REAL NOT NULL DEFAULT 0,
+                cost_usd REAL NOT NULL DEFAULT 0,
+                margin_usd REAL NOT NULL DEFAULT 0,
+                units INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+            """
+        )
+        # sale_items.unit_cost_usd only arrives in v7, so this backfill costs lines from products.
+        cur.execute(
+            """
+            INSERT INTO sales_daily_rollup (day, sales_count, revenue_usd, revenue_ars, cost_usd, margin_usd, units)
+            SELECT substr(s.datetime, 1, 10) AS day,
+                   COUNT(*),
+                   COALESCE(SUM(s.total_usd), 0),
+                   COALESCE(SUM(s.total_ars), 0),
+                   COALESCE(SUM(l.cost_usd), 0),
+                   COALESCE(SUM(l.margin_usd), 0),
+                   COALESCE(SUM(l.units), 0)
+            FROM sales s
+            LEFT JOIN (
+                SELECT si.sale_id,
+                       SUM(si.qty) AS units,
+                       SUM(si.qty * p.cost_usd) AS cost_usd,
+                       SUM(si.qty * (si.unit_price_usd - p.cost_usd)) AS margin_usd
+                FROM sale_items si
+                JOIN products p ON p.id = si.product_id
+                GROUP BY si.sale_id
+            ) l ON l.sale_id = s.id
+            GROUP BY day
+            """
+        )
+
+    def _migration_v7_sale_item_cost_snapshot(self, cur: sqlite3.Cursor) -> None:
+        # Cost at the time of sale; later purchases move products.cost_usd but not past margins.
+        self._add_column_if_missing(cur, "sale_items", "unit_cost_usd", "REAL NOT NULL DEFAULT 0")
+        cur.execute(
+            """
+            UPDATE sale_items
+            SET unit_cost_usd = COALESCE((SELECT p.cost_usd FROM products p WHERE p.id = sale_items.product_id), 0)
+            """
+        )
+
+    def _migration_v8_summary_covering_indexes(self, cur: sqlite3.Cursor) -> None:
+        # Window totals (count, USD, ARS) straight from the index.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sales_datetime_totals ON sales(datetime, total_usd, total_ars)")
+        # Margin and top-products read every line column they need from here.
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_sale_items_sale_lines
+            ON sale_items(sale_id, product_id, qty, unit_price_usd, unit_cost_usd)
+            """
+        )
+        # A left prefix of idx_sale_items_sale_lines. idx_sales_datetime stays: its implicit
+        # rowid suffix serves the ORDER BY datetime DESC, id DESC keyset pages.
+        cur.execute("DROP INDEX IF EXISTS idx_sale_items_sale_id")
+
+    def _migration_v9_change_counters(self, cur: sqlite3.Cursor) -> None:
+        # Bumped by triggers on every row write, whichever process makes it.
+        # A migration that rebuilds one of these tables must recreate its triggers.
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS change_counters (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+            """
+        )
+        for table in CHANGE_TRACKED_TABLES:
+            cur.execute("INSERT OR IGNORE INTO change_counters (table_name, version) VALUES (?, 0)", (table,))
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cur.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_changed
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE change_counters SET version = version + 1 WHERE table_name = '{table}';
+                    END
+                    """
+                )
+
     def _ensure_bootstrap_admin(self) -> None:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute("SELECT id, active FROM users WHERE username='admin' LIMIT 1")
-        row = cur.fetchone()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id, active FROM users WHERE username='admin' LIMIT 1")
+            row = cur.fetchone()
 
-        if row is not None and int(row[1]) == 1:
-            conn.close()
-            return
+            if row is not None and int(row[1]) == 1:
+                return
 
-        bootstrap_pin = os.environ.get("ISM_BOOTSTRAP_ADMIN_PIN", "").strip() or secrets.token_urlsafe(12)
-        bootstrap_hash = self._hash_pin(bootstrap_pin)
+            bootstrap_pin = os.environ.get("ISM_BOOTSTRAP_ADMIN_PIN", "").strip() or secrets.token_urlsafe(12)
+            bootstrap_hash = self._hash_pin(bootstrap_pin)
 
-        if row is None:
-            cur.execute(
-                """
-                INSERT INTO users (username, pin, role, active, must_change_pin)
-                VALUES ('admin', ?, 'admin', 1, 1)
-                """,
-                (bootstrap_hash,),
-            )
-        else:
-            cur.execute(
-                """
-                UPDATE users
-                SET pin=?, role='admin', active=1, must_change_pin=1, failed_attempts=0, locked_until=NULL
-                WHERE id=?
-                """,
-                (bootstrap_hash, int(row[0])),
-            )
+            if row is None:
+                cur.execute(
+                    """
+                    INSERT INTO users (username, pin, role, active, must_change_pin)
+                    VALUES ('admin', ?, 'admin', 1, 1)
+                    """,
+                    (bootstrap_hash,),
+                )
+            else:
+                cur.execute(
+                    """
+                    UPDATE users
+                    SET pin=?, role='admin', active=1, must_change_pin=1, failed_attempts=0, locked_until=NULL
+                    WHERE id=?
+                    """,
+                    (bootstrap_hash, int(row[0])),
+                )
 
-        conn.commit()
-        conn.close()
+            conn.commit()
 
         # Secure local onboarding channel: store one-time bootstrap PIN in a file with restricted permissions.
         pin_file = Path(self.db_path).parent / ".admin_bootstrap_pin"
@@ -258,10 +655,14 @@ class SqliteRepository:
         except Exception:
             pass
 
+    @staticmethod
+    def _has_column(cur: sqlite3.Cursor, table: str, column: str) -> bool:
+        # table_xinfo also lists generated columns, which table_info hides.
+        cur.execute(f"PRAGMA table_xinfo({table})")
+        return column in {str(r[1]) for r in cur.fetchall()}
+
     def _add_column_if_missing(self, cur: sqlite3.Cursor, table: str, column: str, definition: str) -> None:
-        cur.execute(f"PRAGMA table_info({table})")
-        cols = {str(r[1]) for r in cur.fetchall()}
-        if column in cols:
+        if self._has_column(cur, table, column):
             return
         cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
 
@@ -365,13 +766,12 @@ class SqliteRepository:
 
     # ---------- Users ----------
     def list_users(self) -> list[User]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT id, username, role, active, COALESCE(must_change_pin, 0) FROM users WHERE active=1 ORDER BY username"
-        )
-        rows = cur.fetchall()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT id, username, role, active, COALESCE(must_change_pin, 0) FROM users WHERE active=1 ORDER BY username"
+            )
+            rows = cur.fetchall()
         return [
             User(
                 id=int(r[0]),
@@ -396,206 +796,224 @@ class SqliteRepository:
         return cur.fetchone()
 
     def get_user_security_state(self, username: str) -> tuple[int, Optional[str]] | None:
-        conn = self._conn()
-        cur = conn.cursor()
-        row = self._get_user_row(cur, username)
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            row = self._get_user_row(cur, username)
         if not row:
             return None
         return int(row[5]), (str(row[6]) if row[6] is not None else None)
 
     def record_login_failure(self, username: str, max_attempts: int, lockout_seconds: int) -> tuple[int, Optional[str]]:
-        conn = self._conn()
-        cur = conn.cursor()
-        row = self._get_user_row(cur, username)
-        if not row:
-            conn.close()
-            return 0, None
+        with self._connection() as conn:
+            cur = conn.cursor()
+            row = self._get_user_row(cur, username)
+            if not row:
+                return 0, None
 
-        attempts = int(row[5]) + 1
-        locked_until = None
-        if attempts >= int(max_attempts):
-            attempts = 0
-            cur.execute(
-                "UPDATE users SET failed_attempts=?, locked_until=datetime('now', ?) WHERE id=?",
-                (attempts, f"+{int(lockout_seconds)} seconds", int(row[0])),
-            )
-            cur.execute("SELECT locked_until FROM users WHERE id=?", (int(row[0]),))
-            locked_until = str(cur.fetchone()[0])
-        else:
-            cur.execute("UPDATE users SET failed_attempts=? WHERE id=?", (attempts, int(row[0])))
-        conn.commit()
-        conn.close()
+            attempts = int(row[5]) + 1
+            locked_until = None
+            if attempts >= int(max_attempts):
+                attempts = 0
+                cur.execute(
+                    "UPDATE users SET failed_attempts=?, locked_until=datetime('now', ?) WHERE id=?",
+                    (attempts, f"+{int(lockout_seconds)} seconds", int(row[0])),
+                )
+                cur.execute("SELECT locked_until FROM users WHERE id=?", (int(row[0]),))
+                locked_until = str(cur.fetchone()[0])
+            else:
+                cur.execute("UPDATE users SET failed_attempts=? WHERE id=?", (attempts, int(row[0])))
+            conn.commit()
         return attempts, locked_until
 
     def clear_login_guard(self, user_id: int) -> None:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute("UPDATE users SET failed_attempts=0, locked_until=NULL WHERE id=?", (int(user_id),))
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute("UPDATE users SET failed_attempts=0, locked_until=NULL WHERE id=?", (int(user_id),))
+            conn.commit()
 
     def authenticate_user(self, username: str, pin: str) -> Optional[User]:
-        conn = self._conn()
-        cur = conn.cursor()
-        row = self._get_user_row(cur, username)
-        if row and self._verify_pin(str(row[4]), pin):
-            # transparent upgrade from legacy plain-text pins
-            if not str(row[4]).startswith("pbkdf2_sha256$"):
-                cur.execute("UPDATE users SET pin=? WHERE id=?", (self._hash_pin(pin), int(row[0])))
-            cur.execute("UPDATE users SET failed_attempts=0, locked_until=NULL WHERE id=?", (int(row[0]),))
-            conn.commit()
-            conn.close()
-            return User(
-                id=int(row[0]),
-                username=str(row[1]),
-                role=str(row[2]),
-                active=int(row[3]),
-                must_change_pin=int(row[7]),
-            )
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            row = self._get_user_row(cur, username)
+            if row and self._verify_pin(str(row[4]), pin):
+                # transparent upgrade from legacy plain-text pins
+                if not str(row[4]).startswith("pbkdf2_sha256$"):
+                    cur.execute("UPDATE users SET pin=? WHERE id=?", (self._hash_pin(pin), int(row[0])))
+                cur.execute("UPDATE users SET failed_attempts=0, locked_until=NULL WHERE id=?", (int(row[0]),))
+                conn.commit()
+                return User(
+                    id=int(row[0]),
+                    username=str(row[1]),
+                    role=str(row[2]),
+                    active=int(row[3]),
+                    must_change_pin=int(row[7]),
+                )
         return None
 
     def create_user(self, username: str, pin: str, role: str, must_change_pin: int = 0) -> int:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO users (username, pin, role, active, must_change_pin)
-            VALUES (?, ?, ?, 1, ?)
-            """,
-            (username, self._hash_pin(pin), role, int(must_change_pin)),
-        )
-        uid = int(cur.lastrowid)
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO users (username, pin, role, active, must_change_pin)
+                VALUES (?, ?, ?, 1, ?)
+                """,
+                (username, self._hash_pin(pin), role, int(must_change_pin)),
+            )
+            uid = int(cur.lastrowid)
+            conn.commit()
         return uid
     
     def change_user_pin(self, user_id: int, current_pin: str, new_pin: str) -> bool:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute("SELECT pin FROM users WHERE id=? AND active=1", (int(user_id),))
-        row = cur.fetchone()
-        if not row or not self._verify_pin(str(row[0]), current_pin):
-            conn.close()
-            return False
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT pin FROM users WHERE id=? AND active=1", (int(user_id),))
+            row = cur.fetchone()
+            if not row or not self._verify_pin(str(row[0]), current_pin):
+                return False
 
-        cur.execute(
-            "UPDATE users SET pin=?, must_change_pin=0 WHERE id=?",
-            (self._hash_pin(new_pin), int(user_id)),
-        )
-        conn.commit()
-        conn.close()
+            cur.execute(
+                "UPDATE users SET pin=?, must_change_pin=0 WHERE id=?",
+                (self._hash_pin(new_pin), int(user_id)),
+            )
+            conn.commit()
         return True
 
     # ---------- Products ----------
+    @retry_on_busy
     def add_product(self, sku: str, name: str, cost_usd: float, price_usd: float, stock: int, min_stock: int) -> int:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, 
-            (sku, name, cost_usd, price_usd, stock, min_stock)
-        )
-        pid = cur.lastrowid
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, 
+                (sku, name, cost_usd, price_usd, stock, min_stock)
+            )
+            pid = cur.lastrowid
+            conn.commit()
+        self._notify_changed("products", product_ids=(pid,))
         return int(pid)
 
+    @retry_on_busy
     def upsert_product(
         self, sku: str, name: str, cost_usd: float, price_usd: float, stock: int, min_stock: int
     ) -> int:
-        conn = self._conn()
-        cur = conn.cursor()
+        with self._connection() as conn:
+            cur = conn.cursor()
 
-        cur.execute("SELECT id FROM products WHERE sku = ?", (sku,))
-        row = cur.fetchone()
-        if row:
-            pid = int(row[0])
-            cur.execute(
-                """
-                UPDATE products
-                SET name=?, cost_usd=?, price_usd=?, stock=?, min_stock=?, active=1
-                WHERE sku=?
-            """,
-                (name, cost_usd, price_usd, stock, min_stock, sku),
-            )
-        else:
-            cur.execute(
-                """
-                INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (sku, name, cost_usd, price_usd, stock, min_stock),
-            )
-            pid = int(cur.lastrowid)
+            cur.execute("SELECT id FROM products WHERE sku = ?", (sku,))
+            row = cur.fetchone()
+            if row:
+                pid = int(row[0])
+                cur.execute(
+                    """
+                    UPDATE products
+                    SET name=?, cost_usd=?, price_usd=?, stock=?, min_stock=?, active=1
+                    WHERE sku=?
+                """,
+                    (name, cost_usd, price_usd, stock, min_stock, sku),
+                )
+            else:
+                cur.execute(
+                    """
+                    INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (sku, name, cost_usd, price_usd, stock, min_stock),
+                )
+                pid = int(cur.lastrowid)
 
-        conn.commit()
-        conn.close()
+            conn.commit()
+        self._notify_changed("products", product_ids=(pid,))
         return int(pid)
 
-    def list_products(self) -> list[Product]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active
-            FROM products
-            WHERE active = 1
-            ORDER BY name
+    def list_products(self, *, after: tuple[str, int] | None = None, limit: int | None = None) -> list[Product]:
+        """Active products ordered by ``(name, id)``.
+
+        Pass the ``(name, id)`` of the last product of a page as ``after`` to get the
+        next ``limit`` rows (keyset pagination); without ``limit`` every row is returned.
         """
-        )
-        rows = cur.fetchall()
-        conn.close()
-        return [
-            Product(
-                id=int(r[0]),
-                sku=str(r[1]),
-                name=str(r[2]),
-                cost_usd=float(r[3]),
-                price_usd=float(r[4]),
-                stock=int(r[5]),
-                min_stock=int(r[6]),
-                active=int(r[7]),
-            )
-            for r in rows
-        ]
-    
-    def list_top_critical_stock(self, limit: int = 10) -> list[tuple[str, int, int]]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT sku, stock, min_stock
+        return list(self.iter_products(after=after, limit=limit))
+
+    def iter_products(
+        self,
+        *,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+        batch_size: int = _FETCH_BATCH,
+    ) -> Iterator[Product]:
+        keyset, params = _keyset_clause("(name, id) >", after)
+        return self._stream(
+            f"""
+            SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active
             FROM products
-            WHERE active=1
-            ORDER BY (stock - min_stock) ASC, name ASC
+            WHERE active = 1 {keyset}
+            ORDER BY name, id
             LIMIT ?
             """,
-            (int(limit),),
+            (*params, _limit_arg(limit)),
+            _product_row,
+            batch_size,
+            read_only=False,
         )
-        rows = cur.fetchall()
-        conn.close()
+    
+    def list_top_critical_stock(self, limit: int = 10) -> list[tuple[str, int, int]]:
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT sku, stock, min_stock
+                FROM products
+                WHERE active=1
+                ORDER BY (stock - min_stock) ASC, name ASC
+                LIMIT ?
+                """,
+                (int(limit),),
+            )
+            rows = cur.fetchall()
         return [(str(r[0]), int(r[1]), int(r[2])) for r in rows]
 
+    @retry_on_busy
+    def update_product_details(
+        self, product_id: int, name: str, cost_usd: float, price_usd: float, min_stock: int
+    ) -> bool:
+        """Update catalog fields only; stock is left to the ledgered stock paths."""
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE products
+                SET name=?, cost_usd=?, price_usd=?, min_stock=?
+                WHERE id=? AND active=1
+                """,
+                (name, float(cost_usd), float(price_usd), int(min_stock), int(product_id)),
+            )
+            changed = cur.rowcount > 0
+            conn.commit()
+        if changed:
+            self._notify_changed("products", product_ids=(product_id,))
+        return bool(changed)
+
     def update_product_pricing_and_min_stock(self, product_id: int, price_usd: float, min_stock: int) -> bool:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            UPDATE products
-            SET price_usd=?, min_stock=?
-            WHERE id=? AND active=1
-            """,
-            (float(price_usd), int(min_stock), int(product_id)),
-        )
-        changed = cur.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE products
+                SET price_usd=?, min_stock=?
+                WHERE id=? AND active=1
+                """,
+                (float(price_usd), int(min_stock), int(product_id)),
+            )
+            changed = cur.rowcount > 0
+            conn.commit()
+        if changed:
+            self._notify_changed("products", product_ids=(product_id,))
         return bool(changed)
 
+    @retry_on_busy
     def adjust_product_stock(
         self,
         product_id: int,
@@ -603,114 +1021,125 @@ class SqliteRepository:
         actor_user_id: Optional[int] = None,
         notes: Optional[str] = None,
     ) -> bool:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute("SELECT stock, cost_usd FROM products WHERE id=? AND active=1", (int(product_id),))
-        row = cur.fetchone()
-        if not row:
-            conn.close()
-            return False
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT stock, cost_usd FROM products WHERE id=? AND active=1", (int(product_id),))
+            row = cur.fetchone()
+            if not row:
+                return False
 
-        old_stock = int(row[0])
-        unit_value = float(row[1])
-        new_stock = old_stock + int(qty_delta)
-        if new_stock < 0:
-            conn.close()
-            raise ValueError("Cannot leave stock below zero.")
+            old_stock = int(row[0])
+            unit_value = float(row[1])
+            new_stock = old_stock + int(qty_delta)
+            if new_stock < 0:
+                raise ValueError("Cannot leave stock below zero.")
 
-        cur.execute("UPDATE products SET stock=? WHERE id=? AND active=1", (new_stock, int(product_id)))
+            cur.execute("UPDATE products SET stock=? WHERE id=? AND active=1", (new_stock, int(product_id)))
 
-        cur.execute(
-            """
-            INSERT INTO stock_ledger (
-                datetime, product_id, movement_type, qty_delta, stock_after, unit_value_usd,
-                reference_type, reference_id, actor_user_id, notes
+            cur.execute(
+                """
+                INSERT INTO stock_ledger (
+                    datetime, product_id, movement_type, qty_delta, stock_after, unit_value_usd,
+                    reference_type, reference_id, actor_user_id, notes
+                )
+                VALUES (?, ?, 'adjustment', ?, ?, ?, 'manual', 0, ?, ?)
+                """,
+                (
+                    datetime.now().isoformat(timespec="seconds"),
+                    int(product_id),
+                    int(qty_delta),
+                    new_stock,
+                    unit_value,
+                    actor_user_id,
+                    notes,
+                ),
             )
-            VALUES (?, ?, 'adjustment', ?, ?, ?, 'manual', 0, ?, ?)
-            """,
-            (
-                datetime.now().isoformat(timespec="seconds"),
-                int(product_id),
-                int(qty_delta),
-                new_stock,
-                unit_value,
-                actor_user_id,
-                notes,
-            ),
-        )
 
-        conn.commit()
-        conn.close()
+            conn.commit()
+        self._notify_changed("products", "stock_ledger", product_ids=(product_id,))
         return True
 
     def deactivate_product(self, product_id: int) -> bool:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            UPDATE products
-            SET active=0, stock=0
-            WHERE id=? AND active=1
-            """,
-            (int(product_id),),
-        )
-        changed = cur.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE products
+                SET active=0, stock=0
+                WHERE id=? AND active=1
+                """,
+                (int(product_id),),
+            )
+            changed = cur.rowcount > 0
+            conn.commit()
+        if changed:
+            self._notify_changed("products", product_ids=(product_id,))
         return bool(changed)
 
     def get_product_by_sku(self, sku: str) -> Optional[Product]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active
-            FROM products
-            WHERE active=1 AND sku=?
-        """,
-            (sku,),
-        )
-        r = cur.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active
+                FROM products
+                WHERE active=1 AND sku=?
+            """,
+                (sku,),
+            )
+            r = cur.fetchone()
         if not r:
             return None
-        return Product(
-            id=int(r[0]),
-            sku=str(r[1]),
-            name=str(r[2]),
-            cost_usd=float(r[3]),
-            price_usd=float(r[4]),
-            stock=int(r[5]),
-            min_stock=int(r[6]),
-            active=int(r[7]),
-        )
+        return _product_row(r)
 
     def get_product_by_id(self, product_id: int) -> Optional[Product]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active
-            FROM products
-            WHERE active=1 AND id=?
-        """,
-            (int(product_id),),
-        )
-        r = cur.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active
+                FROM products
+                WHERE active=1 AND id=?
+            """,
+                (int(product_id),),
+            )
+            r = cur.fetchone()
         if not r:
             return None
-        return Product(
-            id=int(r[0]),
-            sku=str(r[1]),
-            name=str(r[2]),
-            cost_usd=float(r[3]),
-            price_usd=float(r[4]),
-            stock=int(r[5]),
-            min_stock=int(r[6]),
-            active=int(r[7]),
-        )
+        return _product_row(r)
+
+    def get_products_by_ids(self, product_ids: Iterable[int]) -> dict[int, Product]:
+        ids = list(dict.fromkeys(int(pid) for pid in product_ids))
+        rows = self._select_products_in("id", ids)
+        return {p.id: p for p in rows}
+
+    def get_products_by_skus(self, skus: Iterable[str]) -> dict[str, Product]:
+        keys = list(dict.fromkeys(str(sku) for sku in skus))
+        rows = self._select_products_in("sku", keys)
+        return {p.sku: p for p in rows}
+
+    def _select_products_in(self, column: str, values: list) -> list[Product]:
+        if not values:
+            return []
+        with self._connection() as conn:
+            cur = conn.cursor()
+            out: list[Product] = []
+            # Stay under SQLITE_MAX_VARIABLE_NUMBER (999 on older builds).
+            for start in range(0, len(values), _IN_CLAUSE_CHUNK):
+                chunk = values[start:start + _IN_CLAUSE_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                cur.execute(
+                    f"""
+                    SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active
+                    FROM products
+                    WHERE active=1 AND {column} IN ({placeholders})
+                    """,
+                    chunk,
+                )
+                out.extend(map(_product_row, cur))
+        return out
 
+    @retry_on_busy
     def append_ledger(
         self,
         datetime_iso: str,
@@ -724,200 +1153,380 @@ class SqliteRepository:
         actor_user_id: Optional[int],
         notes: Optional[str],
     ) -> None:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO stock_ledger (
-                datetime, product_id, movement_type, qty_delta, stock_after, unit_value_usd,
-                reference_type, reference_id, actor_user_id, notes
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO stock_ledger (
+                    datetime, product_id, movement_type, qty_delta, stock_after, unit_value_usd,
+                    reference_type, reference_id, actor_user_id, notes
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    datetime_iso,
+                    int(product_id),
+                    movement_type,
+                    int(qty_delta),
+                    int(stock_after),
+                    float(unit_value_usd),
+                    reference_type,
+                    int(reference_id),
+                    actor_user_id,
+                    notes,
+                ),
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                datetime_iso,
-                int(product_id),
-                movement_type,
-                int(qty_delta),
-                int(stock_after),
-                float(unit_value_usd),
-                reference_type,
-                int(reference_id),
-                actor_user_id,
-                notes,
-            ),
-        )
-        conn.commit()
-        conn.close()
+            conn.commit()
 
-    def recent_ledger(self, limit: int = 100) -> list[LedgerEntry]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
+    def recent_ledger(self, limit: int | None = 100, *, after: tuple[str, int] | None = None) -> list[LedgerEntry]:
+        """Newest ledger entries first; ``after=(datetime, id)`` continues from a previous page."""
+        return list(self.iter_ledger(limit, after=after))
+
+    def iter_ledger(
+        self,
+        limit: int | None = None,
+        *,
+        after: tuple[str, int] | None = None,
+        batch_size: int = _FETCH_BATCH,
+    ) -> Iterator[LedgerEntry]:
+        keyset, params = _keyset_clause("(datetime, id) <", after)
+        return self._stream(
+            f"""
             SELECT id, datetime, product_id, movement_type, qty_delta, stock_after, unit_value_usd,
                    reference_type, reference_id, actor_user_id, notes
             FROM stock_ledger
+            WHERE 1 = 1 {keyset}
             ORDER BY datetime DESC, id DESC
             LIMIT ?
             """,
-            (int(limit),),
+            (*params, _limit_arg(limit)),
+            _ledger_row,
+            batch_size,
         )
-        rows = cur.fetchall()
-        conn.close()
-        return [LedgerEntry(*r) for r in rows]
+
+    # ---------- Change detection ----------
+    def data_version(self) -> int:
+        """``PRAGMA data_version`` on a dedicated connection; it changes when anyone else commits."""
+        with self._probe_lock:
+            if self._probe is None:
+                self._probe = self._read_pool.acquire()
+            return int(self._probe.execute("PRAGMA data_version").fetchone()[0])
+
+    def connection_generation(self) -> int:
+        """Bumped by ``close()``; a ``data_version`` read before the change is not comparable after it."""
+        with self._probe_lock:
+            return self._generation
+
+    def change_counters(self) -> dict[str, int]:
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT table_name, version FROM change_counters")
+            counters = {str(r[0]): int(r[1]) for r in cur.fetchall()}
+        return counters
 
     # ---------- FX ----------
     def integrity_check(self) -> str:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute("PRAGMA integrity_check")
-        row = cur.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute("PRAGMA integrity_check")
+            row = cur.fetchone()
         return str(row[0]) if row else "unknown"
 
+    def sqlite_settings(self) -> dict[str, object]:
+        """Effective PRAGMA values on a pooled connection, for diagnostics."""
+        with self._connection() as conn:
+            cur = conn.cursor()
+            settings: dict[str, object] = {"profile": self.profile.name}
+            for pragma in ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout"):
+                cur.execute(f"PRAGMA {pragma}")
+                row = cur.fetchone()
+                settings[pragma] = row[0] if row else None
+        return settings
+
     def get_fx_rate(self, date_iso: str) -> Optional[float]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute("SELECT usd_ars FROM fx_rates WHERE date = ?", (date_iso,))
-        row = cur.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT usd_ars FROM fx_rates WHERE date = ?", (date_iso,))
+            row = cur.fetchone()
         return float(row[0]) if row else None
 
     def set_fx_rate(self, date_iso: str, usd_ars: float) -> None:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO fx_rates (date, usd_ars) VALUES (?, ?)
-            ON CONFLICT(date) DO UPDATE SET usd_ars=excluded.usd_ars
-        """,
-            (date_iso, float(usd_ars)),
-        )
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO fx_rates (date, usd_ars) VALUES (?, ?)
+                ON CONFLICT(date) DO UPDATE SET usd_ars=excluded.usd_ars
+            """,
+                (date_iso, float(usd_ars)),
+            )
+            conn.commit()
     
     def get_latest_fx_rate(self) -> Optional[float]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute("SELECT usd_ars FROM fx_rates ORDER BY date DESC LIMIT 1")
-        row = cur.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT usd_ars FROM fx_rates ORDER BY date DESC LIMIT 1")
+            row = cur.fetchone()
         return float(row[0]) if row else None
 
     # ---------- Sales ----------
+    @retry_on_busy
     def create_sale(self, datetime_iso: str, fx_usd_ars: float, notes: Optional[str], items: Iterable[dict], actor_user_id: Optional[int] = None) -> int:
         items = list(items)
-        conn = self._conn()
-        cur = conn.cursor()
-
-        for it in items:
-            cur.execute("SELECT stock FROM products WHERE id=? AND active=1", (int(it["product_id"]),))
-            row = cur.fetchone()
-            if not row:
-                conn.rollback()
-                conn.close()
-                raise ValueError("Product not found/active.")
-            if int(row[0]) < int(it["qty"]):
-                conn.rollback()
-                conn.close()
-                raise ValueError("Not enough stock for one of the items.")
-
         total_usd = sum(float(it["unit_price_usd"]) * int(it["qty"]) for it in items)
         total_ars = total_usd * float(fx_usd_ars)
 
-        cur.execute(
-            """
-            INSERT INTO sales (datetime, total_usd, fx_usd_ars, total_ars, notes, actor_user_id)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (datetime_iso, float(total_usd), float(fx_usd_ars), float(total_ars), notes, actor_user_id),
-        )
-        sale_id = int(cur.lastrowid)
-
-        for it in items:
+        conn = self._conn()
+        cur = conn.cursor()
+        try:
             cur.execute(
                 """
-                INSERT INTO sale_items (sale_id, product_id, qty, unit_price_usd)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO sales (datetime, total_usd, fx_usd_ars, total_ars, notes, actor_user_id)
+                VALUES (?, ?, ?, ?, ?, ?)
             """,
-                (sale_id, int(it["product_id"]), int(it["qty"]), float(it["unit_price_usd"])),
+                (datetime_iso, float(total_usd), float(fx_usd_ars), float(total_ars), notes, actor_user_id),
             )
+            sale_id = int(cur.lastrowid)
 
-            cur.execute("UPDATE products SET stock = stock - ? WHERE id = ? AND active=1", (int(it["qty"]), int(it["product_id"])))
-            cur.execute("SELECT stock FROM products WHERE id=?", (int(it["product_id"]),))
-            stock_after = int(cur.fetchone()[0])
-            cur.execute(
+            line_rows = []
+            ledger_rows = []
+            units = 0
+            cost_usd = 0.0
+            for it in items:
+                product_id = int(it["product_id"])
+                qty = int(it["qty"])
+                unit_price = float(it["unit_price_usd"])
+
+                # The guarded UPDATE is the oversell check: it only matches when enough stock is left.
+                taken = self._take_stock(cur, product_id, qty)
+                if taken is None:
+                    cur.execute("SELECT 1 FROM products WHERE id=? AND active=1", (product_id,))
+                    if cur.fetchone() is None:
+                        raise ValueError("Product not found/active.")
+                    raise ValueError("Not enough stock for one of the items.")
+                stock_after, unit_cost = taken
+                units += qty
+                cost_usd += qty * unit_cost
+
+                line_rows.append((sale_id, product_id, qty, unit_price, unit_cost))
+                ledger_rows.append((datetime_iso, product_id, -qty, stock_after, unit_price, sale_id, actor_user_id, notes))
+
+            cur.executemany(
+                """
+                INSERT INTO sale_items (sale_id, product_id, qty, unit_price_usd, unit_cost_usd)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                line_rows,
+            )
+            cur.executemany(
                 """
                 INSERT INTO stock_ledger (
                     datetime, product_id, movement_type, qty_delta, stock_after, unit_value_usd,
                     reference_type, reference_id, actor_user_id, notes
                 ) VALUES (?, ?, 'sale', ?, ?, ?, 'sale', ?, ?, ?)
                 """,
-                (datetime_iso, int(it["product_id"]), -int(it["qty"]), stock_after, float(it["unit_price_usd"]), sale_id, actor_user_id, notes),
+                ledger_rows,
+            )
+            self._add_to_sales_rollup(
+                cur, datetime_iso[:10], total_usd, total_ars, cost_usd, total_usd - cost_usd, units
             )
 
-        conn.commit()
-        conn.close()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        self._notify_changed(
+            "products",
+            "sales",
+            "sale_items",
+            "stock_ledger",
+            "sales_daily_rollup",
+            product_ids=(int(it["product_id"]) for it in items),
+        )
         return sale_id
 
-    def list_sales_between(self, start_iso: str, end_iso: str) -> list[SaleHeader]:
-        conn = self._conn()
-        cur = conn.cursor()
+    @staticmethod
+    def _take_stock(cur: sqlite3.Cursor, product_id: int, qty: int) -> tuple[int, float] | None:
+        """Decrement stock only if enough is available; returns ``(new stock, unit cost)`` or None."""
+        if _SQLITE_HAS_RETURNING:
+            cur.execute(
+                "UPDATE products SET stock = stock - ? WHERE id=? AND active=1 AND stock >= ? RETURNING stock, cost_usd",
+                (qty, product_id, qty),
+            )
+            row = cur.fetchone()
+            return (int(row[0]), float(row[1])) if row else None
+
+        cur.execute(
+            "UPDATE products SET stock = stock - ? WHERE id=? AND active=1 AND stock >= ?",
+            (qty, product_id, qty),
+        )
+        if cur.rowcount == 0:
+            return None
+        cur.execute("SELECT stock, cost_usd FROM products WHERE id=?", (product_id,))
+        row = cur.fetchone()
+        return int(row[0]), float(row[1])
+
+    @staticmethod
+    def _add_to_sales_rollup(
+        cur: sqlite3.Cursor,
+        day: str,
+        revenue_usd: float,
+        revenue_ars: float,
+        cost_usd: float,
+        margin_usd: float,
+        units: int,
+    ) -> None:
         cur.execute(
             """
-            SELECT id, datetime, total_usd, fx_usd_ars, total_ars, notes
-            FROM sales
-            WHERE datetime >= ? AND datetime < ?
-            ORDER BY datetime DESC
-        """,
-            (start_iso, end_iso),
+            INSERT INTO sales_daily_rollup (day, sales_count, revenue_usd, revenue_ars, cost_usd, margin_usd, units)
+            VALUES (?, 1, ?, ?, ?, ?, ?)
+            ON CONFLICT(day) DO UPDATE SET
+                sales_count = sales_count + 1,
+                revenue_usd = revenue_usd + excluded.revenue_usd,
+                revenue_ars = revenue_ars + excluded.revenue_ars,
+                cost_usd = cost_usd + excluded.cost_usd,
+                margin_usd = margin_usd + excluded.margin_usd,
+                units = units + excluded.units
+            """,
+            (day, float(revenue_usd), float(revenue_ars), float(cost_usd), float(margin_usd), int(units)),
         )
-        rows = cur.fetchall()
-        conn.close()
-        return [
-            SaleHeader(
-                id=int(r[0]),
-                datetime=str(r[1]),
-                total_usd=float(r[2]),
-                fx_usd_ars=float(r[3]),
-                total_ars=float(r[4]),
-                notes=(r[5] if r[5] is not None else None),
-            )
-            for r in rows
-        ]
-    def monthly_sales_totals(self, months: int = 6) -> list[tuple[str, float]]:
-        conn = self._conn()
-        cur = conn.cursor()
+
+    @staticmethod
+    def _rebuild_sales_rollup(cur: sqlite3.Cursor) -> None:
+        cur.execute("DELETE FROM sales_daily_rollup")
         cur.execute(
             """
-            SELECT substr(datetime,1,7) AS ym, COALESCE(SUM(total_usd),0)
+            INSERT INTO sales_daily_rollup (day, sales_count, revenue_usd, revenue_ars, cost_usd, margin_usd, units)
+            SELECT substr(s.datetime, 1, 10) AS day,
+                   COUNT(*),
+                   COALESCE(SUM(s.total_usd), 0),
+                   COALESCE(SUM(s.total_ars), 0),
+                   COALESCE(SUM(l.cost_usd), 0),
+                   COALESCE(SUM(l.margin_usd), 0),
+                   COALESCE(SUM(l.units), 0)
+            FROM sales s
+            LEFT JOIN (
+                SELECT sale_id,
+                       SUM(qty) AS units,
+                       SUM(qty * unit_cost_usd) AS cost_usd,
+                       SUM(qty * (unit_price_usd - unit_cost_usd)) AS margin_usd
+                FROM sale_items
+                GROUP BY sale_id
+            ) l ON l.sale_id = s.id
+            GROUP BY day
+            """
+        )
+
+    @retry_on_busy
+    def rebuild_sales_rollup(self) -> int:
+        """Recompute ``sales_daily_rollup`` from ``sales``/``sale_items``; returns the number of days."""
+        conn = self._conn()
+        cur = conn.cursor()
+        try:
+            self._rebuild_sales_rollup(cur)
+            cur.execute("SELECT COUNT(*) FROM sales_daily_rollup")
+            days = int(cur.fetchone()[0])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        # Report caches keyed on "sales" hold totals computed from the old rollup.
+        self._notify_changed("sales", "sales_daily_rollup")
+        return days
+
+    def list_sales_between(
+        self,
+        start_iso: str,
+        end_iso: str,
+        *,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+    ) -> list[SaleHeader]:
+        """Sales in ``[start_iso, end_iso)``, newest first; ``after=(datetime, id)`` continues a page."""
+        return list(self.iter_sales_between(start_iso, end_iso, after=after, limit=limit))
+
+    def iter_sales_between(
+        self,
+        start_iso: str,
+        end_iso: str,
+        *,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+        batch_size: int = _FETCH_BATCH,
+    ) -> Iterator[SaleHeader]:
+        keyset, params = _keyset_clause("(datetime, id) <", after)
+        return self._stream(
+            f"""
+            SELECT id, datetime, total_usd, fx_usd_ars, total_ars, notes
             FROM sales
-            GROUP BY ym
-            ORDER BY ym DESC
+            WHERE datetime >= ? AND datetime < ? {keyset}
+            ORDER BY datetime DESC, id DESC
             LIMIT ?
             """,
-            (int(months),),
+            (start_iso, end_iso, *params, _limit_arg(limit)),
+            _sale_header_row,
+            batch_size,
         )
-        rows = list(reversed(cur.fetchall()))
-        conn.close()
-        return [(str(r[0]), float(r[1])) for r in rows]
 
-    def cumulative_profit_series(self) -> list[tuple[str, float]]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
+    def iter_sale_lines_between(
+        self, start_iso: str, end_iso: str, *, batch_size: int = _FETCH_BATCH
+    ) -> Iterator[tuple[SaleHeader, SaleLine]]:
+        """Every line of every sale in ``[start_iso, end_iso)`` as ``(header, line)``, newest sale first.
+
+        One joined query instead of one ``sale_items_for_sale`` call per sale; the
+        header object is shared by the lines of the same sale.
+        """
+        header: SaleHeader | None = None
+
+        def build(row: tuple) -> tuple[SaleHeader, SaleLine]:
+            nonlocal header
+            if header is None or header.id != row[0]:
+                header = _sale_header_row(row[:6])
+            return header, _sale_line_row(row[6:])
+
+        return self._stream(
             """
-            SELECT substr(s.datetime,1,10) as d,
-                   COALESCE(SUM(si.qty * (si.unit_price_usd - p.cost_usd)),0)
-            FROM sale_items si
-            JOIN sales s ON s.id = si.sale_id
+            SELECT s.id, s.datetime, s.total_usd, s.fx_usd_ars, s.total_ars, s.notes,
+                   p.sku, p.name, si.qty, si.unit_price_usd,
+                   (si.qty * si.unit_price_usd) AS line_total_usd,
+                   si.unit_cost_usd,
+                   (si.qty * (si.unit_price_usd - si.unit_cost_usd)) AS line_margin_usd
+            FROM sales s
+            JOIN sale_items si ON si.sale_id = s.id
             JOIN products p ON p.id = si.product_id
-            GROUP BY d ORDER BY d
-            """
+            WHERE s.datetime >= ? AND s.datetime < ?
+            ORDER BY s.datetime DESC, s.id DESC, p.name
+            """,
+            (start_iso, end_iso),
+            build,
+            batch_size,
         )
-        rows = cur.fetchall()
-        conn.close()
+
+    def monthly_sales_totals(self, months: int = 6) -> list[tuple[str, float]]:
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT substr(day,1,7) AS ym, COALESCE(SUM(revenue_usd),0)
+                FROM sales_daily_rollup
+                GROUP BY ym
+                ORDER BY ym DESC
+                LIMIT ?
+                """,
+                (int(months),),
+            )
+            rows = list(reversed(cur.fetchall()))
+        return [(str(r[0]), float(r[1])) for r in rows]
+
+    def cumulative_profit_series(self) -> list[tuple[str, float]]:
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT day, margin_usd FROM sales_daily_rollup WHERE units > 0 ORDER BY day")
+            rows = cur.fetchall()
         out: list[tuple[str, float]] = []
         acc = 0.0
         for d, val in rows:
@@ -926,48 +1535,79 @@ class SqliteRepository:
         return out
 
     def get_sale_header(self, sale_id: int) -> Optional[SaleHeader]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, datetime, total_usd, fx_usd_ars, total_ars, notes
-            FROM sales
-            WHERE id = ?
-        """,
-            (int(sale_id),),
-        )
-        r = cur.fetchone()
-        conn.close()
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, datetime, total_usd, fx_usd_ars, total_ars, notes
+                FROM sales
+                WHERE id = ?
+            """,
+                (int(sale_id),),
+            )
+            r = cur.fetchone()
         if not r:
             return None
-        return SaleHeader(
-            id=int(r[0]), datetime=str(r[1]), total_usd=float(r[2]), fx_usd_ars=float(r[3]), total_ars=float(r[4]), notes=(r[5] if r[5] is not None else None)
-        )
+        return _sale_header_row(r)
 
     def sale_items_for_sale(self, sale_id: int) -> list[SaleLine]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT p.sku, p.name, si.qty, si.unit_price_usd,
-                   (si.qty * si.unit_price_usd) AS line_total_usd,
-                   p.cost_usd,
-                   (si.qty * (si.unit_price_usd - p.cost_usd)) AS line_margin_usd
-            FROM sale_items si
-            JOIN products p ON p.id = si.product_id
-            WHERE si.sale_id = ?
-            ORDER BY p.name
-        """,
-            (int(sale_id),),
-        )
-        rows = cur.fetchall()
-        conn.close()
-        return [SaleLine(sku=str(r[0]), name=str(r[1]), qty=int(r[2]), unit_price_usd=float(r[3]), line_total_usd=float(r[4]), cost_usd=float(r[5]), line_margin_usd=float(r[6])) for r in rows]
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT p.sku, p.name, si.qty, si.unit_price_usd,
+                       (si.qty * si.unit_price_usd) AS line_total_usd,
+                       si.unit_cost_usd,
+                       (si.qty * (si.unit_price_usd - si.unit_cost_usd)) AS line_margin_usd
+                FROM sale_items si
+                JOIN products p ON p.id = si.product_id
+                WHERE si.sale_id = ?
+                ORDER BY p.name
+            """,
+                (int(sale_id),),
+            )
+            lines = list(map(_sale_line_row, cur))
+        return lines
     
+    def sales_totals_between(self, start_iso: str, end_iso: str) -> tuple[int, float, float, float]:
+        """``(count, revenue USD, revenue ARS, margin USD)`` for sales in ``[start_iso, end_iso)``."""
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            totals = self._sales_totals(cur, start_iso, end_iso)
+        return totals
+
     def sales_summary_between(self, start_iso: str, end_iso: str) -> tuple[tuple[int, float, float, float], list[tuple]]:
-        conn = self._conn()
-        cur = conn.cursor()
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            totals = self._sales_totals(cur, start_iso, end_iso)
 
+            # Aggregate lines per product first; only the top 20 are joined to products.
+            cur.execute(
+                """
+                SELECT p.sku, p.name, t.units_sold, t.revenue_usd, t.margin_usd
+                FROM (
+                    SELECT si.product_id,
+                           SUM(si.qty) AS units_sold,
+                           SUM(si.qty * si.unit_price_usd) AS revenue_usd,
+                           SUM(si.qty * (si.unit_price_usd - si.unit_cost_usd)) AS margin_usd
+                    FROM sales s
+                    JOIN sale_items si ON si.sale_id = s.id
+                    WHERE s.datetime >= ? AND s.datetime < ?
+                    GROUP BY si.product_id
+                    ORDER BY units_sold DESC
+                    LIMIT 20
+                ) t
+                JOIN products p ON p.id = t.product_id
+                ORDER BY t.units_sold DESC
+            """,
+                (start_iso, end_iso),
+            )
+            top = cur.fetchall()
+
+        return totals, top
+
+    @staticmethod
+    def _sales_totals(cur: sqlite3.Cursor, start_iso: str, end_iso: str) -> tuple[int, float, float, float]:
         cur.execute(
             """
             SELECT COUNT(*),
@@ -982,38 +1622,17 @@ class SqliteRepository:
 
         cur.execute(
             """
-            SELECT COALESCE(SUM(si.qty * (si.unit_price_usd - p.cost_usd)), 0)
-            FROM sale_items si
-            JOIN sales s ON s.id = si.sale_id
-            JOIN products p ON p.id = si.product_id
+            SELECT COALESCE(SUM(si.qty * (si.unit_price_usd - si.unit_cost_usd)), 0)
+            FROM sales s
+            JOIN sale_items si ON si.sale_id = s.id
             WHERE s.datetime >= ? AND s.datetime < ?
         """,
             (start_iso, end_iso),
         )
         margin_usd = cur.fetchone()[0]
+        return int(c), float(total_usd), float(total_ars), float(margin_usd)
 
-        cur.execute(
-            """
-            SELECT p.sku, p.name,
-                   SUM(si.qty) AS units_sold,
-                   SUM(si.qty * si.unit_price_usd) AS revenue_usd,
-                   SUM(si.qty * (si.unit_price_usd - p.cost_usd)) AS margin_usd
-            FROM sale_items si
-            JOIN sales s ON s.id = si.sale_id
-            JOIN products p ON p.id = si.product_id
-            WHERE s.datetime >= ? AND s.datetime < ?
-            GROUP BY p.id
-            ORDER BY units_sold DESC
-            LIMIT 20
-        """,
-            (start_iso, end_iso),
-        )
-        top = cur.fetchall()
-
-        conn.close()
-        return (int(c), float(total_usd), float(total_ars), float(margin_usd)), top
-    
-
+    @retry_on_busy
     def create_purchase_with_items(
         self,
         datetime_iso: str,
@@ -1023,6 +1642,7 @@ class SqliteRepository:
         items: Iterable[dict],
         actor_user_id: Optional[int] = None,
     ) -> int:
+        items = list(items)
         conn = self._conn()
         cur = conn.cursor()
         try:
@@ -1084,81 +1704,85 @@ class SqliteRepository:
                 )
 
             conn.commit()
-            return purchase_id
         except Exception:
             conn.rollback()
             raise
         finally:
             conn.close()
+        self._notify_changed(
+            "products", "purchases", "purchase_items", "stock_ledger", product_ids=(int(it["product_id"]) for it in items)
+        )
+        return purchase_id
 
 
     # ---------- Purchases ----------
     def create_purchase_header(self, datetime_iso: str, vendor: Optional[str], total_usd: float, notes: Optional[str]) -> int:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO purchases (datetime, vendor, total_usd, notes)
-            VALUES (?, ?, ?, ?)
-        """,
-            (datetime_iso, vendor, float(total_usd), notes),
-        )
-        pid = int(cur.lastrowid)
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO purchases (datetime, vendor, total_usd, notes)
+                VALUES (?, ?, ?, ?)
+            """,
+                (datetime_iso, vendor, float(total_usd), notes),
+            )
+            pid = int(cur.lastrowid)
+            conn.commit()
         return pid
 
     def add_purchase_item(self, purchase_id: int, product_id: int, qty: int, unit_cost_usd: float) -> None:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO purchase_items (purchase_id, product_id, qty, unit_cost_usd)
-            VALUES (?, ?, ?, ?)
-        """,
-            (int(purchase_id), int(product_id), int(qty), float(unit_cost_usd)),
-        )
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO purchase_items (purchase_id, product_id, qty, unit_cost_usd)
+                VALUES (?, ?, ?, ?)
+            """,
+                (int(purchase_id), int(product_id), int(qty), float(unit_cost_usd)),
+            )
+            conn.commit()
 
-    def list_purchases_between(self, start_iso: str, end_iso: str) -> list[PurchaseHeader]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, datetime, vendor, total_usd, notes
-            FROM purchases
-            WHERE datetime >= ? AND datetime < ?
-            ORDER BY datetime DESC
-        """,
-            (start_iso, end_iso),
-        )
-        rows = cur.fetchall()
-        conn.close()
-        return [
-            PurchaseHeader(
-                id=int(r[0]), datetime=str(r[1]), vendor=(r[2] if r[2] is not None else None), total_usd=float(r[3]), notes=(r[4] if r[4] is not None else None)
+    def list_purchases_between(
+        self,
+        start_iso: str,
+        end_iso: str,
+        *,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+    ) -> list[PurchaseHeader]:
+        """Purchases in ``[start_iso, end_iso)``, newest first; ``after=(datetime, id)`` continues a page."""
+        keyset, params = _keyset_clause("(datetime, id) <", after)
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                SELECT id, datetime, vendor, total_usd, notes
+                FROM purchases
+                WHERE datetime >= ? AND datetime < ? {keyset}
+                ORDER BY datetime DESC, id DESC
+                LIMIT ?
+            """,
+                (start_iso, end_iso, *params, _limit_arg(limit)),
             )
-            for r in rows
-        ]
+            headers = list(map(_purchase_header_row, cur))
+        return headers
 
     def purchase_items_for_purchase(self, purchase_id: int) -> list[PurchaseLine]:
-        conn = self._conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT p.sku, p.name, pi.qty, pi.unit_cost_usd,
-                   (pi.qty * pi.unit_cost_usd) AS line_total_usd
-            FROM purchase_items pi
-            JOIN products p ON p.id = pi.product_id
-            WHERE pi.purchase_id = ?
-            ORDER BY p.name
-        """,
-            (int(purchase_id),),
-        )
-        rows = cur.fetchall()
-        conn.close()
-        return [PurchaseLine(sku=str(r[0]), name=str(r[1]), qty=int(r[2]), unit_cost_usd=float(r[3]), line_total_usd=float(r[4])) for r in rows]
+        with self._read_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT p.sku, p.name, pi.qty, pi.unit_cost_usd,
+                       (pi.qty * pi.unit_cost_usd) AS line_total_usd
+                FROM purchase_items pi
+                JOIN products p ON p.id = pi.product_id
+                WHERE pi.purchase_id = ?
+                ORDER BY p.name
+            """,
+                (int(purchase_id),),
+            )
+            lines = list(map(_purchase_line_row, cur))
+        return lines
 
     @staticmethod
     def _hash_pin(pin: str, *, rounds: int = 200_000, salt: str | None = None) -> str:
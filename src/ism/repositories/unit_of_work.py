@@ -1,44 +1,64 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable, Optional, Protocol
+from typing import Any, Protocol
+
+from ism.domain.models import Product
+
+
+def now_iso() -> str:
+    return datetime.now().replace(microsecond=0).isoformat(sep=" ")
 
 
 class UnitOfWork(Protocol):
-    def __enter__(self) -> "UnitOfWork": ...
+    def __enter__(self) -> UnitOfWork: ...
     def __exit__(self, exc_type, exc, tb) -> None: ...
-    def create_sale(self, fx_usd_ars: float, notes: Optional[str], items: Iterable[dict], actor_user_id: int | None = None) -> int: ...
-    def create_purchase(self, vendor: Optional[str], notes: Optional[str], items: Iterable[dict], actor_user_id: int | None = None) -> int: ...
+    def get_product_by_id(self, product_id: int) -> Product | None: ...
+    def get_products_by_ids(self, product_ids: Iterable[int]) -> dict[int, Product]: ...
+    def create_sale(self, fx_usd_ars: float, notes: str | None, items: Iterable[dict], actor_user_id: int | None = None) -> int: ...
+    def create_purchase(self, vendor: str | None, notes: str | None, items: Iterable[dict], actor_user_id: int | None = None) -> int: ...
 
 
 @dataclass
 class RepositoryUnitOfWork:
     """Unit of Work adapter for transactional write use-cases.
 
-    The current repository methods already encapsulate SQL transactions.
+    Entering opens ``repo.transaction()``: one connection and one BEGIN IMMEDIATE
+    transaction shared by every read and write made through this object (or the
+    repository, on the same thread) until exit, which commits or rolls back.
     This class centralizes write orchestration so services stay persistence-agnostic.
     """
 
-    repo: object
+    repo: Any
+    _tx: Any = field(default=None, init=False, repr=False)
 
-    def __enter__(self) -> "RepositoryUnitOfWork":
+    def __enter__(self) -> RepositoryUnitOfWork:
+        tx = self.repo.transaction()
+        tx.__enter__()
+        self._tx = tx
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
-        return None
+        tx, self._tx = self._tx, None
+        tx.__exit__(exc_type, exc, tb)
+
+    def get_product_by_id(self, product_id: int) -> Product | None:
+        return self.repo.get_product_by_id(int(product_id))
+
+    def get_products_by_ids(self, product_ids: Iterable[int]) -> dict[int, Product]:
+        return self.repo.get_products_by_ids(product_ids)
 
-    def create_sale(self, fx_usd_ars: float, notes: Optional[str], items: Iterable[dict], actor_user_id: int | None = None) -> int:
-        dt_iso = datetime.now().replace(microsecond=0).isoformat(sep=" ")
-        return int(self.repo.create_sale(dt_iso, fx_usd_ars, notes, items, actor_user_id=actor_user_id))
+    def create_sale(self, fx_usd_ars: float, notes: str | None, items: Iterable[dict], actor_user_id: int | None = None) -> int:
+        return int(self.repo.create_sale(now_iso(), fx_usd_ars, notes, items, actor_user_id=actor_user_id))
 
-    def create_purchase(self, vendor: Optional[str], notes: Optional[str], items: Iterable[dict], actor_user_id: int | None = None) -> int:
+    def create_purchase(self, vendor: str | None, notes: str | None, items: Iterable[dict], actor_user_id: int | None = None) -> int:
         items = list(items)
         total_usd = sum(float(it["unit_cost_usd"]) * int(it["qty"]) for it in items)
-        dt_iso = datetime.now().replace(microsecond=0).isoformat(sep=" ")
         return int(
             self.repo.create_purchase_with_items(
-                datetime_iso=dt_iso,
+                datetime_iso=now_iso(),
                 vendor=vendor,
                 total_usd=total_usd,
                 notes=notes,
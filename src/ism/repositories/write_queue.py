@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any
+
+from ism.domain.errors import DatabaseBusyError
+from ism.domain.models import Product
+from ism.repositories.unit_of_work import now_iso
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class _Command:
+    fn: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    future: Future = field(default_factory=Future)
+
+
+class WriteQueue:
+    """Single writer thread in front of ``SqliteRepository`` write methods.
+
+    Callers enqueue commands and get a ``Future``. The writer drains whatever is
+    waiting (up to ``max_batch``) and runs it in one ``repo.transaction()``, each
+    command under its own savepoint, so a failing command does not undo its
+    neighbours. Futures resolve only after the batch commits.
+
+    If the writer thread ever stops, every command still queued fails and
+    ``submit`` refuses new ones until ``start()`` is called again.
+
+    Only writers in this process go through the queue. Another process writing
+    the same file still competes for SQLite's write lock and is handled by
+    ``busy_timeout`` and ``retry_on_busy`` as before.
+    """
+
+    def __init__(self, repo, max_batch: int = 64, linger_ms: float = 0.0, result_timeout: float | None = 30.0):
+        self.repo = repo
+        self.max_batch = max(1, int(max_batch))
+        self.linger_s = max(0.0, float(linger_ms)) / 1000.0
+        self.result_timeout = result_timeout
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.batches_committed = 0
+        self.commands_committed = 0
+
+    def start(self) -> WriteQueue:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name="ism-writer", daemon=True)
+                self._thread.start()
+        return self
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Stop accepting commands, finish the ones already queued and join the writer."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._closed = True
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def __enter__(self) -> WriteQueue:
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        with self._lock:
+            if self._closed or self._thread is None or not self._thread.is_alive():
+                raise RuntimeError("Write queue is not running.")
+            cmd = _Command(fn, args, kwargs)
+            self._queue.put(cmd)
+        return cmd.future
+
+    def wait(self, future: Future) -> Any:
+        """``future.result()`` bounded by ``result_timeout``.
+
+        A command the writer has not started yet is cancelled on timeout, so
+        nothing is written; one already running may still commit afterwards.
+        """
+        try:
+            return future.result(timeout=self.result_timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise DatabaseBusyError("The write queue is backed up; nothing was saved.") from None
+            raise DatabaseBusyError("The write is taking too long; check whether it was saved before retrying.") from None
+
+    # ---------- Write commands ----------
+    def create_sale(self, *args, **kwargs) -> Future:
+        return self.submit(self.repo.create_sale, *args, **kwargs)
+
+    def create_purchase_with_items(self, *args, **kwargs) -> Future:
+        return self.submit(self.repo.create_purchase_with_items, *args, **kwargs)
+
+    def adjust_product_stock(self, *args, **kwargs) -> Future:
+        return self.submit(self.repo.adjust_product_stock, *args, **kwargs)
+
+    def append_ledger(self, *args, **kwargs) -> Future:
+        return self.submit(self.repo.append_ledger, *args, **kwargs)
+
+    # ---------- Writer thread ----------
+    def _next_batch(self) -> tuple[list[_Command], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.linger_s
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        try:
+            stop = False
+            while not stop:
+                batch, stop = self._next_batch()
+                if batch:
+                    self._execute(batch)
+        finally:
+            # Whatever stopped the writer, nobody may wait forever on a queued command.
+            with self._lock:
+                self._closed = True
+                pending = []
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        pending.append(item)
+            for cmd in pending:
+                self._fail(cmd, RuntimeError("Write queue stopped before running this command."))
+
+    @staticmethod
+    def _fail(cmd: _Command, exc: BaseException) -> None:
+        if not cmd.future.done():
+            cmd.future.set_exception(exc)
+
+    def _execute(self, batch: list[_Command]) -> None:
+        # Commands cancelled by a timed-out waiter are dropped; the rest can no longer be cancelled.
+        batch = [cmd for cmd in batch if cmd.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        results: list[tuple[_Command, Any, BaseException | None]] = []
+        try:
+            with self.repo.transaction() as conn:
+                for i, cmd in enumerate(batch):
+                    savepoint = f"ism_wq_{i}"
+                    conn.execute(f"SAVEPOINT {savepoint}")
+                    try:
+                        value = cmd.fn(*cmd.args, **cmd.kwargs)
+                    except Exception as exc:  # noqa: BLE001
+                        conn.execute(f"ROLLBACK TO {savepoint}")
+                        conn.execute(f"RELEASE {savepoint}")
+                        results.append((cmd, None, exc))
+                    else:
+                        conn.execute(f"RELEASE {savepoint}")
+                        results.append((cmd, value, None))
+        except BaseException as exc:
+            # Includes a failed COMMIT: nothing in the batch was written.
+            log.exception("write_batch_failed size=%s", len(batch))
+            for cmd in batch:
+                self._fail(cmd, exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+
+        self.batches_committed += 1
+        self.commands_committed += len(batch)
+        for cmd, value, error in results:
+            if error is not None:
+                cmd.future.set_exception(error)
+            else:
+                cmd.future.set_result(value)
+
+
+@dataclass
+class QueuedUnitOfWork:
+    """Unit of Work that reads from the repository and sends writes through a ``WriteQueue``.
+
+    Reads run outside the write transaction; oversell and missing-product checks
+    are enforced again by the repository write itself.
+    """
+
+    repo: Any
+    writer: WriteQueue
+
+    def __enter__(self) -> QueuedUnitOfWork:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def get_product_by_id(self, product_id: int) -> Product | None:
+        return self.repo.get_product_by_id(int(product_id))
+
+    def get_products_by_ids(self, product_ids: Iterable[int]) -> dict[int, Product]:
+        return self.repo.get_products_by_ids(product_ids)
+
+    def create_sale(self, fx_usd_ars: float, notes: str | None, items: Iterable[dict], actor_user_id: int | None = None) -> int:
+        future = self.writer.create_sale(now_iso(), fx_usd_ars, notes, list(items), actor_user_id=actor_user_id)
+        return int(self.writer.wait(future))
+
+    def create_purchase(self, vendor: str | None, notes: str | None, items: Iterable[dict], actor_user_id: int | None = None) -> int:
+        items = list(items)
+        total_usd = sum(float(it["unit_cost_usd"]) * int(it["qty"]) for it in items)
+        future = self.writer.create_purchase_with_items(
+            datetime_iso=now_iso(),
+            vendor=vendor,
+            total_usd=total_usd,
+            notes=notes,
+            items=items,
+            actor_user_id=actor_user_id,
+        )
+        return int(self.writer.wait(future))
@@ -1,21 +1,37 @@
-from .fx_service import FxService
-from .inventory_service import InventoryService
-from .sales_service import SalesService
-from .purchase_service import PurchaseService
-from .excel_service import ExcelService
-from .reporting_service import ReportingService
-from .backup_service import BackupService
-from .operations_service import OperationsService
-from .update_service import UpdateService
+from __future__ import annotations
 
-__all__ = [
-    "FxService",
-    "InventoryService",
-    "SalesService",
-    "PurchaseService",
-    "ExcelService",
-    "ReportingService",
-    "BackupService",
-    "OperationsService",
-    "UpdateService",
-]
+from importlib import import_module
+
+# Service classes are resolved on first attribute access, so importing one
+# service does not import every other service module (and their dependencies).
+_EXPORTS = {
+    "FxService": ".fx_service",
+    "InventoryService": ".inventory_service",
+    "ProductCatalog": ".product_catalog",
+    "SalesService": ".sales_service",
+    "PurchaseService": ".purchase_service",
+    "ExcelService": ".excel_service",
+    "ReportingService": ".reporting_service",
+    "BackupService": ".backup_service",
+    "ChangeMonitor": ".change_monitor",
+    "OperationsService": ".operations_service",
+    "UpdateService": ".update_service",
+    "AsyncServiceFacade": ".async_facade",
+    "StartupPrefetch": ".startup_prefetch",
+    "WorkloadRecorder": ".workload_recorder",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
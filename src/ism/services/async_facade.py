@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, TypeVar
+
+from ism.domain.models import Product
+
+T = TypeVar("T")
+
+
+class AsyncServiceFacade:
+    """``async def`` entry points over the synchronous services, for headless integrations.
+
+    Calls run on two bounded executors: reads share ``max_readers`` threads and
+    writes go through ``max_writers`` (one by default, so writes from this
+    process are serialized). Any number of concurrent awaits queue on those
+    threads instead of spawning one thread per call.
+    """
+
+    def __init__(
+        self,
+        inventory_service,
+        sales_service,
+        purchase_service,
+        fx_service,
+        max_readers: int = 4,
+        max_writers: int = 1,
+    ):
+        self.inventory = inventory_service
+        self.sales = sales_service
+        self.purchases = purchase_service
+        self.fx = fx_service
+        self._readers = ThreadPoolExecutor(max_workers=max(1, int(max_readers)), thread_name_prefix="ism-async-read")
+        self._writers = ThreadPoolExecutor(max_workers=max(1, int(max_writers)), thread_name_prefix="ism-async-write")
+
+    @classmethod
+    def from_container(cls, container, **kwargs) -> AsyncServiceFacade:
+        return cls(container.inventory, container.sales, container.purchases, container.fx, **kwargs)
+
+    async def _run(self, executor: ThreadPoolExecutor, fn: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    # ---------- Reads ----------
+    async def list_products(self) -> list[Product]:
+        return await self._run(self._readers, self.inventory.list_products)
+
+    async def sales_summary_between(self, start_iso: str, end_iso: str):
+        return await self._run(self._readers, self.sales.sales_summary_between, start_iso, end_iso)
+
+    async def get_rate_for_date(self, d: date) -> float:
+        cached = await self._run(self._readers, self.fx.get_cached_rate_for_date, d)
+        if cached is not None:
+            return cached
+        # A miss fetches the rate and stores it, so it queues with the writes.
+        return await self._run(self._writers, self.fx.get_rate_for_date, d)
+
+    # ---------- Writes ----------
+    async def create_sale(self, notes: str | None, items: Iterable[dict], actor_user_id: int | None = None) -> int:
+        return await self._run(self._writers, self.sales.create_sale, notes, list(items), actor_user_id=actor_user_id)
+
+    async def create_purchase(
+        self,
+        vendor: str | None,
+        notes: str | None,
+        items: Iterable[dict],
+        actor_user_id: int | None = None,
+    ) -> int:
+        return await self._run(
+            self._writers,
+            self.purchases.create_purchase,
+            vendor,
+            notes,
+            list(items),
+            actor_user_id=actor_user_id,
+        )
+
+    # ---------- Lifecycle ----------
+    def close(self, wait: bool = True) -> None:
+        self._readers.shutdown(wait=wait)
+        self._writers.shutdown(wait=wait)
+
+    async def __aenter__(self) -> AsyncServiceFacade:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> Any:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+        return None
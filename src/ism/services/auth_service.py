@@ -35,6 +35,7 @@ PERMISSIONS: dict[str, set[str]] = {
     "create_backup": {"admin"},
     "export_diagnostics": {"admin"},
     "restore_backup": {"admin"},
+    "rebuild_sales_rollup": {"admin"},
 }
 
 class AuthService:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import hmac
 import secrets
+import sqlite3
 import subprocess
 from datetime import datetime
 from pathlib import Path
@@ -21,7 +22,7 @@ class BackupService:
 
         key = self._get_or_create_key(key_path)
 
-        payload = self.db_path.read_bytes()
+        payload = self._snapshot_database()
         encrypted = self._encrypt_payload(payload, key)
         target.write_bytes(encrypted)
         self._enforce_retention(max_backups=30)
@@ -42,8 +43,26 @@ class BackupService:
         tmp_restore = self.db_path.with_suffix(f"{self.db_path.suffix}.restore_tmp")
         tmp_restore.write_bytes(payload)
         tmp_restore.replace(self.db_path)
+        # A WAL left over from the replaced database must never be replayed onto the restored one.
+        for suffix in ("-wal", "-shm"):
+            self.db_path.with_name(self.db_path.name + suffix).unlink(missing_ok=True)
         return self.db_path
 
+    def _snapshot_database(self) -> bytes:
+        """Consistent copy of the live database, including pages still in the WAL."""
+        snapshot = self.backup_dir / f".snapshot_{secrets.token_hex(8)}.db"
+        src = sqlite3.connect(self.db_path)
+        dst = sqlite3.connect(snapshot)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        try:
+            return snapshot.read_bytes()
+        finally:
+            snapshot.unlink(missing_ok=True)
+
     def _get_or_create_key(self, key_path: Path) -> bytes:
         if key_path.exists():
             return key_path.read_bytes().strip()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class ChangeMonitor:
+    """Reports which tracked tables were written since the previous ``poll()``.
+
+    A poll first reads ``PRAGMA data_version`` on one long-lived connection. When
+    it is unchanged nothing was committed anywhere and no table is read. Otherwise
+    it reads ``change_counters``, which triggers bump on every row write, and
+    returns the tables whose counter moved. This covers writes from other
+    processes sharing the file as well as from this one.
+
+    When the repository reopens its connections (``close()``, a backup restore)
+    both readings are dropped and the next poll takes a new baseline.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._generation: int | None = None
+        self._data_version: int | None = None
+        self._counters: dict[str, int] | None = None
+        self.counter_reads = 0
+        self.poll()
+
+    def poll(self) -> frozenset[str]:
+        with self._lock:
+            generation = self.repo.connection_generation()
+            if generation != self._generation:
+                self._generation = generation
+                self._data_version = None
+                self._counters = None
+            version = self.repo.data_version()
+            if version == self._data_version:
+                return frozenset()
+            self._data_version = version
+            counters = self.repo.change_counters()
+            self.counter_reads += 1
+            previous, self._counters = self._counters, counters
+        if previous is None:
+            return frozenset()
+        changed = frozenset(t for t, v in counters.items() if previous.get(t) != v)
+        if changed:
+            log.debug("tables_changed tables=%s", ",".join(sorted(changed)))
+        return changed
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from openpyxl import load_workbook
-
 from ism.domain.errors import ValidationError
 import logging
 
@@ -20,6 +18,8 @@ class ExcelService:
         Headers:
           sku | name | cost_usd | price_usd | stock | min_stock
         """
+        from openpyxl import load_workbook
+
         wb = load_workbook(path)
         ws = wb.active
 
@@ -37,6 +37,15 @@ class ExcelService:
         ok = 0
         skipped = 0
 
+        # One batched lookup for every SKU already in the catalog instead of one query per row.
+        sheet_skus = [
+            str(v).strip()
+            for v in (ws.cell(row=row, column=headers["sku"]).value for row in range(2, ws.max_row + 1))
+            if v
+        ]
+        # Only ids are kept: stock may change (sales, other terminals) while the sheet is imported.
+        product_ids = {sku: p.id for sku, p in self.repo.get_products_by_skus(sheet_skus).items()}
+
         for row in range(2, ws.max_row + 1):
             try:
                 sku = ws.cell(row=row, column=headers["sku"]).value
@@ -64,34 +73,32 @@ class ExcelService:
                     skipped += 1
                     continue
 
-                existing = self.repo.get_product_by_sku(sku)
-                if existing:
+                product_id = product_ids.get(sku)
+                if product_id is not None:
                     # Update product fields, keep stock unchanged (stock changes only via purchases)
-                    self.repo.upsert_product(sku, name, cost, price, existing.stock, min_stock)
+                    if not self.repo.update_product_details(product_id, name, cost, price, min_stock):
+                        raise ValidationError(f"Product {sku} was deactivated during the import.")
 
                     if restock_qty > 0:
                         self.purchases.create_purchase(
                             vendor="EXCEL_IMPORT",
                             notes=f"Excel restock (+{restock_qty}) for {sku}",
                             items=[{
-                                "product_id": existing.id,
+                                "product_id": product_id,
                                 "qty": restock_qty,
                                 "unit_cost_usd": cost,
                             }]
                         )
                 else:
                     # Create product with stock=0, then apply restock as purchase
-                    self.repo.upsert_product(sku, name, cost, price, 0, min_stock)
-                    created = self.repo.get_product_by_sku(sku)
-                    if not created:
-                        skipped += 1
-                        continue
+                    created_id = self.repo.upsert_product(sku, name, cost, price, 0, min_stock)
+                    product_ids[sku] = created_id
                     if restock_qty > 0:
                         self.purchases.create_purchase(
                             vendor="EXCEL_IMPORT",
                             notes=f"Initial restock from Excel for {sku}",
                             items=[{
-                                "product_id": created.id,
+                                "product_id": created_id,
                                 "qty": restock_qty,
                                 "unit_cost_usd": cost,
                             }]
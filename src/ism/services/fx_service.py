@@ -3,8 +3,6 @@ from __future__ import annotations
 import logging
 from datetime import date
 
-import requests
-
 from ism.domain.errors import FxUnavailableError
 
 log = logging.getLogger("ism.fx")
@@ -15,6 +13,8 @@ class FxService:
         self.repo = repo
 
     def _fetch_json(self, url: str) -> dict:
+        import requests
+
         r = requests.get(url, timeout=10)
         r.raise_for_status()
         return r.json()
@@ -38,11 +38,19 @@ class FxService:
             raise FxUnavailableError(f"FX rate must be > 0. Received: {rate}")
         return rate
 
+    def get_cached_rate_for_date(self, d: date) -> float | None:
+        """The stored rate for ``d``, without fetching; ``None`` when there is none yet."""
+        cached = self.repo.get_fx_rate(d.isoformat())
+        return None if cached is None else float(cached)
+
     def get_rate_for_date(self, d: date) -> float:
         d_iso = d.isoformat()
-        cached = self.repo.get_fx_rate(d_iso)
+        cached = self.get_cached_rate_for_date(d)
         if cached is not None:
-            return float(cached)
+            return cached
+
+        # Deferred: requests costs ~70 ms to import and is only needed on a cache miss.
+        import requests
 
         primary = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json"
         fallback = "https://latest.currency-api.pages.dev/v1/currencies/usd.json"
@@ -2,20 +2,36 @@ from __future__ import annotations
 
 from ism.domain.errors import ValidationError, NotFoundError
 from ism.domain.models import Product
+from ism.services.product_catalog import ProductCatalog
 
 
 class InventoryService:
-    def __init__(self, repo):
+    def __init__(self, repo, write_queue=None, catalog: ProductCatalog | None = None):
         self.repo = repo
+        self.write_queue = write_queue
+        self.catalog = catalog or ProductCatalog(repo)
 
-    def list_products(self) -> list[Product]:
-        return self.repo.list_products()
+    def _adjust_stock(self, product_id: int, qty_delta: int, actor_user_id: int | None, notes: str | None) -> bool:
+        if self.write_queue is not None:
+            future = self.write_queue.adjust_product_stock(product_id, qty_delta, actor_user_id=actor_user_id, notes=notes)
+            return bool(self.write_queue.wait(future))
+        return self.repo.adjust_product_stock(product_id, qty_delta, actor_user_id=actor_user_id, notes=notes)
+
+    def list_products(self, *, after: tuple[str, int] | None = None, limit: int | None = None) -> list[Product]:
+        return self.catalog.list_products(after=after, limit=limit)
+
+    def catalog_version(self) -> int:
+        """Changes whenever the cached catalog is invalidated; views compare it to skip redraws."""
+        return self.catalog.version
+
+    def reload_catalog(self) -> None:
+        self.catalog.invalidate()
 
     def top_critical_stock(self, limit: int = 10) -> list[tuple[str, int, int]]:
         return self.repo.list_top_critical_stock(limit)
     
     def get_product_by_sku(self, sku: str) -> Product:
-        p = self.repo.get_product_by_sku(sku)
+        p = self.catalog.get_by_sku(sku)
         if not p:
             raise NotFoundError("Product not found.")
         return p
@@ -49,7 +65,7 @@ class InventoryService:
             raise NotFoundError("Product not found.")
         if qty > int(product.stock):
             raise ValidationError(f"Not enough stock. Available: {product.stock}")
-        updated = self.repo.adjust_product_stock(int(product_id), -int(qty), actor_user_id=actor_user_id, notes=notes)
+        updated = self._adjust_stock(int(product_id), -int(qty), actor_user_id, notes)
         if not updated:
             raise NotFoundError("Product not found.")
 
@@ -59,7 +75,7 @@ class InventoryService:
             raise NotFoundError("Product not found.")
         if int(product.stock) == 0:
             return
-        updated = self.repo.adjust_product_stock(int(product_id), -int(product.stock), actor_user_id=actor_user_id, notes=notes)
+        updated = self._adjust_stock(int(product_id), -int(product.stock), actor_user_id, notes)
         if not updated:
             raise NotFoundError("Product not found.")
 
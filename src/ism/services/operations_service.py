@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import logging
 import zipfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
@@ -17,6 +17,9 @@ class HealthReport:
     db_size_bytes: int
     logs_count: int
     generated_at: str
+    sqlite_profile: str = ""
+    sqlite_settings: dict = field(default_factory=dict)
+    write_contention: dict = field(default_factory=dict)
 
 
 class OperationsService:
@@ -30,11 +33,15 @@ class OperationsService:
         integrity = self.repo.integrity_check()
         logs_count = len(list(self.logs_dir.glob("*.log"))) if self.logs_dir.exists() else 0
         size = self.db_path.stat().st_size if self.db_path.exists() else 0
+        settings = self.repo.sqlite_settings()
         return HealthReport(
             sqlite_integrity=integrity,
             db_size_bytes=size,
             logs_count=logs_count,
             generated_at=datetime.now().isoformat(timespec="seconds"),
+            sqlite_profile=str(settings.get("profile", "")),
+            sqlite_settings=settings,
+            write_contention=self.repo.retry_stats.snapshot(),
         )
 
     def export_diagnostics(self, target_dir: Path | str | None = None) -> Path:
@@ -48,6 +55,9 @@ class OperationsService:
         with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
             if self.db_path.exists():
                 zf.write(self.db_path, arcname=self.db_path.name)
+                wal = self.db_path.with_name(self.db_path.name + "-wal")
+                if wal.exists():
+                    zf.write(wal, arcname=wal.name)
 
             if self.logs_dir.exists():
                 for f in sorted(self.logs_dir.glob("*.log")):
@@ -60,9 +70,18 @@ class OperationsService:
 
             zf.writestr("health_report.json", json.dumps(report.__dict__, ensure_ascii=False, indent=2))
 
+            query_stats = getattr(self.repo, "query_stats", None)
+            if query_stats is not None:
+                zf.writestr("query_stats.json", json.dumps(query_stats.snapshot(), ensure_ascii=False, indent=2))
+
         log.info("diagnostics_exported path=%s", zip_path)
         return zip_path
 
+    def rebuild_sales_rollup(self) -> int:
+        days = self.repo.rebuild_sales_rollup()
+        log.info("sales_rollup_rebuilt days=%s", days)
+        return days
+
     def restore_latest_backup(self, backup_service) -> Path:
         if not self.backup_dir.exists():
             raise FileNotFoundError("No backup directory found")
@@ -70,6 +89,10 @@ class OperationsService:
         if not files:
             raise FileNotFoundError("No backups available to restore")
         latest = files[-1]
+        # Pooled connections still point at the old file; release them before it is replaced.
+        self.repo.close()
         restored = backup_service.restore_backup(latest)
+        # Anything reopened meanwhile still reads the replaced file; this also resets change detection.
+        self.repo.close()
         log.warning("backup_restored latest=%s", latest.name)
         return restored
\ No newline at end of file
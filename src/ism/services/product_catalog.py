@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from ism.domain.models import Product
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogSnapshot:
+    version: int
+    products: list[Product]
+    keys: list[tuple[str, int]]
+    by_id: dict[int, Product]
+    by_sku: dict[str, Product]
+
+
+class ProductCatalog:
+    """In-memory copy of the active product catalog, indexed by id and SKU.
+
+    The first read loads every active product with one query; later reads are
+    served from memory. When the repository reports a committed write to
+    ``products`` (``add_change_listener``), only the rows it touched are
+    re-fetched and patched in; a write that does not say which rows it touched,
+    or ``invalidate()``, drops the copy. Every change bumps ``version``, so views
+    can skip rebuilding widgets when the catalog they last rendered is still
+    current.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: CatalogSnapshot | None = None
+        add_listener = getattr(repo, "add_change_listener", None)
+        if add_listener is not None:
+            add_listener(self._on_change)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def _on_change(self, tables: frozenset[str], product_ids: frozenset[int] | None = None) -> None:
+        if "products" not in tables:
+            return
+        if product_ids is None:
+            self.invalidate()
+            return
+        with self._lock:
+            snap = self._snapshot
+            self._version += 1
+            version = self._version
+        if snap is None:
+            return
+
+        fresh = self.repo.get_products_by_ids(product_ids)
+        patched = _patch(snap, version, product_ids, fresh)
+        with self._lock:
+            # Another change landed while fetching: its rows may be missing here.
+            if self._version == version and self._snapshot is snap:
+                self._snapshot = patched
+            else:
+                self._snapshot = None
+
+    def snapshot(self) -> CatalogSnapshot:
+        with self._lock:
+            snap = self._snapshot
+            version = self._version
+        if snap is not None:
+            return snap
+
+        products = self.repo.list_products()
+        snap = CatalogSnapshot(
+            version=version,
+            products=products,
+            keys=[(p.name, p.id) for p in products],
+            by_id={p.id: p for p in products},
+            by_sku={p.sku: p for p in products},
+        )
+        with self._lock:
+            # A write committed while loading: serve this read, but do not keep it.
+            if self._version == version:
+                self._snapshot = snap
+        return snap
+
+    def list_products(self, *, after: tuple[str, int] | None = None, limit: int | None = None) -> list[Product]:
+        """Same ordering and keyset semantics as ``SqliteRepository.list_products``."""
+        snap = self.snapshot()
+        start = 0 if after is None else bisect_right(snap.keys, (after[0], int(after[1])))
+        end = len(snap.products) if limit is None else start + max(0, int(limit))
+        return snap.products[start:end]
+
+    def get_by_id(self, product_id: int) -> Product | None:
+        return self.snapshot().by_id.get(int(product_id))
+
+    def get_by_sku(self, sku: str) -> Product | None:
+        return self.snapshot().by_sku.get(sku)
+
+
+def _patch(snap: CatalogSnapshot, version: int, product_ids: frozenset[int], fresh: dict[int, Product]) -> CatalogSnapshot:
+    """``snap`` with the rows in ``product_ids`` replaced by ``fresh``; ids missing from it are gone or inactive."""
+    by_id = dict(snap.by_id)
+    for pid in product_ids:
+        product = fresh.get(pid)
+        if product is None:
+            by_id.pop(pid, None)
+        else:
+            by_id[pid] = product
+    # Stock and price changes keep the (name, id) order; only inserts, removals and renames re-sort.
+    if all(pid in snap.by_id and pid in fresh and fresh[pid].name == snap.by_id[pid].name for pid in product_ids):
+        products = [by_id[p.id] for p in snap.products]
+        keys = snap.keys
+    else:
+        products = sorted(by_id.values(), key=lambda p: (p.name, p.id))
+        keys = [(p.name, p.id) for p in products]
+    return CatalogSnapshot(
+        version=version,
+        products=products,
+        keys=keys,
+        by_id=by_id,
+        by_sku={p.sku: p for p in products},
+    )
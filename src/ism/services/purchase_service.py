@@ -65,14 +65,12 @@ class PurchaseService:
             raise ValidationError("Restock cart is empty.")
         items = self._normalize_items(items)
 
-        # Validate items
-        for it in items:
-            prod = self.repo.get_product_by_id(int(it["product_id"]))
-            if not prod:
-                raise NotFoundError("Product not found/active.")
-
         try:
             with self.uow_factory() as uow:
+                products = uow.get_products_by_ids(int(it["product_id"]) for it in items)
+                if any(int(it["product_id"]) not in products for it in items):
+                    raise NotFoundError("Product not found/active.")
+
                 purchase_id = uow.create_purchase(
                     vendor=vendor,
                     notes=notes,
@@ -90,8 +88,15 @@ class PurchaseService:
         log.info("purchase_created purchase_id=%s items=%s actor=%s", purchase_id, len(items), actor_user_id)
         return int(purchase_id)
 
-    def list_purchases_between(self, start_iso: str, end_iso: str) -> list[PurchaseHeader]:
-        return self.repo.list_purchases_between(start_iso, end_iso)
+    def list_purchases_between(
+        self,
+        start_iso: str,
+        end_iso: str,
+        *,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+    ) -> list[PurchaseHeader]:
+        return self.repo.list_purchases_between(start_iso, end_iso, after=after, limit=limit)
 
     def purchase_items_for_purchase(self, purchase_id: int) -> list[PurchaseLine]:
         return self.repo.purchase_items_for_purchase(purchase_id)
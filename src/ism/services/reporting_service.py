@@ -1,10 +1,5 @@
 from __future__ import annotations
 
-from openpyxl import Workbook
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
-
 
 class ReportingService:
     def __init__(self, repo):
@@ -17,6 +12,12 @@ class ReportingService:
         return self.repo.cumulative_profit_series()
     
     def export_sales_report_excel(self, path: str, start_iso: str, end_iso: str) -> None:
+        # openpyxl is only imported when a report is exported; it dominates startup otherwise.
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+        from openpyxl.worksheet.table import Table, TableStyleInfo
+
         wb = Workbook()
 
         def money(cell):
@@ -43,10 +44,8 @@ class ReportingService:
             )
             ws.add_table(tab)
 
-        totals, _ = self.repo.sales_summary_between(start_iso, end_iso)
-        sales_count, revenue_usd, revenue_ars, profit_usd = totals
+        sales_count, revenue_usd, revenue_ars, profit_usd = self.repo.sales_totals_between(start_iso, end_iso)
 
-        sales_rows = self.repo.list_sales_between(start_iso, end_iso)
         purchases_rows = self.repo.list_purchases_between(start_iso, end_iso)
 
         spent_usd = sum(float(p.total_usd) for p in purchases_rows) if purchases_rows else 0.0
@@ -91,22 +90,20 @@ class ReportingService:
         bold_row(ws2, 1)
 
         out_row = 2
-        for s in sales_rows:
-            items = self.repo.sale_items_for_sale(int(s.id))
-            for it in items:
-                margin_pct = (it.line_margin_usd / it.line_total_usd) if it.line_total_usd else 0.0
-                ws2.append([
-                    int(s.id), s.datetime, s.notes or "",
-                    it.sku, it.name,
-                    int(it.qty), float(it.unit_price_usd), float(it.cost_usd),
-                    float(it.line_total_usd), float(it.line_margin_usd), float(margin_pct)
-                ])
-                money(ws2[f"G{out_row}"])
-                money(ws2[f"H{out_row}"])
-                money(ws2[f"I{out_row}"])
-                money(ws2[f"J{out_row}"])
-                pct(ws2[f"K{out_row}"])
-                out_row += 1
+        for s, it in self.repo.iter_sale_lines_between(start_iso, end_iso):
+            margin_pct = (it.line_margin_usd / it.line_total_usd) if it.line_total_usd else 0.0
+            ws2.append([
+                int(s.id), s.datetime, s.notes or "",
+                it.sku, it.name,
+                int(it.qty), float(it.unit_price_usd), float(it.cost_usd),
+                float(it.line_total_usd), float(it.line_margin_usd), float(margin_pct)
+            ])
+            money(ws2[f"G{out_row}"])
+            money(ws2[f"H{out_row}"])
+            money(ws2[f"I{out_row}"])
+            money(ws2[f"J{out_row}"])
+            pct(ws2[f"K{out_row}"])
+            out_row += 1
 
         ws2.freeze_panes = "A2"
         set_widths(ws2, {
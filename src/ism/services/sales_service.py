@@ -32,14 +32,17 @@ class SalesService:
         grouped: dict[int, dict[str, float | int]] = {}
 
         for it in items:
-            qty = int(it["qty"])
-            unit_price = float(it["unit_price_usd"])
+            try:
+                qty = int(it["qty"])
+                unit_price = float(it["unit_price_usd"])
+                product_id = int(it["product_id"])
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValidationError("Each line needs a product, a whole qty and a unit price.") from e
             if qty <= 0:
                 raise ValidationError("Qty must be >= 1.")
             if unit_price <= 0:
                 raise ValidationError("Unit price must be > 0.")
 
-            product_id = int(it["product_id"])
             if product_id not in grouped:
                 grouped[product_id] = {"qty": qty, "gross_usd": qty * unit_price}
             else:
@@ -67,16 +70,12 @@ class SalesService:
         if not items:
             raise ValidationError("Cart is empty.")
         items = self._normalize_items(items)
+        # Reject unknown products before the FX lookup, which may go to the network.
+        known = self.repo.get_products_by_ids(int(it["product_id"]) for it in items)
+        if len(known) != len(items):
+            raise NotFoundError("Product not found.")
 
-        # Validate normalized items.
-        for it in items:
-            product_id = int(it["product_id"])
-            prod = self.repo.get_product_by_id(product_id)
-            if not prod:
-                raise NotFoundError("Product not found.")
-            if int(it["qty"]) > int(prod.stock):
-                raise InsufficientStockError(f"Not enough stock for {prod.sku}. Available: {prod.stock}")
-
+        # Fetch FX before the write transaction so no network call runs under the write lock.
         try:
             fx = float(self.fx.get_today_rate())
         except FxUnavailableError:
@@ -86,6 +85,15 @@ class SalesService:
 
         try:
             with self.uow_factory() as uow:
+                # Stock can change while FX is fetched: re-check it on the transaction that writes the sale.
+                products = uow.get_products_by_ids(int(it["product_id"]) for it in items)
+                for it in items:
+                    prod = products.get(int(it["product_id"]))
+                    if not prod:
+                        raise NotFoundError("Product not found.")
+                    if int(it["qty"]) > int(prod.stock):
+                        raise InsufficientStockError(f"Not enough stock for {prod.sku}. Available: {prod.stock}")
+
                 sale_id = uow.create_sale(fx, notes, items, actor_user_id=actor_user_id)
         except sqlite3.IntegrityError as e:
             raise ValidationError("Sale has invalid or duplicated lines.") from e
@@ -99,8 +107,15 @@ class SalesService:
         log.info("sale_created sale_id=%s items=%s fx=%.4f actor=%s", sale_id, len(items), fx, actor_user_id)
         return sale_id
 
-    def list_sales_between(self, start_iso: str, end_iso: str) -> list[SaleHeader]:
-        return self.repo.list_sales_between(start_iso, end_iso)
+    def list_sales_between(
+        self,
+        start_iso: str,
+        end_iso: str,
+        *,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+    ) -> list[SaleHeader]:
+        return self.repo.list_sales_between(start_iso, end_iso, after=after, limit=limit)
 
     def get_sale_header(self, sale_id: int) -> Optional[SaleHeader]:
         return self.repo.get_sale_header(sale_id)
@@ -108,5 +123,8 @@ class SalesService:
     def sale_items_for_sale(self, sale_id: int) -> list[SaleLine]:
         return self.repo.sale_items_for_sale(sale_id)
 
+    def sales_totals_between(self, start_iso: str, end_iso: str) -> tuple[int, float, float, float]:
+        return self.repo.sales_totals_between(start_iso, end_iso)
+
     def sales_summary_between(self, start_iso: str, end_iso: str):
         return self.repo.sales_summary_between(start_iso, end_iso)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DashboardKpis:
+    products: int
+    units: int
+    low_stock: int
+    revenue_7d_usd: float
+    profit_7d_usd: float
+
+
+def dashboard_kpis(inventory, sales, now: datetime | None = None) -> DashboardKpis:
+    """The sidebar KPI panel: catalog counts plus revenue and profit over the last 7 days."""
+    products = inventory.list_products()
+    end = (now or datetime.now()).replace(microsecond=0)
+    start = end - timedelta(days=7)
+    _cnt, rev_usd, _rev_ars, profit_usd = sales.sales_totals_between(start.isoformat(sep=" "), end.isoformat(sep=" "))
+    return DashboardKpis(
+        products=len(products),
+        units=sum(int(p.stock) for p in products),
+        low_stock=sum(1 for p in products if int(p.stock) <= int(p.min_stock)),
+        revenue_7d_usd=float(rev_usd),
+        profit_7d_usd=float(profit_usd),
+    )
+
+
+class StartupPrefetch:
+    """Loads what the first screen shows on a worker thread while the user logs in.
+
+    ``kpis`` resolves once the product catalog is in memory and the 7-day totals
+    are read; ``fx_rate`` resolves after today's rate is fetched or read from the
+    cache. Both are ``concurrent.futures.Future`` objects. A failed load is logged
+    and stored as the future's exception, so the UI can fall back to loading it
+    itself.
+    """
+
+    def __init__(self, inventory, sales, fx):
+        self.inventory = inventory
+        self.sales = sales
+        self.fx = fx
+        self.kpis: Future[DashboardKpis] = Future()
+        self.fx_rate: Future[float] = Future()
+        self.seconds: float | None = None
+        self._thread = threading.Thread(target=self._run, name="ism-startup-prefetch", daemon=True)
+
+    def start(self) -> StartupPrefetch:
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        # Local reads first: the FX lookup may wait on the network.
+        for future, load in (
+            (self.kpis, lambda: dashboard_kpis(self.inventory, self.sales)),
+            (self.fx_rate, self.fx.get_today_rate),
+        ):
+            try:
+                future.set_result(load())
+            except Exception as e:  # noqa: BLE001
+                log.warning("startup_prefetch_failed error=%s", e)
+                future.set_exception(e)
+        self.seconds = time.perf_counter() - started
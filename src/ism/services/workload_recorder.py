@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+# Service attribute name on the container -> methods whose calls are journaled.
+RECORDED_OPERATIONS: dict[str, tuple[str, ...]] = {
+    "sales": ("create_sale", "list_sales_between", "sales_totals_between", "sales_summary_between"),
+    "purchases": ("create_purchase", "list_purchases_between"),
+    "inventory": (
+        "list_products",
+        "get_product_by_sku",
+        "add_product",
+        "update_product",
+        "upsert_product_keep_stock",
+        "remove_product_stock",
+        "clear_product_stock",
+        "delete_product",
+    ),
+    "excel": ("import_restock_excel",),
+}
+
+
+class WorkloadRecorder:
+    """Appends service calls to an NDJSON journal that ``ism.devtools.workload`` can replay.
+
+    Each line is one call: start time (``t``, epoch seconds), ``op`` such as
+    ``sales.create_sale``, the bound arguments, duration and whether it raised.
+    Only the outermost recorded call on a thread is written, so the purchase an
+    Excel restock makes internally is not replayed twice. With ``strip_notes``
+    every ``notes`` argument is dropped before it reaches the file.
+    """
+
+    def __init__(self, path: Path | str, *, strip_notes: bool = False):
+        self.path = Path(path)
+        self.strip_notes = strip_notes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def attach(self, service, name: str, methods: tuple[str, ...]) -> None:
+        """Replace ``methods`` on the ``service`` instance with recording wrappers."""
+        for method in methods:
+            setattr(service, method, self._wrap(getattr(service, method), f"{name}.{method}"))
+
+    def _wrap(self, fn, op: str):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def recorded(*args, **kwargs):
+            depth = getattr(self._local, "depth", 0)
+            if depth:
+                return fn(*args, **kwargs)
+            self._local.depth = 1
+            started_at = time.time()
+            t0 = time.perf_counter()
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                self._local.depth = 0
+                try:
+                    bound = signature.bind(*args, **kwargs)
+                    self.record(op, dict(bound.arguments), started_at, time.perf_counter() - t0, ok)
+                except Exception:
+                    log.exception("workload_record_failed op=%s", op)
+
+        return recorded
+
+    def record(self, op: str, arguments: dict, started_at: float, seconds: float, ok: bool) -> None:
+        if self.strip_notes and "notes" in arguments:
+            arguments["notes"] = None
+        line = json.dumps(
+            {"t": round(started_at, 4), "op": op, "args": arguments, "ms": round(seconds * 1000.0, 3), "ok": ok},
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Phase durations and launch-relative milestones for one application start.
+
+    ``origin`` is when ``ism.main`` began importing, so the interpreter's own
+    start-up is not included. ``emit()`` logs the report and, with ``echo``,
+    also prints it to stderr (``ism --startup-report`` or ``ISM_STARTUP_REPORT=1``).
+    """
+
+    def __init__(self, origin: float | None = None, *, echo: bool = False):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.echo = echo
+        self.phases: list[tuple[str, float]] = []
+        self.milestones: list[tuple[str, float]] = []
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def mark(self, name: str) -> float:
+        elapsed = time.perf_counter() - self.origin
+        self.milestones.append((name, elapsed))
+        return elapsed
+
+    def report(self) -> str:
+        lines = ["Startup timing"]
+        lines += [f"  {name:<24} {seconds * 1000.0:9.1f} ms" for name, seconds in self.phases]
+        lines += [f"  @ {name:<22} {seconds * 1000.0:9.1f} ms after launch" for name, seconds in self.milestones]
+        return "\n".join(lines)
+
+    def emit(self) -> None:
+        log.info(
+            "startup %s",
+            " ".join(f"{name}_ms={seconds * 1000.0:.1f}" for name, seconds in self.phases + self.milestones),
+        )
+        if self.echo:
+            print(self.report(), file=sys.stderr, flush=True)
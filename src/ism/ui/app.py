@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
 import logging
 from pathlib import Path
+import time
 
 from ism.domain.errors import AppError
+from ism.services.startup_prefetch import DashboardKpis, dashboard_kpis
 from ism.ui.views.products_view import ProductsView
 from ism.ui.views.sales_view import SalesView
 from ism.ui.views.restock_view import RestockView
@@ -14,6 +15,11 @@ from ism.ui.views.reports_view import ReportsView
 
 log = logging.getLogger(__name__)
 
+# How often to ask SQLite whether another terminal has committed.
+CHANGE_POLL_MS = 2000
+# Longest the first paint waits for the startup prefetch before querying KPIs itself.
+PREFETCH_WAIT_S = 0.5
+
 
 class App(tk.Tk):
     def __init__(
@@ -30,6 +36,9 @@ class App(tk.Tk):
         update_service,
         db_path: str,
         logs_dir: str,
+        change_monitor=None,
+        startup=None,
+        prefetch=None,
     ):
         super().__init__()
         self.title("Inventory & Sales Manager Pro")
@@ -41,13 +50,23 @@ class App(tk.Tk):
         self.inventory = inventory_service
         self.sales = sales_service
         self.purchases = purchase_service
-        self.excel = excel_service
-        self.reporting = reporting_service
+        # Excel, reporting and update services may be passed as zero-argument factories
+        # and are then built the first time the UI needs them.
+        self._excel = excel_service
+        self._reporting = reporting_service
         self.auth = auth_service
         self.backup = backup_service
         self.operations = operations_service
-        self.updates = update_service
+        self._updates = update_service
+        self.changes = change_monitor
+        self.startup = startup
+        # Started before this window: loads the catalog, KPIs and FX while the login dialog is up.
+        self._prefetch = prefetch
+        if startup is not None:
+            startup.mark("login_dialog")
         self.current_user = self._login_dialog()
+        if startup is not None:
+            startup.mark("logged_in")
 
         self.db_path = db_path
         self.logs_dir = logs_dir
@@ -86,6 +105,34 @@ class App(tk.Tk):
 
         self.refresh_all(silent_fx=True, show_toast=False)
         self.toast("Ready.", kind="info", ms=1200)
+        if self.changes is not None:
+            self.after(CHANGE_POLL_MS, self._poll_changes)
+        if startup is not None:
+            self.after_idle(self._startup_painted)
+
+    @staticmethod
+    def _resolve(service):
+        return service() if callable(service) else service
+
+    @property
+    def excel(self):
+        self._excel = self._resolve(self._excel)
+        return self._excel
+
+    @property
+    def reporting(self):
+        self._reporting = self._resolve(self._reporting)
+        return self._reporting
+
+    @property
+    def updates(self):
+        self._updates = self._resolve(self._updates)
+        return self._updates
+
+    def _startup_painted(self) -> None:
+        self.update_idletasks()
+        self.startup.mark("first_paint")
+        self.startup.emit()
 
     def _login_dialog(self):
         users = self.auth.list_users()
@@ -257,7 +304,7 @@ class App(tk.Tk):
             style="Subtitle.TLabel",
             wraplength=280,
         ).pack(anchor="w", pady=(3, 6))
-        ttk.Button(header, text="Refresh data", style="Primary.TButton", command=self.refresh_all).pack(fill="x", pady=(4, 0))
+        ttk.Button(header, text="Refresh data", style="Primary.TButton", command=lambda: self.refresh_all(reload_catalog=True)).pack(fill="x", pady=(4, 0))
         ttk.Button(
             header,
             text="Create backup",
@@ -279,6 +326,13 @@ class App(tk.Tk):
             command=self.export_diagnostics,
             state=("normal" if self.can_action("export_diagnostics") else "disabled"),
         ).pack(fill="x", pady=(6, 0))
+        ttk.Button(
+            header,
+            text="Rebuild report totals",
+            style="Ghost.TButton",
+            command=self.rebuild_sales_rollup,
+            state=("normal" if self.can_action("rebuild_sales_rollup") else "disabled"),
+        ).pack(fill="x", pady=(6, 0))
         ttk.Button(
             header,
             text="Restore latest backup",
@@ -500,7 +554,10 @@ class App(tk.Tk):
             if not self.can_action("run_health_check"):
                 raise PermissionError("Your role cannot run health checks.")
             rep = self.operations.run_health_check()
-            msg = f"Integrity: {rep.sqlite_integrity} | DB: {rep.db_size_bytes} bytes | logs: {rep.logs_count}"
+            msg = (
+                f"Integrity: {rep.sqlite_integrity} | DB: {rep.db_size_bytes} bytes | logs: {rep.logs_count}"
+                f" | SQLite profile: {rep.sqlite_profile}"
+            )
             messagebox.showinfo("Health check", msg)
             self.toast("Health check OK.", kind="success")
         except Exception as e:
@@ -515,6 +572,16 @@ class App(tk.Tk):
         except Exception as e:
             self.handle_error("Diagnostics", e, "Could not export diagnostics.")
 
+    def rebuild_sales_rollup(self):
+        try:
+            if not self.can_action("rebuild_sales_rollup"):
+                raise PermissionError("Your role cannot rebuild report totals.")
+            days = self.operations.rebuild_sales_rollup()
+            self.refresh_all(silent_fx=True, show_toast=False)
+            self.toast(f"Report totals rebuilt ({days} days).", kind="success")
+        except Exception as e:  # noqa: BLE001
+            self.handle_error("Report totals", e, "Could not rebuild report totals.")
+
     def restore_latest_backup(self):
         try:
             if not self.can_action("restore_backup"):
@@ -522,7 +589,7 @@ class App(tk.Tk):
             if not messagebox.askyesno("Restore backup", "This will replace current DB with latest backup. Continue?"):
                 return
             self.operations.restore_latest_backup(self.backup)
-            self.refresh_all(silent_fx=True, show_toast=False)
+            self.refresh_all(silent_fx=True, show_toast=False, reload_catalog=True)
             self.toast("Latest backup restored.", kind="warn", ms=3000)
         except Exception as e:
             self.handle_error("Restore backup", e, "Could not restore latest backup.")
@@ -558,34 +625,93 @@ class App(tk.Tk):
             if not silent:
                 self.handle_error("FX", e, "FX update failed.")
 
-    def refresh_all(self, silent_fx: bool = False, show_toast: bool = True):
-        self.update_fx(silent=silent_fx)
+    def refresh_all(self, silent_fx: bool = False, show_toast: bool = True, reload_catalog: bool = False):
+        # Absorb pending changes first: everything below re-reads, so the next poll starts clean.
+        changed = self._take_changes()
+        prefetch, self._prefetch = self._prefetch, None
+        kpis = self._prefetched_kpis(prefetch) if prefetch is not None else None
+        if reload_catalog or "products" in changed:
+            self.inventory.reload_catalog()
+            kpis = None
+        if prefetch is not None:
+            self._show_prefetched_fx(prefetch.fx_rate)
+        else:
+            self.update_fx(silent=silent_fx)
 
         self.products_view.refresh()
         self.sales_view.refresh()
         self.restock_view.refresh()
-        self.refresh_kpis()
+        self.refresh_kpis(kpis)
         self.refresh_low_stock_panel()
         if show_toast:
             self.toast("Refreshed.", kind="info", ms=1200)
 
-    def refresh_kpis(self):
+    def _prefetched_kpis(self, prefetch) -> DashboardKpis | None:
+        started = time.perf_counter()
+        try:
+            return prefetch.kpis.result(timeout=PREFETCH_WAIT_S)
+        except Exception as e:  # noqa: BLE001
+            # Timed out or failed: refresh_all falls back to the synchronous query.
+            log.info("startup_prefetch_kpis_unused reason=%s", type(e).__name__)
+            return None
+        finally:
+            if self.startup is not None:
+                self.startup.record("prefetch_wait", time.perf_counter() - started)
+
+    def _show_prefetched_fx(self, future):
+        if not future.done():
+            self.fx_var.set("FX (USD->ARS): loading...")
+            self.after(250, self._show_prefetched_fx, future)
+            return
+        try:
+            self.fx_var.set(f"FX (USD->ARS): {future.result():.4f}")
+        except Exception:  # noqa: BLE001
+            self.fx_var.set("FX (USD->ARS): not loaded")
+
+    def _take_changes(self) -> frozenset[str]:
+        if self.changes is None:
+            return frozenset()
+        try:
+            return self.changes.poll()
+        except Exception as e:  # noqa: BLE001
+            log.warning("change_poll_failed: %s", e)
+            return frozenset()
+
+    def _poll_changes(self):
+        try:
+            changed = self._take_changes()
+            if changed:
+                self._refresh_changed(changed)
+        except Exception:
+            log.exception("Change refresh failed")
+        finally:
+            self.after(CHANGE_POLL_MS, self._poll_changes)
+
+    def _refresh_changed(self, changed: frozenset[str]):
+        """Refresh only the caches and views that read the changed tables."""
+        if "products" in changed:
+            self.inventory.reload_catalog()
+            self.products_view.refresh()
+            self.sales_view.refresh_product_choices()
+            self.restock_view.refresh_product_choices()
+            self.refresh_low_stock_panel()
+        if "sales" in changed:
+            self.sales_view.refresh_history()
+            self.reports_view.refresh()
+        if "purchases" in changed:
+            self.restock_view.refresh_history()
+        if changed & {"products", "sales"}:
+            self.refresh_kpis()
+
+    def refresh_kpis(self, kpis: DashboardKpis | None = None):
         try:
-            products = self.inventory.list_products()
-            products_count = len(products)
-            units = sum(int(p.stock) for p in products)
-            low_count = sum(1 for p in products if int(p.stock) <= int(p.min_stock))
-
-            end = datetime.now().replace(microsecond=0)
-            start = end - timedelta(days=7)
-            totals, _ = self.sales.sales_summary_between(start.isoformat(sep=" "), end.isoformat(sep=" "))
-            _cnt, rev_usd, _rev_ars, profit_usd = totals
-
-            self.k_products.config(text=str(products_count))
-            self.k_units.config(text=str(units))
-            self.k_low.config(text=str(low_count))
-            self.k_rev7.config(text=f"{float(rev_usd):.2f}")
-            self.k_profit7.config(text=f"{float(profit_usd):.2f}")
+            if kpis is None:
+                kpis = dashboard_kpis(self.inventory, self.sales)
+            self.k_products.config(text=str(kpis.products))
+            self.k_units.config(text=str(kpis.units))
+            self.k_low.config(text=str(kpis.low_stock))
+            self.k_rev7.config(text=f"{kpis.revenue_7d_usd:.2f}")
+            self.k_profit7.config(text=f"{kpis.profit_7d_usd:.2f}")
         except Exception as e:
             log.exception("KPI refresh failed: %s", e)
 
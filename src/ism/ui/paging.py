@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import Any
+
+DEFAULT_PAGE_SIZE = 200
+
+
+class TreePager:
+    """Fills a ``ttk.Treeview`` one keyset page at a time.
+
+    The first page is loaded on ``reset()``; the next one is fetched when the
+    view is scrolled close to the bottom, so the first paint costs one page no
+    matter how many rows the query covers. ``fetch_page(after, limit)`` must
+    return rows ordered consistently with ``key_of(row)``, which produces the
+    ``after`` cursor for the following page.
+    """
+
+    def __init__(
+        self,
+        tree,
+        fetch_page: Callable[[tuple | None, int], Sequence[Any]],
+        to_values: Callable[[Any], tuple],
+        key_of: Callable[[Any], tuple],
+        *,
+        tags_of: Callable[[Any], tuple] | None = None,
+        scrollbar=None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        threshold: float = 0.9,
+    ):
+        self.tree = tree
+        self.fetch_page = fetch_page
+        self.to_values = to_values
+        self.key_of = key_of
+        self.tags_of = tags_of
+        self.scrollbar = scrollbar
+        self.page_size = max(1, int(page_size))
+        self.threshold = float(threshold)
+        self._after: tuple | None = None
+        self._exhausted = False
+        self._pending = False
+        tree.configure(yscrollcommand=self._on_yscroll)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+    def reset(self) -> None:
+        """Clear the tree and load the first page."""
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        self._after = None
+        self._exhausted = False
+        self.load_more()
+
+    def load_more(self) -> bool:
+        """Append the next page; returns ``False`` once there is nothing left to load."""
+        self._pending = False
+        if self._exhausted:
+            return False
+        rows = self.fetch_page(self._after, self.page_size)
+        for row in rows:
+            tags = self.tags_of(row) if self.tags_of is not None else ()
+            self.tree.insert("", "end", values=self.to_values(row), tags=tags)
+        if rows:
+            self._after = self.key_of(rows[-1])
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        return bool(rows)
+
+    def _on_yscroll(self, first, last) -> None:
+        if self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+        if self._exhausted or self._pending or float(last) < self.threshold:
+            return
+        # Defer the query: Tk calls this while it is still laying out the tree.
+        self._pending = True
+        self.tree.after_idle(self.load_more)
@@ -4,6 +4,8 @@ import logging
 import tkinter as tk
 from tkinter import messagebox, ttk
 
+from ism.ui.paging import TreePager
+
 
 log = logging.getLogger(__name__)
 
@@ -73,7 +75,15 @@ class ProductsView:
 
         vsb = ttk.Scrollbar(tree_wrap, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(tree_wrap, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(xscrollcommand=hsb.set)
+        self.pager = TreePager(
+            self.tree,
+            lambda after, limit: self.app.inventory.list_products(after=after, limit=limit),
+            to_values=lambda p: (p.id, p.sku, p.name, f"{p.cost_usd:.2f}", f"{p.price_usd:.2f}", p.stock, p.min_stock),
+            key_of=lambda p: (p.name, p.id),
+            tags_of=lambda p: ("low",) if int(p.stock) <= int(p.min_stock) else (),
+            scrollbar=vsb,
+        )
         self.tree.grid(row=0, column=0, sticky="nsew")
         vsb.grid(row=0, column=1, sticky="ns")
         hsb.grid(row=1, column=0, sticky="ew")
@@ -290,17 +300,7 @@ class ProductsView:
         self.p_sku.focus_set()
 
     def refresh(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        rows = self.app.inventory.list_products()
-        for p in rows:
-            tag = "low" if int(p.stock) <= int(p.min_stock) else ""
-            self.tree.insert(
-                "", "end",
-                values=(p.id, p.sku, p.name, f"{p.cost_usd:.2f}", f"{p.price_usd:.2f}", p.stock, p.min_stock),
-                tags=(tag,) if tag else (),
-            )
+        self.pager.reset()
 
         if hasattr(self.app, "sales_view"):
             self.app.sales_view.refresh_product_choices()
@@ -308,10 +308,17 @@ class ProductsView:
             self.app.restock_view.refresh_product_choices()
 
     def select_product_in_tree(self, sku: str):
-        for iid in self.tree.get_children():
-            vals = self.tree.item(iid, "values")
-            if len(vals) >= 2 and str(vals[1]) == str(sku):
-                self.tree.selection_set(iid)
-                self.tree.focus(iid)
-                self.tree.see(iid)
+        checked = 0
+        while True:
+            children = self.tree.get_children()
+            for iid in children[checked:]:
+                vals = self.tree.item(iid, "values")
+                if len(vals) >= 2 and str(vals[1]) == str(sku):
+                    self.tree.selection_set(iid)
+                    self.tree.focus(iid)
+                    self.tree.see(iid)
+                    return
+            checked = len(children)
+            # The product may sit on a page that has not been scrolled into view yet.
+            if not self.pager.load_more():
                 return
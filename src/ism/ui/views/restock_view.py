@@ -5,6 +5,8 @@ from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 import logging
 
+from ism.ui.paging import TreePager
+
 log = logging.getLogger(__name__)
 
 class RestockView:
@@ -18,7 +20,9 @@ class RestockView:
         self.restock_total_var = tk.StringVar(value="Total USD: 0.00")
 
         self.restock_all_choices: list[str] = []
+        self._choices_version: int | None = None
         self.restock_sku_map: dict[str, str] = {}
+        self._history_range: tuple[str, str] = ("", "")
 
         self._build()
         self.refresh()
@@ -111,8 +115,17 @@ class RestockView:
         for c in cols:
             self.purchases_tree.heading(c, text=heads[c])
             self.purchases_tree.column(c, width=widths[c], anchor="w")
-        self.purchases_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        hist_scroll = ttk.Scrollbar(hist, orient="vertical", command=self.purchases_tree.yview)
+        hist_scroll.pack(side="right", fill="y", padx=(0, 10), pady=(0, 10))
+        self.purchases_tree.pack(fill="both", expand=True, padx=(10, 0), pady=(0, 10))
         self.purchases_tree.bind("<Double-1>", self.open_purchase_details)
+        self.history_pager = TreePager(
+            self.purchases_tree,
+            self._fetch_history_page,
+            to_values=lambda p: (p.id, p.datetime, p.vendor or "", f"{p.total_usd:.2f}", (p.notes or "")[:140]),
+            key_of=lambda p: (p.datetime, p.id),
+            scrollbar=hist_scroll,
+        )
 
     def _on_enter_add_item(self, _event=None):
         self.add_item()
@@ -131,6 +144,9 @@ class RestockView:
         combo["values"] = all_choices if not typed else [c for c in all_choices if typed in c.lower()]
 
     def refresh_product_choices(self):
+        version = self.app.inventory.catalog_version()
+        if version == self._choices_version:
+            return
         rows = self.app.inventory.list_products()
         choices = []
         mapping = {}
@@ -141,6 +157,7 @@ class RestockView:
         self.restock_all_choices = choices
         self.restock_sku_map = mapping
         self.combo["values"] = choices
+        self._choices_version = version
 
     def refresh(self):
         self.refresh_product_choices()
@@ -266,15 +283,12 @@ class RestockView:
         end = datetime.now().replace(microsecond=0)
         start = end - timedelta(days=days)
 
-        rows = self.app.purchases.list_purchases_between(start.isoformat(sep=" "), end.isoformat(sep=" "))
-
-        for item in self.purchases_tree.get_children():
-            self.purchases_tree.delete(item)
+        self._history_range = (start.isoformat(sep=" "), end.isoformat(sep=" "))
+        self.history_pager.reset()
 
-        for p in rows:
-            self.purchases_tree.insert("", "end", values=(
-                p.id, p.datetime, p.vendor or "", f"{p.total_usd:.2f}", (p.notes or "")[:140]
-            ))
+    def _fetch_history_page(self, after, limit):
+        start_iso, end_iso = self._history_range
+        return self.app.purchases.list_purchases_between(start_iso, end_iso, after=after, limit=limit)
 
     def open_purchase_details(self, _evt=None):
         sel = self.purchases_tree.selection()
@@ -5,6 +5,8 @@ from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 import logging
 
+from ism.ui.paging import TreePager
+
 
 log = logging.getLogger(__name__)
 
@@ -20,7 +22,9 @@ class SalesView:
         self.sale_total_var = tk.StringVar(value="Total USD: 0.00 | Total ARS: 0.00")
 
         self.sale_all_choices: list[str] = []
+        self._choices_version: int | None = None
         self.sale_sku_map: dict[str, str] = {}
+        self._history_range: tuple[str, str] = ("", "")
 
         self._build()
         self.refresh()
@@ -102,8 +106,19 @@ class SalesView:
         for c in cols:
             self.sales_tree.heading(c, text=heads[c])
             self.sales_tree.column(c, width=widths[c], anchor="w")
-        self.sales_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        hist_scroll = ttk.Scrollbar(hist, orient="vertical", command=self.sales_tree.yview)
+        hist_scroll.pack(side="right", fill="y", padx=(0, 10), pady=(0, 10))
+        self.sales_tree.pack(fill="both", expand=True, padx=(10, 0), pady=(0, 10))
         self.sales_tree.bind("<Double-1>", self.open_sale_details)
+        self.history_pager = TreePager(
+            self.sales_tree,
+            self._fetch_history_page,
+            to_values=lambda s: (
+                s.id, s.datetime, f"{s.total_usd:.2f}", f"{s.fx_usd_ars:.4f}", f"{s.total_ars:.2f}", (s.notes or "")[:140]
+            ),
+            key_of=lambda s: (s.datetime, s.id),
+            scrollbar=hist_scroll,
+        )
         
     def _on_enter_add_to_cart(self, _event=None):
         self.add_to_cart()
@@ -118,6 +133,9 @@ class SalesView:
         combo["values"] = all_choices if not typed else [c for c in all_choices if typed in c.lower()]
 
     def refresh_product_choices(self):
+        version = self.app.inventory.catalog_version()
+        if version == self._choices_version:
+            return
         rows = self.app.inventory.list_products()
         choices = []
         mapping = {}
@@ -128,6 +146,7 @@ class SalesView:
         self.sale_all_choices = choices
         self.sale_sku_map = mapping
         self.combo["values"] = choices
+        self._choices_version = version
 
     def refresh(self):
         self.refresh_product_choices()
@@ -253,15 +272,12 @@ class SalesView:
         end = datetime.now().replace(microsecond=0)
         start = end - timedelta(days=days)
 
-        rows = self.app.sales.list_sales_between(start.isoformat(sep=" "), end.isoformat(sep=" "))
+        self._history_range = (start.isoformat(sep=" "), end.isoformat(sep=" "))
+        self.history_pager.reset()
 
-        for item in self.sales_tree.get_children():
-            self.sales_tree.delete(item)
-
-        for s in rows:
-            self.sales_tree.insert("", "end", values=(
-                s.id, s.datetime, f"{s.total_usd:.2f}", f"{s.fx_usd_ars:.4f}", f"{s.total_ars:.2f}", (s.notes or "")[:140]
-            ))
+    def _fetch_history_page(self, after, limit):
+        start_iso, end_iso = self._history_range
+        return self.app.sales.list_sales_between(start_iso, end_iso, after=after, limit=limit)
 
     def open_sale_details(self, _evt=None):
         sel = self.sales_tree.selection()
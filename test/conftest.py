@@ -1,6 +1,8 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
@@ -18,4 +20,11 @@ def set_admin_pin(repo, pin: str = "Admin#1234") -> str:
     )
     conn.commit()
     conn.close()
-    return pin
\ No newline at end of file
+    return pin
+
+@pytest.fixture(scope="session")
+def synthetic_db(tmp_path_factory):
+    """A small generated database shared by the session; copy it before writing to it."""
+    from ism.devtools.dataset import SIZES, generate_dataset
+
+    return generate_dataset(tmp_path_factory.mktemp("synthetic") / "synthetic.db", SIZES["tiny"]).path
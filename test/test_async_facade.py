@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from ism.domain.errors import InsufficientStockError
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.async_facade import AsyncServiceFacade
+from ism.services.inventory_service import InventoryService
+from ism.services.purchase_service import PurchaseService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def __init__(self):
+        self.stored: dict[date, float] = {}
+        self.fetch_threads: list[str] = []
+
+    def get_today_rate(self):
+        return 1000.0
+
+    def get_cached_rate_for_date(self, d: date):
+        return self.stored.get(d)
+
+    def get_rate_for_date(self, d: date):
+        self.fetch_threads.append(threading.current_thread().name)
+        self.stored[d] = 1000.0
+        return 1000.0
+
+
+class ThreadRecordingInventory(InventoryService):
+    def __init__(self, repo):
+        super().__init__(repo)
+        self.threads: set[str] = set()
+
+    def list_products(self):
+        self.threads.add(threading.current_thread().name)
+        return super().list_products()
+
+
+def _facade(tmp_path: Path) -> tuple[AsyncServiceFacade, SqliteRepository, int]:
+    repo = SqliteRepository(tmp_path / "async.db")
+    repo.init_db()
+    inventory = ThreadRecordingInventory(repo)
+    pid = inventory.add_product("SKU-A", "Async", 1.0, 2.0, 20, 0)
+    fx = FixedFxService()
+    facade = AsyncServiceFacade(inventory, SalesService(repo, fx), PurchaseService(repo), fx, max_readers=3)
+    return facade, repo, pid
+
+
+def test_many_concurrent_calls_share_bounded_executors(tmp_path: Path):
+    facade, repo, pid = _facade(tmp_path)
+
+    async def scenario():
+        async with facade:
+            reads = [facade.list_products() for _ in range(100)]
+            sales = [facade.create_sale(None, [{"product_id": pid, "qty": 1, "unit_price_usd": 2.0}]) for _ in range(10)]
+            restock = facade.create_purchase("Vendor", None, [{"product_id": pid, "qty": 5, "unit_cost_usd": 1.0}])
+            summary = facade.sales_summary_between("2000-01-01 00:00:00", "2100-01-01 00:00:00")
+            rate = facade.get_rate_for_date(date(2024, 1, 1))
+            return await asyncio.gather(*reads, *sales, restock, summary, rate)
+
+    results = asyncio.run(scenario())
+
+    assert all(len(r) == 1 for r in results[:100])
+    assert len(set(results[100:110])) == 10
+    assert results[-1] == 1000.0
+    assert repo.get_product_by_id(pid).stock == 15
+    # 100 awaited reads ran on at most the 3 reader threads.
+    assert 1 <= len(facade.inventory.threads) <= 3
+    assert all(name.startswith("ism-async-read") for name in facade.inventory.threads)
+
+
+def test_fx_cache_miss_fetches_on_the_writer(tmp_path: Path):
+    facade, _repo, _pid = _facade(tmp_path)
+
+    async def scenario():
+        async with facade:
+            first = await facade.get_rate_for_date(date(2024, 1, 2))
+            second = await facade.get_rate_for_date(date(2024, 1, 2))
+            return first, second
+
+    assert asyncio.run(scenario()) == (1000.0, 1000.0)
+    # Only the miss fetched (and stored) the rate, on the writer thread.
+    assert len(facade.fx.fetch_threads) == 1
+    assert all(name.startswith("ism-async-write") for name in facade.fx.fetch_threads)
+
+
+def test_service_errors_propagate_to_awaiting_caller(tmp_path: Path):
+    facade, _repo, pid = _facade(tmp_path)
+
+    async def oversell():
+        async with facade:
+            await facade.create_sale(None, [{"product_id": pid, "qty": 999, "unit_price_usd": 2.0}])
+
+    with pytest.raises(InsufficientStockError):
+        asyncio.run(oversell())
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.backup_service import BackupService
+from ism.services.change_monitor import ChangeMonitor
+from ism.services.inventory_service import InventoryService
+from ism.services.operations_service import OperationsService
+from ism.services.purchase_service import PurchaseService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+def _two_terminals(tmp_path: Path) -> tuple[SqliteRepository, SqliteRepository]:
+    db = tmp_path / "shared.db"
+    here = SqliteRepository(db)
+    here.init_db()
+    there = SqliteRepository(db)
+    return here, there
+
+
+def test_idle_polls_do_not_read_tables(tmp_path: Path):
+    here, there = _two_terminals(tmp_path)
+    monitor = ChangeMonitor(here)
+    reads = monitor.counter_reads
+
+    for _ in range(20):
+        assert monitor.poll() == frozenset()
+    assert monitor.counter_reads == reads
+    here.close()
+    there.close()
+
+
+def test_reports_tables_written_by_another_connection(tmp_path: Path):
+    here, there = _two_terminals(tmp_path)
+    monitor = ChangeMonitor(here)
+
+    pid = InventoryService(there).add_product("SKU-X", "Shared", 1.0, 2.0, 10, 0)
+    assert monitor.poll() == frozenset({"products"})
+    assert monitor.poll() == frozenset()
+
+    SalesService(there, FixedFxService()).create_sale(None, [{"product_id": pid, "qty": 1, "unit_price_usd": 2.0}])
+    assert monitor.poll() == frozenset({"products", "sales"})
+
+    PurchaseService(there).create_purchase("Vendor", None, [{"product_id": pid, "qty": 1, "unit_cost_usd": 1.0}])
+    assert monitor.poll() == frozenset({"products", "purchases"})
+    here.close()
+    there.close()
+
+
+def test_other_terminal_writes_can_invalidate_the_catalog(tmp_path: Path):
+    here, there = _two_terminals(tmp_path)
+    monitor = ChangeMonitor(here)
+    inventory = InventoryService(here)
+    assert inventory.list_products() == []
+    pid = InventoryService(there).add_product("SKU-Y", "Shared", 1.0, 2.0, 10, 0)
+    assert inventory.list_products() == []
+
+    if "products" in monitor.poll():
+        inventory.reload_catalog()
+    assert [p.id for p in inventory.list_products()] == [pid]
+    here.close()
+    there.close()
+
+
+def test_restore_resets_the_baseline(tmp_path: Path):
+    here, there = _two_terminals(tmp_path)
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    (backup_dir / ".backup.key").write_bytes(b"k" * 32)
+    backups = BackupService(tmp_path / "shared.db", backup_dir)
+    InventoryService(there).add_product("SKU-A", "Before backup", 1.0, 2.0, 10, 0)
+    backups.create_backup()
+    InventoryService(there).add_product("SKU-B", "After backup", 1.0, 2.0, 10, 0)
+    monitor = ChangeMonitor(here)
+    there.close()
+
+    OperationsService(here, tmp_path / "shared.db", tmp_path / "logs", backup_dir).restore_latest_backup(backups)
+    assert monitor.poll() == frozenset()
+
+    InventoryService(there).add_product("SKU-C", "After restore", 1.0, 2.0, 10, 0)
+    assert monitor.poll() == frozenset({"products"})
+    here.close()
+    there.close()
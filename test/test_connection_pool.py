@@ -0,0 +1,83 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+
+
+def test_repository_reuses_pooled_connections(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "pool.db")
+    repo.init_db()
+    inv = InventoryService(repo)
+    pid = inv.add_product("SKU-P", "Pooled", 1.0, 2.0, 5, 1)
+
+    opened = repo._pool.connections_opened
+    for _ in range(50):
+        assert repo.get_product_by_id(pid) is not None
+    inv.list_products()
+
+    assert repo._pool.connections_opened == opened
+    repo.close()
+
+
+def test_released_connection_discards_uncommitted_work(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "rollback.db")
+    repo.init_db()
+
+    conn = repo._conn()
+    conn.execute(
+        "INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock) VALUES ('SKU-U', 'U', 1, 2, 1, 0)"
+    )
+    conn.close()
+
+    assert repo.get_product_by_sku("SKU-U") is None
+    repo.close()
+
+
+def test_repository_close_and_context_manager(tmp_path: Path):
+    db = tmp_path / "ctx.db"
+    with SqliteRepository(db) as repo:
+        repo.init_db()
+        assert repo._pool.open_count >= 1
+
+    assert repo._pool.open_count == 0
+    # Closed repositories reconnect lazily.
+    assert any(u.username == "admin" for u in repo.list_users())
+    repo.close()
+
+
+def test_pool_drops_connections_when_database_file_is_replaced(tmp_path: Path):
+    db = tmp_path / "swap.db"
+    repo = SqliteRepository(db)
+    repo.init_db()
+    InventoryService(repo).add_product("SKU-OLD", "Old", 1.0, 2.0, 1, 0)
+
+    other = SqliteRepository(tmp_path / "other.db")
+    other.init_db()
+    InventoryService(other).add_product("SKU-NEW", "New", 1.0, 2.0, 1, 0)
+    other.close()
+
+    (tmp_path / "other.db").replace(db)
+    for suffix in ("-wal", "-shm"):
+        db.with_name(db.name + suffix).unlink(missing_ok=True)
+
+    skus = {p.sku for p in repo.list_products()}
+    assert skus == {"SKU-NEW"}
+    repo.close()
+
+
+def test_failed_call_returns_its_connection_to_the_pool(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "fail.db")
+    repo.init_db()
+    repo.add_product("SKU-DUP", "Dup", 1.0, 2.0, 1, 0)
+
+    opened = repo._pool.connections_opened
+    for _ in range(10):
+        with pytest.raises(sqlite3.IntegrityError):
+            repo.add_product("SKU-DUP", "Dup", 1.0, 2.0, 1, 0)
+
+    assert repo._pool.connections_opened == opened
+    assert repo._pool._idle.qsize() >= 1
+    repo.close()
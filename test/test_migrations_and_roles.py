@@ -1,3 +1,4 @@
+import sqlite3
 from pathlib import Path
 
 import pytest
@@ -141,3 +142,64 @@ def test_migration_v4_creates_reporting_indexes(tmp_path: Path):
     assert "idx_sales_datetime" in names
     assert "idx_purchases_datetime" in names
     assert "idx_stock_ledger_product_datetime" in names
+
+
+def test_startup_on_current_schema_takes_no_backup(tmp_path: Path):
+    db = tmp_path / "current.db"
+    repo = SqliteRepository(db)
+    repo.init_db()
+    repo.close()
+
+    reopened = SqliteRepository(db)
+    reopened.init_db()
+    conn = reopened._conn()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    latest = max(v for v, _ in reopened._migrations())
+    reopened.close()
+
+    assert version == latest
+    assert list(tmp_path.glob("*.pre_migration_*.bak")) == []
+
+
+def test_newer_user_version_is_left_alone(tmp_path: Path, caplog):
+    db = tmp_path / "newer.db"
+    repo = SqliteRepository(db)
+    repo.init_db()
+    latest = max(v for v, _ in repo._migrations())
+    conn = repo._conn()
+    conn.execute(f"PRAGMA user_version = {latest + 1}")
+    conn.commit()
+    conn.close()
+
+    repo.run_migrations()
+
+    conn = repo._conn()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == latest + 1
+    conn.close()
+    assert "schema_newer_than_build" in caplog.text
+    repo.close()
+
+
+def test_pending_migration_backs_up_once_and_prunes_old_backups(tmp_path: Path):
+    db = tmp_path / "pending.db"
+    repo = SqliteRepository(db)
+    repo.init_db()
+    for day in range(1, 6):
+        (tmp_path / f"pending.pre_migration_2020010{day}000000.bak").write_bytes(b"old")
+
+    latest = max(v for v, _ in repo._migrations())
+    conn = repo._conn()
+    conn.execute("DELETE FROM schema_migrations WHERE version = ?", (latest,))
+    conn.execute(f"PRAGMA user_version = {latest - 1}")
+    conn.commit()
+    conn.close()
+    repo.run_migrations()
+
+    backups = sorted(p.name for p in tmp_path.glob("pending.pre_migration_*.bak"))
+    assert len(backups) == 3
+    assert backups[:2] == ["pending.pre_migration_20200104000000.bak", "pending.pre_migration_20200105000000.bak"]
+    snapshot = sqlite3.connect(tmp_path / backups[-1])
+    assert snapshot.execute("SELECT MAX(version) FROM schema_migrations").fetchone()[0] == latest - 1
+    snapshot.close()
+    repo.close()
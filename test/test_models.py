@@ -0,0 +1,38 @@
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+from ism.domain.models import Product, SaleHeader, row_builder
+from ism.repositories.sqlite_repo import SqliteRepository
+
+
+def test_row_builder_matches_regular_constructor():
+    row = (7, "SKU-7", "Seven", 1.5, 3.0, 4, 1, 1)
+    built = row_builder(Product)(row)
+
+    assert built == Product(*row)
+    assert hash(built) == hash(Product(*row))
+    assert not hasattr(built, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        built.stock = 0  # type: ignore[misc]
+
+
+def test_repository_rows_keep_model_types(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "models.db")
+    repo.init_db()
+    conn = repo._conn()
+    # Integer prices and a numeric SKU: column affinity must still hand back float/str.
+    conn.execute("INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock) VALUES (123, 'Typed', 1, 2, 5, 1)")
+    conn.execute("INSERT INTO sales (datetime, total_usd, fx_usd_ars, total_ars, notes) VALUES ('2024-01-01 10:00:00', 2, 1000, 2000, NULL)")
+    conn.commit()
+    conn.close()
+
+    (product,) = repo.list_products()
+    assert product == Product(id=1, sku="123", name="Typed", cost_usd=1.0, price_usd=2.0, stock=5, min_stock=1, active=1)
+    assert isinstance(product.sku, str) and isinstance(product.cost_usd, float)
+
+    (header,) = repo.list_sales_between("2024-01-01 00:00:00", "2024-02-01 00:00:00")
+    assert header == SaleHeader(1, "2024-01-01 10:00:00", 2.0, 1000.0, 2000.0, None)
+    assert isinstance(header.total_ars, float)
+    repo.close()
@@ -1,6 +1,8 @@
 from pathlib import Path
 import re
 
+import pytest
+
 from ism.repositories.sqlite_repo import SqliteRepository
 from ism.services.backup_service import BackupService
 from ism.services.inventory_service import InventoryService
@@ -36,6 +38,25 @@ def test_operations_health_check_and_diagnostics_export(tmp_path: Path):
     assert z.suffix == ".zip"
 
 
+def test_health_check_reports_active_sqlite_profile(tmp_path: Path):
+    db = tmp_path / "profile.db"
+    repo = SqliteRepository(db, profile="durable")
+    repo.init_db()
+
+    ops = OperationsService(repo, db_path=db, logs_dir=tmp_path / "logs", backup_dir=tmp_path / "backups")
+    report = ops.run_health_check()
+
+    assert report.sqlite_profile == "durable"
+    assert str(report.sqlite_settings["journal_mode"]).lower() == "wal"
+    assert int(report.sqlite_settings["synchronous"]) == 2  # FULL
+    assert int(report.sqlite_settings["cache_size"]) == -16_384
+
+
+def test_unknown_sqlite_profile_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError, match="Unknown SQLite profile"):
+        SqliteRepository(tmp_path / "x.db", profile="turbo")
+
+
 def test_operations_restore_latest_backup(tmp_path: Path):
     db = tmp_path / "sales.db"
     repo = SqliteRepository(db)
@@ -0,0 +1,112 @@
+from pathlib import Path
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.sales_service import SalesService
+from ism.ui.paging import TreePager
+
+
+def _seed_sales(repo: SqliteRepository) -> None:
+    conn = repo._conn()
+    # Several sales share a timestamp so the id tie-breaker matters.
+    conn.executemany(
+        "INSERT INTO sales (datetime, total_usd, fx_usd_ars, total_ars, notes) VALUES (?, 1.0, 1000.0, 1000.0, NULL)",
+        [(f"2024-01-{1 + i // 3:02d} 10:00:00",) for i in range(25)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _walk(fetch, page_size: int) -> list:
+    out, after = [], None
+    while True:
+        page = fetch(after, page_size)
+        out.extend(page)
+        if len(page) < page_size:
+            return out
+        after = (page[-1].datetime, page[-1].id)
+
+
+def test_sales_pages_cover_the_window_once_in_order(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "pages.db")
+    repo.init_db()
+    _seed_sales(repo)
+    sales = SalesService(repo, fx_service=None)
+    window = ("2024-01-01 00:00:00", "2024-02-01 00:00:00")
+
+    paged = _walk(lambda after, limit: sales.list_sales_between(*window, after=after, limit=limit), page_size=4)
+
+    assert paged == repo.list_sales_between(*window)
+    assert len({s.id for s in paged}) == 25
+    assert [(s.datetime, s.id) for s in paged] == sorted(((s.datetime, s.id) for s in paged), reverse=True)
+    repo.close()
+
+
+def test_product_and_ledger_pages(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "products.db")
+    repo.init_db()
+    conn = repo._conn()
+    conn.executemany(
+        "INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock) VALUES (?, ?, 1.0, 2.0, 1, 0)",
+        [(f"SKU-{i}", "Same name" if i % 2 else f"Name {i:02d}") for i in range(11)],
+    )
+    conn.commit()
+    conn.close()
+    for pid in range(1, 12):
+        repo.adjust_product_stock(pid, 1)
+
+    first = repo.list_products(limit=5)
+    rest = repo.list_products(after=(first[-1].name, first[-1].id))
+    assert first + rest == repo.list_products()
+
+    ledger_first = repo.recent_ledger(limit=6)
+    ledger_rest = repo.recent_ledger(limit=None, after=(ledger_first[-1].datetime, ledger_first[-1].id))
+    assert [e.id for e in ledger_first + ledger_rest] == [e.id for e in repo.recent_ledger(limit=None)]
+    repo.close()
+
+
+class FakeTree:
+    def __init__(self):
+        self.rows: list[tuple] = []
+        self.idle: list = []
+
+    def configure(self, **_kwargs):
+        return None
+
+    def get_children(self):
+        return list(range(len(self.rows)))
+
+    def delete(self, _item):
+        self.rows.pop()
+
+    def insert(self, _parent, _index, values=(), tags=()):
+        self.rows.append(values)
+
+    def after_idle(self, fn):
+        self.idle.append(fn)
+
+
+def test_tree_pager_loads_next_page_only_near_the_bottom():
+    data = list(range(10))
+    calls: list = []
+
+    def fetch(after, limit):
+        calls.append(after)
+        start = 0 if after is None else after[0] + 1
+        return data[start:start + limit]
+
+    tree = FakeTree()
+    pager = TreePager(tree, fetch, to_values=lambda n: (n,), key_of=lambda n: (n,), page_size=4)
+    pager.reset()
+    assert tree.rows == [(0,), (1,), (2,), (3,)]
+
+    pager._on_yscroll("0.0", "0.5")
+    assert tree.idle == []
+
+    pager._on_yscroll("0.5", "1.0")
+    pager._on_yscroll("0.5", "1.0")  # a second scroll event before the load runs is ignored
+    assert len(tree.idle) == 1
+    tree.idle.pop()()
+    assert pager.load_more() is True
+    assert [r[0] for r in tree.rows] == data
+    assert pager.exhausted
+    assert calls == [None, (3,), (7,)]
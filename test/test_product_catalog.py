@@ -0,0 +1,127 @@
+from pathlib import Path
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.repositories.write_queue import WriteQueue
+from ism.services.inventory_service import InventoryService
+from ism.services.purchase_service import PurchaseService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+class CountingRepo(SqliteRepository):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.list_calls = 0
+
+    def list_products(self, **kwargs):
+        self.list_calls += 1
+        return super().list_products(**kwargs)
+
+
+def _setup(tmp_path: Path) -> tuple[CountingRepo, InventoryService]:
+    repo = CountingRepo(tmp_path / "catalog.db")
+    repo.init_db()
+    inventory = InventoryService(repo)
+    for i in range(5):
+        inventory.add_product(f"SKU-{i}", f"Item {i % 3}", 1.0, 2.0, 10, 3)
+    return repo, inventory
+
+
+def test_reads_are_served_from_memory_until_a_write(tmp_path: Path):
+    repo, inventory = _setup(tmp_path)
+    version = inventory.catalog_version()
+
+    for _ in range(5):
+        inventory.list_products()
+    assert inventory.get_product_by_sku("SKU-3").name == "Item 0"
+    assert repo.list_calls == 1
+    assert inventory.catalog_version() == version
+
+    inventory.update_product(inventory.get_product_by_sku("SKU-3").id, 9.0, 1)
+    assert inventory.catalog_version() > version
+    assert inventory.get_product_by_sku("SKU-3").price_usd == 9.0
+    assert repo.list_calls == 1
+    repo.close()
+
+
+def test_sale_patches_touched_rows_without_a_full_reload(tmp_path: Path):
+    repo, inventory = _setup(tmp_path)
+    pid = inventory.get_product_by_sku("SKU-0").id
+    inventory.list_products()
+    version = inventory.catalog_version()
+
+    SalesService(repo, FixedFxService()).create_sale(None, [{"product_id": pid, "qty": 4, "unit_price_usd": 2.0}])
+
+    assert inventory.catalog_version() > version
+    assert inventory.get_product_by_sku("SKU-0").stock == 6
+    assert inventory.list_products() == repo.list_products()
+    assert repo.list_calls == 2  # the comparison above; the catalog itself loaded once
+    repo.close()
+
+
+def test_patched_renames_additions_and_removals_keep_repository_order(tmp_path: Path):
+    repo, inventory = _setup(tmp_path)
+    inventory.list_products()
+
+    renamed = inventory.get_product_by_sku("SKU-4")
+    repo.update_product_details(renamed.id, "Aardvark", 1.0, 2.0, 3)
+    inventory.add_product("SKU-9", "Item 1", 1.0, 2.0, 10, 3)
+    repo.deactivate_product(inventory.get_product_by_sku("SKU-2").id)
+
+    assert inventory.list_products() == repo.list_products()
+    assert [p.sku for p in inventory.list_products()][:1] == ["SKU-4"]
+    assert "SKU-2" not in {p.sku for p in inventory.list_products()}
+    assert repo.list_calls == 2
+    repo.close()
+
+
+def test_cached_pages_match_repository_keyset_pages(tmp_path: Path):
+    repo, inventory = _setup(tmp_path)
+
+    assert inventory.list_products() == repo.list_products()
+    first = inventory.list_products(limit=2)
+    last = first[-1]
+    assert inventory.list_products(after=(last.name, last.id), limit=2) == repo.list_products(
+        after=(last.name, last.id), limit=2
+    )
+    assert inventory.list_products(after=("zzz", 0)) == []
+    repo.close()
+
+
+def test_sales_purchases_and_queued_writes_invalidate(tmp_path: Path):
+    repo, inventory = _setup(tmp_path)
+    pid = inventory.get_product_by_sku("SKU-0").id
+
+    SalesService(repo, FixedFxService()).create_sale(None, [{"product_id": pid, "qty": 4, "unit_price_usd": 2.0}])
+    assert inventory.get_product_by_sku("SKU-0").stock == 6
+
+    PurchaseService(repo).create_purchase("Vendor", None, [{"product_id": pid, "qty": 1, "unit_cost_usd": 1.0}])
+    assert inventory.get_product_by_sku("SKU-0").stock == 7
+
+    with WriteQueue(repo) as writer:
+        queued = InventoryService(repo, write_queue=writer, catalog=inventory.catalog)
+        queued.remove_product_stock(pid, 2)
+        assert inventory.get_product_by_sku("SKU-0").stock == 5
+    repo.close()
+
+
+def test_rolled_back_transaction_still_invalidates(tmp_path: Path):
+    repo, inventory = _setup(tmp_path)
+    pid = inventory.get_product_by_sku("SKU-1").id
+    version = inventory.catalog_version()
+
+    try:
+        with repo.transaction():
+            repo.adjust_product_stock(pid, -5)
+            assert inventory.catalog_version() == version
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+
+    assert inventory.catalog_version() > version
+    assert inventory.get_product_by_sku("SKU-1").stock == 10
+    repo.close()
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.excel_service import ExcelService
+from ism.services.inventory_service import InventoryService
+from ism.services.purchase_service import PurchaseService
+
+
+def _seed(repo: SqliteRepository, count: int) -> None:
+    conn = repo._conn()
+    conn.executemany(
+        "INSERT INTO products (sku, name, cost_usd, price_usd, stock, min_stock) VALUES (?, ?, 1.0, 2.0, 1, 0)",
+        ((f"SKU-{i:05d}", f"Product {i}") for i in range(count)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_bulk_lookups_span_multiple_in_clause_chunks(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "bulk.db")
+    repo.init_db()
+    _seed(repo, 2500)
+
+    by_id = repo.get_products_by_ids(range(1, 2501))
+    by_sku = repo.get_products_by_skus(f"SKU-{i:05d}" for i in range(2500))
+
+    assert len(by_id) == 2500
+    assert len(by_sku) == 2500
+    assert by_sku["SKU-01234"].id in by_id
+
+
+def test_bulk_lookups_skip_missing_and_inactive_products(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "missing.db")
+    repo.init_db()
+    inv = InventoryService(repo)
+    keep = inv.add_product("SKU-A", "Keep", 1.0, 2.0, 1, 0)
+    gone = inv.add_product("SKU-B", "Gone", 1.0, 2.0, 1, 0)
+    inv.delete_product(gone)
+
+    assert set(repo.get_products_by_ids([keep, gone, 999, keep])) == {keep}
+    assert set(repo.get_products_by_skus(["SKU-A", "SKU-B", "NOPE"])) == {"SKU-A"}
+    assert repo.get_products_by_ids([]) == {}
+
+
+def test_excel_import_handles_repeated_skus(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "excel_dup.db")
+    repo.init_db()
+    inv = InventoryService(repo)
+    purchases = PurchaseService(repo)
+    excel = ExcelService(repo, purchases, inv)
+    inv.add_product("SKU-OLD", "Old", 5.0, 8.0, 10, 1)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["sku", "name", "cost_usd", "price_usd", "stock", "min_stock"])
+    ws.append(["SKU-OLD", "Old", 5.0, 8.0, 2, 1])
+    ws.append(["SKU-NEW", "New", 3.0, 6.0, 4, 1])
+    ws.append(["SKU-OLD", "Old", 5.0, 8.0, 3, 1])
+    ws.append(["SKU-NEW", "New", 3.0, 6.0, 1, 1])
+    path = tmp_path / "dup.xlsx"
+    wb.save(path)
+
+    ok, skipped = excel.import_restock_excel(str(path))
+
+    assert (ok, skipped) == (4, 0)
+    assert repo.get_product_by_sku("SKU-OLD").stock == 15
+    assert repo.get_product_by_sku("SKU-NEW").stock == 5
+
+
+def test_excel_import_keeps_stock_changed_after_the_sku_prefetch(tmp_path: Path, monkeypatch):
+    repo = SqliteRepository(tmp_path / "excel_race.db")
+    repo.init_db()
+    inv = InventoryService(repo)
+    excel = ExcelService(repo, PurchaseService(repo), inv)
+    pid = inv.add_product("SKU-RACE", "Race", 5.0, 8.0, 10, 1)
+
+    prefetch = repo.get_products_by_skus
+
+    def prefetch_then_sell(skus):
+        found = prefetch(skus)
+        # Another terminal sells 4 units after the import read the catalog.
+        repo.adjust_product_stock(pid, -4, notes="concurrent sale")
+        return found
+
+    monkeypatch.setattr(repo, "get_products_by_skus", prefetch_then_sell)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["sku", "name", "cost_usd", "price_usd", "stock", "min_stock"])
+    ws.append(["SKU-RACE", "Race v2", 5.5, 9.0, 3, 2])
+    path = tmp_path / "race.xlsx"
+    wb.save(path)
+
+    assert excel.import_restock_excel(str(path)) == (1, 0)
+    product = repo.get_product_by_sku("SKU-RACE")
+    assert product.stock == 10 - 4 + 3
+    assert (product.name, product.price_usd, product.min_stock) == ("Race v2", 9.0, 2)
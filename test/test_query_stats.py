@@ -0,0 +1,92 @@
+import json
+import logging
+import time
+import zipfile
+from pathlib import Path
+
+from ism.repositories.instrumentation import QueryStats, statement_template
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+from ism.services.operations_service import OperationsService
+
+
+def _by_prefix(stats: QueryStats, prefix: str) -> list[dict]:
+    return [row for row in stats.snapshot() if row["sql"].startswith(prefix)]
+
+
+def test_statement_template_collapses_layout_and_in_lists():
+    assert statement_template("SELECT a\n   FROM t\tWHERE id IN (?, ?,?)") == "SELECT a FROM t WHERE id IN (?, ...)"
+    assert statement_template("SELECT 1 WHERE x = ?") == "SELECT 1 WHERE x = ?"
+
+
+def test_instrumented_repository_records_calls_rows_and_percentiles(tmp_path: Path):
+    stats = QueryStats(slow_ms=10_000)
+    repo = SqliteRepository(tmp_path / "stats.db", query_stats=stats)
+    repo.init_db()
+    inventory = InventoryService(repo)
+    for i in range(3):
+        inventory.add_product(f"SKU-{i}", f"Item {i}", 1.0, 2.0, 5, 0)
+    stats.reset()
+
+    for _ in range(4):
+        repo.list_products()
+    repo.get_products_by_ids([1, 2])
+    repo.get_products_by_ids([1, 2, 3])
+
+    (listing,) = _by_prefix(stats, "SELECT id, sku, name, cost_usd, price_usd, stock, min_stock, active FROM products WHERE active = 1")
+    assert listing["calls"] == 4
+    assert listing["rows"] == 12
+    assert 0 <= listing["p50_ms"] <= listing["p95_ms"] <= listing["p99_ms"] <= listing["max_ms"]
+
+    (lookup,) = [row for row in stats.snapshot() if "IN (?, ...)" in row["sql"]]
+    assert lookup["calls"] == 2
+    assert lookup["rows"] == 5
+    repo.close()
+
+
+def test_fetch_time_is_part_of_statement_latency(tmp_path: Path):
+    stats = QueryStats(slow_ms=10_000)
+    repo = SqliteRepository(tmp_path / "fetch.db", query_stats=stats)
+    repo.init_db()
+    conn = repo._conn()
+    conn.create_function("nap", 1, lambda x: time.sleep(0.01) or x)
+    stats.reset()
+
+    # execute() steps to the first row only; the other four are computed while fetching.
+    cur = conn.cursor()
+    cur.execute("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 5) SELECT nap(x) FROM n")
+    assert len(cur.fetchall()) == 5
+    conn.close()
+
+    (row,) = _by_prefix(stats, "WITH RECURSIVE")
+    assert row["calls"] == 1
+    assert row["rows"] == 5
+    assert row["total_ms"] >= 45
+    repo.close()
+
+
+def test_uninstrumented_repository_has_no_stats(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "plain.db")
+    repo.init_db()
+    assert repo.query_stats is None
+    conn = repo._conn()
+    assert type(conn.cursor()) is not None and conn.cursor().__class__.__name__ == "Cursor"
+    conn.close()
+    repo.close()
+
+
+def test_slow_statements_are_logged_and_exported(tmp_path: Path, caplog):
+    stats = QueryStats(slow_ms=0)
+    db = tmp_path / "slow.db"
+    repo = SqliteRepository(db, query_stats=stats)
+    repo.init_db()
+
+    with caplog.at_level(logging.WARNING, logger="ism.sql.slow"):
+        repo.list_products()
+    assert any("slow_query" in r.getMessage() and "FROM products" in r.getMessage() for r in caplog.records)
+
+    ops = OperationsService(repo, db_path=db, logs_dir=tmp_path / "logs", backup_dir=tmp_path / "backups")
+    with zipfile.ZipFile(ops.export_diagnostics(tmp_path / "out")) as zf:
+        exported = json.loads(zf.read("query_stats.json"))
+    assert any("FROM products" in row["sql"] for row in exported)
+    repo.close()
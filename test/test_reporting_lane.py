@@ -0,0 +1,69 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+from ism.services.reporting_service import ReportingService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+def test_reporting_connections_are_read_only(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "ro.db")
+    repo.init_db()
+
+    conn = repo._read_conn()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM products")
+    finally:
+        conn.close()
+    repo.close()
+
+
+def test_reports_run_while_sales_are_committed_continuously(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "stress.db")
+    repo.init_db()
+    pid = InventoryService(repo).add_product("SKU-S", "Stress", 1.0, 2.0, 1_000_000, 0)
+    sales = SalesService(repo, FixedFxService())
+    reporting = ReportingService(repo)
+
+    stop = threading.Event()
+    committed = {"n": 0}
+    errors: list[Exception] = []
+
+    def sell_forever():
+        while not stop.is_set():
+            try:
+                sales.create_sale(None, [{"product_id": pid, "qty": 1, "unit_price_usd": 2.0}])
+                committed["n"] += 1
+            except Exception as exc:  # noqa: BLE001
+                errors.append(exc)
+                return
+
+    seller = threading.Thread(target=sell_forever)
+    seller.start()
+    try:
+        time.sleep(0.05)
+        for i in range(3):
+            reporting.export_sales_report_excel(str(tmp_path / f"report_{i}.xlsx"), "2000-01-01 00:00:00", "2100-01-01 00:00:00")
+            repo.sales_summary_between("2000-01-01 00:00:00", "2100-01-01 00:00:00")
+            repo.monthly_sales_totals(6)
+            repo.cumulative_profit_series()
+    finally:
+        stop.set()
+        seller.join()
+
+    assert errors == []
+    assert committed["n"] > 0
+    totals, _top = repo.sales_summary_between("2000-01-01 00:00:00", "2100-01-01 00:00:00")
+    assert totals[0] == committed["n"]
+    repo.close()
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+
+WINDOW = ("2000-01-01 00:00:00", "2100-01-01 00:00:00")
+
+
+def _setup(tmp_path: Path) -> tuple[SqliteRepository, int]:
+    repo = SqliteRepository(tmp_path / "snapshot.db")
+    repo.init_db()
+    pid = InventoryService(repo).add_product("SKU-C", "Cost", 4.0, 10.0, 10, 0)
+    return repo, pid
+
+
+def test_margin_keeps_cost_at_time_of_sale(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    sale_id = repo.create_sale("2026-02-01 10:00:00", 1000.0, None, [{"product_id": pid, "qty": 2, "unit_price_usd": 10.0}])
+
+    # Restock at a much higher cost moves the weighted product cost.
+    repo.create_purchase_with_items(
+        "2026-02-02 10:00:00", "Vendor", 80.0, None, [{"product_id": pid, "qty": 8, "unit_cost_usd": 10.0}]
+    )
+    assert repo.get_product_by_id(pid).cost_usd > 4.0
+
+    (line,) = repo.sale_items_for_sale(sale_id)
+    assert line.cost_usd == 4.0
+    assert line.line_margin_usd == 12.0
+    totals, top = repo.sales_summary_between(*WINDOW)
+    assert totals[3] == 12.0
+    assert top[0][4] == 12.0
+    repo.rebuild_sales_rollup()
+    assert repo.cumulative_profit_series() == [("2026-02-01", 12.0)]
+    repo.close()
+
+
+def test_migration_backfills_unit_cost_from_products(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    sale_id = repo.create_sale("2026-02-01 10:00:00", 1000.0, None, [{"product_id": pid, "qty": 1, "unit_price_usd": 10.0}])
+
+    conn = repo._conn()
+    conn.execute("DROP INDEX idx_sale_items_sale_lines")
+    conn.execute("ALTER TABLE sale_items DROP COLUMN unit_cost_usd")
+    conn.execute("DELETE FROM schema_migrations WHERE version = 7")
+    conn.commit()
+    conn.close()
+
+    repo.run_migrations()
+    (line,) = repo.sale_items_for_sale(sale_id)
+    assert line.cost_usd == 4.0
+    repo.close()
+
+
+def test_sales_margin_is_read_from_the_covering_index(tmp_path: Path):
+    repo, _pid = _setup(tmp_path)
+    conn = repo._conn()
+    plan = " ".join(
+        str(r[3])
+        for r in conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT COALESCE(SUM(si.qty * (si.unit_price_usd - si.unit_cost_usd)), 0)
+            FROM sales s
+            JOIN sale_items si ON si.sale_id = s.id
+            WHERE s.datetime >= ? AND s.datetime < ?
+            """,
+            WINDOW,
+        )
+    )
+    conn.close()
+    assert "products" not in plan
+    assert "COVERING INDEX idx_sale_items_sale_lines" in plan
+    repo.close()
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from ism.domain.errors import FxUnavailableError
+from ism.domain.errors import FxUnavailableError, NotFoundError, ValidationError
 from ism.repositories.sqlite_repo import SqliteRepository
 from ism.services.inventory_service import InventoryService
 from ism.services.sales_service import SalesService
@@ -42,4 +42,34 @@ def test_create_sale_propagates_fx_unavailable_error(tmp_path: Path):
     with pytest.raises(FxUnavailableError, match="upstream unavailable") as exc_info:
         sales.create_sale(notes=None, items=[{"product_id": pid, "qty": 1, "unit_price_usd": 10.0}])
 
-    assert exc_info.value.__cause__ is None
\ No newline at end of file
+    assert exc_info.value.__cause__ is None
+
+class CountingFxService:
+    def __init__(self):
+        self.calls = 0
+
+    def get_today_rate(self):
+        self.calls += 1
+        return 1000.0
+
+
+@pytest.mark.parametrize(
+    ("items", "error"),
+    [
+        ([], ValidationError),
+        ([{"product_id": "PID", "qty": 0, "unit_price_usd": 10.0}], ValidationError),
+        ([{"product_id": "PID", "qty": 1, "unit_price_usd": 0.0}], ValidationError),
+        ([{"product_id": "PID", "qty": "one", "unit_price_usd": 10.0}], ValidationError),
+        ([{"product_id": 999_999, "qty": 1, "unit_price_usd": 10.0}], NotFoundError),
+    ],
+)
+def test_invalid_cart_is_rejected_before_fx_lookup(tmp_path: Path, items, error):
+    repo, pid = _setup_repo_with_product(tmp_path)
+    fx = CountingFxService()
+    sales = SalesService(repo, fx)
+    items = [{**it, "product_id": pid if it["product_id"] == "PID" else it["product_id"]} for it in items]
+
+    with pytest.raises(error):
+        sales.create_sale(notes=None, items=items)
+
+    assert fx.calls == 0
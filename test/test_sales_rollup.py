@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import pytest
+
+from ism.repositories.instrumentation import QueryStats
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+def _rollup_rows(repo: SqliteRepository) -> list[tuple]:
+    conn = repo._conn()
+    rows = conn.execute(
+        "SELECT day, sales_count, revenue_usd, revenue_ars, cost_usd, margin_usd, units "
+        "FROM sales_daily_rollup ORDER BY day"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def _setup(tmp_path: Path) -> tuple[SqliteRepository, int]:
+    repo = SqliteRepository(tmp_path / "rollup.db")
+    repo.init_db()
+    pid = InventoryService(repo).add_product("SKU-R", "Rollup", 4.0, 10.0, 100, 0)
+    return repo, pid
+
+
+def test_create_sale_updates_daily_rollup(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    repo.create_sale("2026-03-01 10:00:00", 1000.0, None, [{"product_id": pid, "qty": 2, "unit_price_usd": 10.0}])
+    repo.create_sale("2026-03-01 18:00:00", 1000.0, None, [{"product_id": pid, "qty": 1, "unit_price_usd": 10.0}])
+    repo.create_sale("2026-04-02 09:00:00", 1000.0, None, [{"product_id": pid, "qty": 3, "unit_price_usd": 10.0}])
+
+    assert _rollup_rows(repo) == [
+        ("2026-03-01", 2, 30.0, 30000.0, 12.0, 18.0, 3),
+        ("2026-04-02", 1, 30.0, 30000.0, 12.0, 18.0, 3),
+    ]
+    assert repo.monthly_sales_totals(6) == [("2026-03", 30.0), ("2026-04", 30.0)]
+    assert repo.cumulative_profit_series() == [("2026-03-01", 18.0), ("2026-04-02", 36.0)]
+    repo.close()
+
+
+def test_failed_sale_leaves_rollup_untouched(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    with pytest.raises(ValueError):
+        repo.create_sale("2026-03-01 10:00:00", 1000.0, None, [{"product_id": pid, "qty": 500, "unit_price_usd": 10.0}])
+
+    assert _rollup_rows(repo) == []
+    repo.close()
+
+
+def test_rebuild_matches_incremental_rollup(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    sales = SalesService(repo, FixedFxService())
+    for qty in (1, 2, 3):
+        sales.create_sale(None, [{"product_id": pid, "qty": qty, "unit_price_usd": 10.0}])
+    incremental = _rollup_rows(repo)
+
+    conn = repo._conn()
+    conn.execute("DELETE FROM sales_daily_rollup")
+    conn.commit()
+    conn.close()
+
+    assert repo.rebuild_sales_rollup() == 1
+    assert _rollup_rows(repo) == incremental
+    repo.close()
+
+
+def test_migration_backfills_rollup_for_existing_sales(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    repo.create_sale("2026-01-05 10:00:00", 1000.0, None, [{"product_id": pid, "qty": 2, "unit_price_usd": 10.0}])
+
+    conn = repo._conn()
+    conn.execute("DROP TABLE sales_daily_rollup")
+    conn.execute("DELETE FROM schema_migrations WHERE version = 6")
+    conn.commit()
+    conn.close()
+
+    repo.run_migrations()
+    assert _rollup_rows(repo) == [("2026-01-05", 1, 20.0, 20000.0, 8.0, 12.0, 2)]
+    repo.close()
+
+
+def test_rollup_rebuild_reads_sales_from_covering_indexes(tmp_path: Path):
+    stats = QueryStats()
+    repo = SqliteRepository(tmp_path / "rollup.db", query_stats=stats)
+    repo.init_db()
+    pid = InventoryService(repo).add_product("SKU-R", "Rollup", 4.0, 10.0, 100, 0)
+    repo.create_sale("2026-05-07 23:59:59", 1000.0, None, [{"product_id": pid, "qty": 1, "unit_price_usd": 10.0}])
+    stats.reset()
+
+    assert repo.rebuild_sales_rollup() == 1
+    (rebuild,) = [e["sql"] for e in stats.snapshot() if e["sql"].startswith("INSERT INTO sales_daily_rollup")]
+    conn = repo._conn()
+    plan = [str(r[3]) for r in conn.execute("EXPLAIN QUERY PLAN " + rebuild)]
+    conn.close()
+
+    assert "SCAN s USING COVERING INDEX idx_sales_datetime_totals" in plan
+    assert "SCAN sale_items USING COVERING INDEX idx_sale_items_sale_lines" in plan
+    assert _rollup_rows(repo) == [("2026-05-07", 1, 10.0, 10000.0, 4.0, 6.0, 1)]
+    repo.close()
+
+
+def test_rebuild_notifies_sales_listeners(tmp_path: Path):
+    repo, _pid = _setup(tmp_path)
+    seen: list[frozenset[str]] = []
+    repo.add_change_listener(lambda tables, _product_ids: seen.append(tables))
+
+    repo.rebuild_sales_rollup()
+
+    assert seen == [frozenset({"sales", "sales_daily_rollup"})]
+    repo.close()
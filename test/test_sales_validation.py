@@ -64,3 +64,29 @@ def test_create_sale_consolidates_repeated_product_lines(tmp_path: Path):
     prod = repo.get_product_by_id(pid)
     assert prod is not None
     assert prod.stock == 0
+
+
+@pytest.mark.parametrize("has_returning", [True, False])
+def test_repository_sale_guarded_decrement_blocks_oversell(tmp_path: Path, monkeypatch, has_returning: bool):
+    monkeypatch.setattr("ism.repositories.sqlite_repo._SQLITE_HAS_RETURNING", has_returning)
+    repo, pid = _setup(tmp_path)
+    other = InventoryService(repo).add_product("SKU-2", "Other", 1.0, 2.0, 8, 0)
+
+    with pytest.raises(ValueError, match="Not enough stock"):
+        repo.create_sale(
+            "2024-01-01 10:00:00",
+            1000.0,
+            None,
+            [
+                {"product_id": other, "qty": 2, "unit_price_usd": 2.0},
+                {"product_id": pid, "qty": 6, "unit_price_usd": 10.0},
+            ],
+        )
+
+    assert repo.get_product_by_id(other).stock == 8
+    assert repo.list_sales_between("2000-01-01 00:00:00", "2100-01-01 00:00:00") == []
+
+    sale_id = repo.create_sale("2024-01-01 10:05:00", 1000.0, None, [{"product_id": pid, "qty": 5, "unit_price_usd": 10.0}])
+    ledger = repo.recent_ledger(1)
+    assert ledger[0].reference_id == sale_id
+    assert ledger[0].stock_after == 0
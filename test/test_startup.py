@@ -0,0 +1,35 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from ism.application.container import build_container
+from ism.startup import StartupTimer
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_container_import_does_not_load_openpyxl_or_requests():
+    code = (
+        "import sys; import ism.application.container, ism.services; "
+        "print(','.join(m for m in ('openpyxl', 'requests') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env={"PYTHONPATH": str(SRC)}
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_rarely_used_services_are_built_on_first_access(tmp_path: Path):
+    startup = StartupTimer()
+    container = build_container(tmp_path / "lazy.db", startup=startup)
+    try:
+        assert "excel" not in vars(container)
+        assert container.excel is container.excel
+        assert container.excel.inventory is container.inventory
+        assert "excel" in vars(container)
+    finally:
+        container.close()
+
+    assert [name for name, _ in startup.phases] == ["migrations"]
+    startup.mark("first_paint")
+    assert "first_paint" in startup.report()
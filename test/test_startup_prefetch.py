@@ -0,0 +1,74 @@
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from ism.domain.errors import FxUnavailableError
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+from ism.services.sales_service import SalesService
+from ism.services.startup_prefetch import DashboardKpis, StartupPrefetch, dashboard_kpis
+from ism.startup import StartupTimer
+from ism.ui.app import PREFETCH_WAIT_S, App
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+class OfflineFxService:
+    def get_today_rate(self):
+        raise FxUnavailableError("offline")
+
+
+def _store(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "prefetch.db")
+    repo.init_db()
+    inventory = InventoryService(repo)
+    pid = inventory.add_product("SKU-P1", "Pen", 1.0, 3.0, 10, 2)
+    inventory.add_product("SKU-P2", "Pad", 2.0, 5.0, 1, 2)
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+    repo.create_sale(yesterday, 1000.0, None, [{"product_id": pid, "qty": 4, "unit_price_usd": 3.0}])
+    return repo, InventoryService(repo), SalesService(repo, FixedFxService())
+
+
+def test_prefetch_warms_catalog_and_matches_live_kpis(tmp_path: Path):
+    repo, inventory, sales = _store(tmp_path)
+    prefetch = StartupPrefetch(inventory, sales, FixedFxService()).start()
+
+    kpis = prefetch.kpis.result(timeout=10)
+    assert kpis == DashboardKpis(products=2, units=7, low_stock=1, revenue_7d_usd=12.0, profit_7d_usd=8.0)
+    assert prefetch.fx_rate.result(timeout=10) == 1000.0
+
+    # The views' first reads are served from the prefetched catalog.
+    repo.list_products = None
+    assert [p.sku for p in inventory.list_products()] == ["SKU-P2", "SKU-P1"]
+    assert dashboard_kpis(inventory, sales, now=datetime.now()) == kpis
+    repo.close()
+
+
+def test_fx_failure_does_not_block_kpis(tmp_path: Path):
+    repo, inventory, sales = _store(tmp_path)
+    prefetch = StartupPrefetch(inventory, sales, OfflineFxService()).start()
+
+    assert prefetch.kpis.result(timeout=10).products == 2
+    with pytest.raises(FxUnavailableError):
+        prefetch.fx_rate.result(timeout=10)
+    repo.close()
+
+
+def test_first_paint_stops_waiting_on_a_stuck_prefetch():
+    # A prefetch whose KPI query never finishes, e.g. blocked on another terminal's lock.
+    stuck = SimpleNamespace(kpis=Future())
+    window = SimpleNamespace(startup=StartupTimer())
+
+    started = time.perf_counter()
+    assert App._prefetched_kpis(window, stuck) is None
+    waited = time.perf_counter() - started
+
+    assert PREFETCH_WAIT_S <= waited < PREFETCH_WAIT_S + 2
+    assert [name for name, _ in window.startup.phases] == ["prefetch_wait"]
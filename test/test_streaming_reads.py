@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+def _repo_with_sales(tmp_path: Path) -> SqliteRepository:
+    repo = SqliteRepository(tmp_path / "stream.db")
+    repo.init_db()
+    inv = InventoryService(repo)
+    a = inv.add_product("SKU-A", "Alpha", 1.0, 2.0, 100, 0)
+    b = inv.add_product("SKU-B", "Beta", 3.0, 5.0, 100, 0)
+    sales = SalesService(repo, FixedFxService())
+    for qty in range(1, 6):
+        sales.create_sale(None, [{"product_id": a, "qty": qty, "unit_price_usd": 2.0}, {"product_id": b, "qty": 1, "unit_price_usd": 5.0}])
+    return repo
+
+
+def test_sale_lines_stream_matches_per_sale_lookups(tmp_path: Path):
+    repo = _repo_with_sales(tmp_path)
+    window = ("2000-01-01 00:00:00", "2100-01-01 00:00:00")
+
+    streamed = list(repo.iter_sale_lines_between(*window, batch_size=3))
+    expected = [(h, line) for h in repo.list_sales_between(*window) for line in repo.sale_items_for_sale(h.id)]
+
+    assert streamed == expected
+    assert len(streamed) == 10
+    # Lines of one sale share the header object.
+    assert streamed[0][0] is streamed[1][0]
+    repo.close()
+
+
+def test_iterators_page_through_fetchmany_and_return_connections(tmp_path: Path):
+    repo = _repo_with_sales(tmp_path)
+
+    assert [p.sku for p in repo.iter_products(batch_size=1)] == ["SKU-A", "SKU-B"]
+    assert len(list(repo.iter_ledger(batch_size=2))) == len(repo.recent_ledger(limit=None))
+
+    opened = repo._read_pool.connections_opened
+    for _ in range(5):
+        it = repo.iter_sales_between("2000-01-01 00:00:00", "2100-01-01 00:00:00", batch_size=2)
+        next(it)
+        it.close()
+    assert repo._read_pool.connections_opened == opened
+    repo.close()
+
+
+def test_half_read_stream_inside_transaction_keeps_later_writes(tmp_path: Path):
+    repo = _repo_with_sales(tmp_path)
+    pid = repo.get_product_by_sku("SKU-A").id
+
+    with repo.transaction():
+        it = repo.iter_products(batch_size=1)
+        next(it)
+        repo.adjust_product_stock(pid, -5)
+        it.close()
+
+    assert repo.get_product_by_id(pid).stock == 100 - 15 - 5
+    repo.close()
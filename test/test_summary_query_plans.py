@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from ism.repositories.instrumentation import QueryStats
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+
+WINDOW = ("2026-01-01 00:00:00", "2026-01-08 00:00:00")
+
+
+def _plans(repo: SqliteRepository, call) -> dict[str, list[str]]:
+    """EXPLAIN QUERY PLAN for every SELECT that ``call()`` runs, keyed by its SQL."""
+    repo.query_stats.reset()
+    call()
+    statements = [e["sql"] for e in repo.query_stats.snapshot() if e["sql"].startswith("SELECT")]
+    conn = repo._read_conn()
+    plans = {sql: [str(r[3]) for r in conn.execute("EXPLAIN QUERY PLAN " + sql, WINDOW)] for sql in statements}
+    conn.close()
+    return plans
+
+
+@pytest.fixture
+def repo(tmp_path: Path):
+    repo = SqliteRepository(tmp_path / "plans.db", query_stats=QueryStats())
+    repo.init_db()
+    yield repo
+    repo.close()
+
+
+def test_window_totals_use_covering_sales_index(repo: SqliteRepository):
+    plans = _plans(repo, lambda: repo.sales_totals_between(*WINDOW))
+
+    (totals,) = [plan for sql, plan in plans.items() if "JOIN" not in sql]
+    assert totals == ["SEARCH sales USING COVERING INDEX idx_sales_datetime_totals (datetime>? AND datetime<?)"]
+
+
+def test_margin_and_top_products_never_touch_tables(repo: SqliteRepository):
+    plans = _plans(repo, lambda: repo.sales_summary_between(*WINDOW))
+
+    (margin,) = [plan for sql, plan in plans.items() if "JOIN sale_items" in sql and "GROUP BY" not in sql]
+    (top,) = [plan for sql, plan in plans.items() if "GROUP BY si.product_id" in sql]
+    for plan in (margin, top):
+        lookups = [step for step in plan if step.startswith(("SEARCH s ", "SEARCH si ", "SCAN s ", "SCAN si "))]
+        assert len(lookups) == 2
+        assert all("COVERING INDEX" in step for step in lookups)
+        assert any("idx_sale_items_sale_lines (sale_id=?)" in step for step in lookups)
+    # Only the 20 winners are joined to products, by primary key.
+    assert any(step.startswith("SEARCH p USING INTEGER PRIMARY KEY") for step in top)
+
+
+def test_sales_keyset_page_walks_datetime_index_in_order(repo: SqliteRepository):
+    repo.query_stats.reset()
+    repo.list_sales_between(*WINDOW, after=("2026-01-05 00:00:00", 10), limit=50)
+    (sql,) = [e["sql"] for e in repo.query_stats.snapshot() if e["sql"].startswith("SELECT")]
+    # QueryStats folds placeholder lists to "(?, ...)"; the cursor row value has two.
+    sql = sql.replace("(?, ...)", "(?, ?)")
+    conn = repo._read_conn()
+    plan = [str(r[3]) for r in conn.execute("EXPLAIN QUERY PLAN " + sql, (*WINDOW, "2026-01-05 00:00:00", 10, 50))]
+    conn.close()
+
+    assert any("idx_sales_datetime " in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+
+def test_totals_match_summary(repo: SqliteRepository):
+    inventory = InventoryService(repo)
+    a = inventory.add_product("SKU-A", "Alpha", 2.0, 5.0, 100, 0)
+    b = inventory.add_product("SKU-B", "Beta", 1.0, 3.0, 100, 0)
+    day = datetime(2026, 1, 2, 9, 0, 0)
+    for i in range(6):
+        when = (day + timedelta(hours=i)).isoformat(sep=" ")
+        repo.create_sale(when, 1000.0, None, [
+            {"product_id": a, "qty": 1 + i, "unit_price_usd": 5.0},
+            {"product_id": b, "qty": 2, "unit_price_usd": 3.0},
+        ])
+
+    totals, top = repo.sales_summary_between(*WINDOW)
+    assert repo.sales_totals_between(*WINDOW) == totals
+    assert totals == (6, 141.0, 141000.0, 87.0)
+    assert [row[0] for row in top] == ["SKU-A", "SKU-B"]
+    assert top[0][2:] == (21, 105.0, 63.0)
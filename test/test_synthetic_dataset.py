@@ -0,0 +1,63 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from ism.devtools.dataset import SIZES, DatasetSpec, generate_dataset
+from ism.repositories.sqlite_repo import SqliteRepository
+
+
+def _table_dump(db: Path, table: str) -> list[tuple]:
+    conn = sqlite3.connect(db)
+    rows = conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+    conn.close()
+    return rows
+
+
+def test_same_seed_generates_identical_databases(tmp_path: Path):
+    spec = SIZES["tiny"]
+    a = generate_dataset(tmp_path / "a.db", spec)
+    b = generate_dataset(tmp_path / "b.db", spec)
+    c = generate_dataset(tmp_path / "c.db", DatasetSpec(products=50, sales=300, purchases=30, days=30, seed=1))
+
+    for table in ("products", "sales", "sale_items", "stock_ledger"):
+        assert _table_dump(a.path, table) == _table_dump(b.path, table)
+    assert _table_dump(a.path, "sale_items") != _table_dump(c.path, "sale_items")
+    assert (a.sales, a.products, a.fx_rates) == (300, 50, 30)
+
+
+def test_generated_history_is_consistent(synthetic_db: Path):
+    conn = sqlite3.connect(synthetic_db)
+    drift = conn.execute(
+        """
+        SELECT COUNT(*) FROM products p
+        WHERE p.stock != (SELECT COALESCE(SUM(qty_delta), 0) FROM stock_ledger l WHERE l.product_id = p.id)
+        """
+    ).fetchone()[0]
+    bad_totals = conn.execute(
+        """
+        SELECT COUNT(*) FROM sales s
+        WHERE abs(s.total_usd - (SELECT SUM(qty * unit_price_usd) FROM sale_items i WHERE i.sale_id = s.id)) > 1e-6
+        """
+    ).fetchone()[0]
+    indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+    journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    rollup_sales = conn.execute("SELECT SUM(sales_count) FROM sales_daily_rollup").fetchone()[0]
+    conn.close()
+
+    assert drift == 0
+    assert bad_totals == 0
+    assert {"idx_sales_datetime_totals", "idx_sale_items_sale_lines", "trg_products_update_changed"} <= indexes
+    assert journal == "wal"
+    assert rollup_sales == 300
+
+    repo = SqliteRepository(synthetic_db)
+    assert len(repo.list_products()) == 50
+    repo.close()
+
+
+def test_existing_database_is_not_overwritten_by_default(tmp_path: Path):
+    db = tmp_path / "keep.db"
+    db.write_bytes(b"")
+    with pytest.raises(FileExistsError):
+        generate_dataset(db, SIZES["tiny"])
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.repositories.unit_of_work import RepositoryUnitOfWork
+from ism.services.inventory_service import InventoryService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+def _setup(tmp_path: Path) -> tuple[SqliteRepository, int]:
+    repo = SqliteRepository(tmp_path / "uow.db")
+    repo.init_db()
+    pid = InventoryService(repo).add_product("SKU-U", "UoW", 5.0, 10.0, 10, 1)
+    return repo, pid
+
+
+def test_unit_of_work_commits_all_writes_on_one_connection(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    opened = repo._pool.connections_opened
+
+    with RepositoryUnitOfWork(repo) as uow:
+        assert uow.get_product_by_id(pid) is not None
+        uow.create_sale(1000.0, None, [{"product_id": pid, "qty": 2, "unit_price_usd": 10.0}])
+        uow.create_purchase("Vendor", None, [{"product_id": pid, "qty": 1, "unit_cost_usd": 5.0}])
+
+    assert repo._pool.connections_opened == opened
+    product = repo.get_product_by_id(pid)
+    assert product is not None
+    assert product.stock == 9
+
+
+def test_unit_of_work_rolls_back_everything_on_error(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+
+    with pytest.raises(RuntimeError, match="abort"), RepositoryUnitOfWork(repo) as uow:
+        uow.create_sale(1000.0, None, [{"product_id": pid, "qty": 3, "unit_price_usd": 10.0}])
+        raise RuntimeError("abort")
+
+    product = repo.get_product_by_id(pid)
+    assert product is not None
+    assert product.stock == 10
+    assert repo.list_sales_between("2000-01-01 00:00:00", "2100-01-01 00:00:00") == []
+
+
+def test_failed_repository_call_inside_unit_of_work_only_undoes_its_own_work(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+
+    with RepositoryUnitOfWork(repo) as uow:
+        uow.create_sale(1000.0, None, [{"product_id": pid, "qty": 1, "unit_price_usd": 10.0}])
+        with pytest.raises(ValueError, match="Not enough stock"):
+            uow.create_sale(1000.0, None, [{"product_id": pid, "qty": 50, "unit_price_usd": 10.0}])
+
+    product = repo.get_product_by_id(pid)
+    assert product is not None
+    assert product.stock == 9
+
+
+def test_sales_service_validates_and_writes_in_one_transaction(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    sales = SalesService(repo, FixedFxService())
+    opened = repo._pool.connections_opened
+
+    sale_id = sales.create_sale(None, [{"product_id": pid, "qty": 4, "unit_price_usd": 10.0}])
+
+    assert repo._pool.connections_opened == opened
+    assert len(sales.sale_items_for_sale(sale_id)) == 1
@@ -0,0 +1,106 @@
+import json
+import shutil
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from ism.devtools.workload import load_journal, replay
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.excel_service import ExcelService
+from ism.services.inventory_service import InventoryService
+from ism.services.purchase_service import PurchaseService
+from ism.services.sales_service import SalesService
+from ism.services.workload_recorder import RECORDED_OPERATIONS, WorkloadRecorder
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+def _record_day(tmp_path: Path) -> tuple[Path, Path, int]:
+    db = tmp_path / "store.db"
+    repo = SqliteRepository(db)
+    repo.init_db()
+    pid = InventoryService(repo).add_product("SKU-W", "Widget", 2.0, 5.0, 50, 1)
+    repo.close()
+    source = tmp_path / "source.db"
+    shutil.copy2(db, source)
+
+    repo = SqliteRepository(db)
+    inventory = InventoryService(repo)
+    purchases = PurchaseService(repo)
+    services = {
+        "sales": SalesService(repo, FixedFxService()),
+        "purchases": purchases,
+        "inventory": inventory,
+        "excel": ExcelService(repo, purchases, inventory),
+    }
+    journal = tmp_path / "day.ndjson"
+    recorder = WorkloadRecorder(journal, strip_notes=True)
+    for name, methods in RECORDED_OPERATIONS.items():
+        recorder.attach(services[name], name, methods)
+
+    services["sales"].create_sale("Customer: Jane Doe, 555-0100", [{"product_id": pid, "qty": 2, "unit_price_usd": 5.0}])
+    services["inventory"].list_products()
+    sheet = tmp_path / "restock.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["sku", "name", "cost_usd", "price_usd", "stock", "min_stock"])
+    ws.append(["SKU-W", "Widget", 2.0, 5.0, 10, 1])
+    wb.save(sheet)
+    services["excel"].import_restock_excel(str(sheet))
+    recorder.close()
+    repo.close()
+    return journal, source, pid
+
+
+def test_recorder_journals_outermost_calls_without_notes(tmp_path: Path):
+    journal, _source, pid = _record_day(tmp_path)
+    lines = [json.loads(line) for line in journal.read_text(encoding="utf-8").splitlines()]
+
+    assert [line["op"] for line in lines] == [
+        "sales.create_sale",
+        "inventory.list_products",
+        "excel.import_restock_excel",
+    ]
+    sale = lines[0]
+    assert sale["ok"] is True
+    assert sale["args"]["notes"] is None
+    assert sale["args"]["items"] == [{"product_id": pid, "qty": 2, "unit_price_usd": 5.0}]
+    assert "Jane" not in journal.read_text(encoding="utf-8")
+
+
+def test_replay_runs_journal_on_a_copy(tmp_path: Path):
+    journal, source, _pid = _record_day(tmp_path)
+    assert len(load_journal(journal)) == 3
+
+    report = replay(journal, source, speed=None, workers=2)
+
+    assert report["calls"] == 3
+    assert all(op["errors"] == 0 for op in report["operations"].values())
+    assert report["operations"]["sales.create_sale"]["calls"] == 1
+    assert report["operations"]["sales.create_sale"]["p95_ms"] >= 0
+
+    repo = SqliteRepository(source)
+    assert repo.list_sales_between("2000-01-01 00:00:00", "2999-12-31 23:59:59") == []
+    repo.close()
+
+
+def test_replay_copy_includes_commits_still_in_the_source_wal(tmp_path: Path):
+    source = tmp_path / "live.db"
+    live = SqliteRepository(source)
+    live.init_db()
+    # The open repository keeps its WAL un-checkpointed, as a running app would.
+    pid = InventoryService(live).add_product("SKU-WAL", "Only in WAL", 1.0, 2.0, 3, 0)
+    assert source.with_name("live.db-wal").stat().st_size > 0
+    journal = tmp_path / "empty.ndjson"
+    journal.write_text("", encoding="utf-8")
+    copy = tmp_path / "copy.db"
+
+    replay(journal, source, speed=None, work_db=copy)
+    live.close()
+
+    repo = SqliteRepository(copy)
+    assert repo.get_product_by_id(pid).sku == "SKU-WAL"
+    repo.close()
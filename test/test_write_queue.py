@@ -0,0 +1,131 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ism.application.container import build_container
+from ism.domain.errors import DatabaseBusyError, InsufficientStockError
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.repositories.write_queue import QueuedUnitOfWork, WriteQueue
+from ism.services.inventory_service import InventoryService
+from ism.services.sales_service import SalesService
+
+
+class FixedFxService:
+    def get_today_rate(self):
+        return 1000.0
+
+
+def _setup(tmp_path: Path, stock: int = 100) -> tuple[SqliteRepository, int]:
+    repo = SqliteRepository(tmp_path / "queue.db")
+    repo.init_db()
+    pid = InventoryService(repo).add_product("SKU-Q", "Queued", 1.0, 2.0, stock, 0)
+    return repo, pid
+
+
+def test_concurrent_sales_through_write_queue_never_oversell(tmp_path: Path):
+    repo, pid = _setup(tmp_path, stock=40)
+    with WriteQueue(repo, linger_ms=1.0) as writer:
+        sales = SalesService(repo, FixedFxService(), uow_factory=lambda: QueuedUnitOfWork(repo, writer))
+
+        def sell(_):
+            try:
+                return sales.create_sale(None, [{"product_id": pid, "qty": 1, "unit_price_usd": 2.0}])
+            except InsufficientStockError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(sell, range(60)))
+
+    assert sum(1 for r in results if r is not None) == 40
+    assert repo.get_product_by_id(pid).stock == 0
+    assert 40 <= writer.commands_committed <= 60
+    assert writer.batches_committed <= writer.commands_committed
+
+
+def test_failed_command_does_not_undo_its_batch_neighbours(tmp_path: Path):
+    repo, pid = _setup(tmp_path, stock=5)
+    # A generous linger window makes the writer collect all three commands into one batch.
+    writer = WriteQueue(repo, linger_ms=500).start()
+    ok = writer.adjust_product_stock(pid, -2)
+    bad = writer.adjust_product_stock(pid, -50)
+    ok2 = writer.adjust_product_stock(pid, -1)
+    writer.close()
+
+    assert ok.result() is True
+    assert ok2.result() is True
+    with pytest.raises(ValueError, match="below zero"):
+        bad.result()
+    assert writer.batches_committed == 1
+    assert repo.get_product_by_id(pid).stock == 2
+
+
+def test_submit_after_close_is_rejected(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    writer = WriteQueue(repo).start()
+    writer.close()
+
+    with pytest.raises(RuntimeError, match="not running"):
+        writer.adjust_product_stock(pid, -1)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_writer_death_fails_queued_commands_and_refuses_new_ones(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    writer = WriteQueue(repo, linger_ms=200).start()
+
+    def die():
+        raise SystemExit("writer killed")
+
+    fatal = writer.submit(die)
+    queued = writer.adjust_product_stock(pid, -1)
+    writer._thread.join(5)
+
+    with pytest.raises(SystemExit):
+        fatal.result(timeout=1)
+    # Same batch as the fatal command: its transaction was rolled back.
+    with pytest.raises(SystemExit):
+        queued.result(timeout=1)
+    with pytest.raises(RuntimeError, match="not running"):
+        writer.adjust_product_stock(pid, -1)
+    assert repo.get_product_by_id(pid).stock == 100
+
+    writer.start()
+    assert writer.wait(writer.adjust_product_stock(pid, -1)) is True
+    writer.close()
+
+
+def test_wait_times_out_and_cancels_a_command_not_yet_started(tmp_path: Path):
+    repo, pid = _setup(tmp_path)
+    writer = WriteQueue(repo, result_timeout=0.05).start()
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        return release.wait(5)
+
+    blocker = writer.submit(block)
+    assert started.wait(5)
+    queued = writer.adjust_product_stock(pid, -1)
+
+    with pytest.raises(DatabaseBusyError, match="nothing was saved"):
+        writer.wait(queued)
+    release.set()
+    assert blocker.result(timeout=5) is True
+    writer.close()
+
+    assert queued.cancelled()
+    assert repo.get_product_by_id(pid).stock == 100
+
+
+def test_container_can_route_writes_through_queue(tmp_path: Path):
+    container = build_container(tmp_path / "sales.db", serialize_writes=True)
+    try:
+        assert container.writer is not None
+        pid = container.inventory.add_product("SKU-C", "Container", 1.0, 2.0, 3, 0)
+        container.inventory.remove_product_stock(pid, 1)
+        container.purchases.create_purchase("Vendor", None, [{"product_id": pid, "qty": 2, "unit_cost_usd": 1.0}])
+        assert container.repo.get_product_by_id(pid).stock == 4
+    finally:
+        container.close()
@@ -0,0 +1,81 @@
+import dataclasses
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ism.config import get_sqlite_profile
+from ism.domain.errors import DatabaseBusyError
+from ism.repositories.retry import RetryPolicy, RetryStats, run_with_retry
+from ism.repositories.sqlite_repo import SqliteRepository
+from ism.services.inventory_service import InventoryService
+from ism.services.operations_service import OperationsService
+
+
+def test_run_with_retry_backs_off_then_succeeds():
+    calls = {"n": 0}
+    sleeps: list[float] = []
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return "ok"
+
+    stats = RetryStats()
+    policy = RetryPolicy(max_attempts=5, base_delay_ms=10, jitter=0.0)
+    assert run_with_retry(flaky, policy, stats, sleep=sleeps.append) == "ok"
+
+    assert sleeps == [0.01, 0.02]
+    assert stats.snapshot() == {"calls": 1, "retries": 2, "gave_up": 0, "wait_seconds": 0.03}
+
+
+def test_run_with_retry_gives_up_after_max_attempts():
+    def always_busy():
+        raise sqlite3.OperationalError("database is locked")
+
+    stats = RetryStats()
+    with pytest.raises(DatabaseBusyError):
+        run_with_retry(always_busy, RetryPolicy(max_attempts=3, base_delay_ms=1), stats, sleep=lambda _s: None)
+
+    assert stats.retries == 2
+    assert stats.gave_up == 1
+
+
+def test_run_with_retry_does_not_retry_other_errors():
+    def broken():
+        raise sqlite3.OperationalError("no such table: nope")
+
+    stats = RetryStats()
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        run_with_retry(broken, RetryPolicy(), stats, sleep=lambda _s: None)
+    assert stats.retries == 0
+
+
+def test_repository_write_waits_out_a_competing_writer(tmp_path: Path):
+    db = tmp_path / "busy.db"
+    profile = dataclasses.replace(get_sqlite_profile("balanced"), busy_timeout_ms=10)
+    repo = SqliteRepository(db, profile=profile, retry_policy=RetryPolicy(max_attempts=50, base_delay_ms=10, max_delay_ms=50))
+    repo.init_db()
+    pid = InventoryService(repo).add_product("SKU-B", "Busy", 1.0, 2.0, 5, 0)
+
+    blocker = sqlite3.connect(db, timeout=0, check_same_thread=False)
+    blocker.execute("BEGIN IMMEDIATE")
+
+    def release_later():
+        time.sleep(0.15)
+        blocker.rollback()
+
+    t = threading.Thread(target=release_later)
+    t.start()
+    assert repo.adjust_product_stock(pid, -1) is True
+    t.join()
+    blocker.close()
+
+    assert repo.get_product_by_id(pid).stock == 4
+    assert repo.retry_stats.retries > 0
+
+    ops = OperationsService(repo, db_path=db, logs_dir=tmp_path / "logs", backup_dir=tmp_path / "backups")
+    assert ops.run_health_check().write_contention["retries"] == repo.retry_stats.retries